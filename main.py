@@ -3,30 +3,59 @@
 论坛助手主程序
 """
 
-import wx
+import time
+_START_TIME = time.perf_counter()
+
+import argparse
 import os
 import sys
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from main_frame import MainFrame
-from config_manager import ConfigManager
+from src.utils.startup_profiler import startup_profiler
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="论坛助手")
+    parser.add_argument('--profile-startup', nargs='?', const='startup_profile.txt', metavar='报告文件',
+                        help="记录启动各阶段耗时并写入时间线报告（默认 startup_profile.txt）")
+    parser.add_argument('--profile-startup-dump', metavar='数据文件',
+                        help="同时生成cProfile数据文件（需与 --profile-startup 一起使用）")
+    parser.add_argument('--sqlite-store', action='store_true',
+                        help="使用SQLite保存账户和设置（首次使用时从 forums.ini 迁移）")
+    args, _ = parser.parse_known_args()
+    return args
 
 def main():
     """主程序入口"""
+    args = parse_arguments()
+    if args.profile_startup:
+        startup_profiler.enable(args.profile_startup, args.profile_startup_dump, start=_START_TIME)
+
+    with startup_profiler.phase("导入模块"):
+        import wx
+        from main_frame import MainFrame
+        from config_manager import ConfigManager
+
     # 初始化应用程序
-    app = wx.App()
+    with startup_profiler.phase("创建wx.App"):
+        app = wx.App()
 
     # 创建配置管理器
-    config_manager = ConfigManager()
+    with startup_profiler.phase("创建配置管理器"):
+        config_manager = ConfigManager(use_sqlite=args.sqlite_store)
 
     # 创建主窗口
-    main_frame = MainFrame(config_manager)
-    main_frame.Show()
+    with startup_profiler.phase("创建主窗口"):
+        main_frame = MainFrame(config_manager)
+        main_frame.Show()
+
+    # 没有进入首次加载内容时（如没有账户或取消选择），在窗口显示后结束分析
+    startup_profiler.finish()
 
     # 运行应用程序
     app.MainLoop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.content_resources import extract_audio, extract_resources, parse_content
+
+# Patterns of the per-call regex implementations the shared extractor replaced
+LEGACY_AUDIO_PATTERNS = [
+    r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>',
+    r'<audio\s+[^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>',
+    r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>',
+]
+LEGACY_IMAGE_PATTERNS = [
+    r'<img\s+[^>]*alt\s*=\s*["\']([^"\']*)["\'][^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>',
+    r'<img\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*alt\s*=\s*["\']([^"\']*)["\'][^>]*>',
+    r'<img\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>',
+]
+LEGACY_LINK_PATTERN = r'<a\s+[^>]*href\s*=\s*["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
+
+def make_posts(count, audios_per_post, seed=1):
+    """Build a page of audio-heavy posts with images, links and repeated audio"""
+    rng = random.Random(seed)
+    posts = []
+    for floor in range(count):
+        parts = [f'<p>第{floor + 1}楼的内容，' + '文字' * rng.randint(20, 200) + '</p>']
+        for i in range(audios_per_post):
+            # Roughly one in five audio sources repeats an earlier floor
+            n = rng.randrange(floor * audios_per_post + 1) if rng.random() < 0.2 else floor * audios_per_post + i
+            parts.append(f'<audio controls="controls" src="http://audio.example.com/{n}.mp3" title="曲目{n}"> </audio><br />')
+        parts.append(f'<a href="http://example.com/{floor}"><img alt="图{floor}" src="http://img.example.com/{floor}.jpg" /></a>')
+        parts.append(f'<a href="http://example.com/page/{floor}">链接{floor}</a>')
+        posts.append({'message': ''.join(parts)})
+    return posts
+
+def legacy_detect(posts):
+    """Former page-level audio detection: three passes over the joined page, list-scan de-duplication"""
+    content = '\n'.join(post['message'] for post in posts)
+    audio_list = []
+
+    def extract(match):
+        src = match.group(1)
+        title = match.group(2) if len(match.groups()) > 1 else ""
+        if src and src not in [a['url'] for a in audio_list]:
+            audio_list.append({'url': src, 'title': title})
+        return ""
+
+    for pattern in LEGACY_AUDIO_PATTERNS:
+        re.sub(pattern, extract, content, flags=re.IGNORECASE | re.DOTALL)
+    return audio_list
+
+LEGACY_ENTITIES = {'&nbsp;': ' ', '&lt;': '<', '&gt;': '>', '&amp;': '&', '&quot;': '"', '&apos;': "'"}
+
+def legacy_floor(message):
+    """Former floor viewer parse: eleven substitution passes, no de-duplication"""
+    resources = []
+
+    def collect(resource_type):
+        def extract(match):
+            resources.append((resource_type, match.group(1)))
+            return f"x【{resource_type}】"
+        return extract
+
+    text = re.sub(r'<br\s*/?>', '\n', message, flags=re.IGNORECASE)
+    text = re.sub(r'</(p|div|h[1-6]|blockquote|li|tr|td|th)>', '\n', text, flags=re.IGNORECASE)
+    text = re.sub(r'<(?!/)(p|div|h[1-6]|blockquote|li|tr|td|th)[^>]*>', '', text, flags=re.IGNORECASE)
+    text = re.sub(LEGACY_LINK_PATTERN, collect('link'), text, flags=re.IGNORECASE)
+    for pattern in LEGACY_AUDIO_PATTERNS:
+        text = re.sub(pattern, collect('audio'), text, flags=re.IGNORECASE | re.DOTALL)
+    for pattern in LEGACY_IMAGE_PATTERNS:
+        text = re.sub(pattern, collect('image'), text, flags=re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', '', text)
+    for entity, char in LEGACY_ENTITIES.items():
+        text = text.replace(entity, char)
+    return re.sub(r'\n+', '\n', text).strip(), resources
+
+def shared_playlist(posts):
+    """Shared extractor used by the playlist builder"""
+    seen_urls = set()
+    tracks = []
+    for post in posts:
+        tracks.extend(extract_audio(post['message'], seen_urls))
+    return tracks
+
+def shared_resources(posts):
+    """Shared extractor over every resource type"""
+    seen = set()
+    resources = []
+    for post in posts:
+        resources.extend(extract_resources(post['message'], seen))
+    return resources
+
+def bench(label, func, number, repeat):
+    """Print the best time per call in milliseconds"""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"  {label:<44} {best * 1000:8.3f} ms")
+    return best
+
+def main():
+    """Compare the shared resource extractor with the implementations it replaced"""
+    parser = argparse.ArgumentParser(description="Benchmark the shared post resource extractor")
+    parser.add_argument('--posts', type=int, default=50, help="posts per page (default: 50)")
+    parser.add_argument('--audios', type=int, default=8, help="audio tags per post (default: 8)")
+    parser.add_argument('--number', type=int, default=20, help="calls per measurement")
+    parser.add_argument('--repeat', type=int, default=5, help="measurements, best is reported")
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.audios)
+    size = sum(len(post['message']) for post in posts)
+    print(f"Page: {len(posts)} posts, {args.audios} audio tags each, {size // 1024} KB of HTML")
+
+    legacy_tracks = legacy_detect(posts)
+    shared_tracks = shared_playlist(posts)
+    if [t['url'] for t in legacy_tracks] != [t['url'] for t in shared_tracks]:
+        # The legacy passes report titled audio before untitled audio; compare as sets
+        if {t['url'] for t in legacy_tracks} != {t['url'] for t in shared_tracks}:
+            raise SystemExit("Shared extractor found different audio than the legacy detection")
+    print(f"Unique audio: {len(shared_tracks)}")
+
+    print("Page-level audio detection:")
+    legacy = bench("legacy (3 passes, list de-duplication)", lambda: legacy_detect(posts), args.number, args.repeat)
+    shared = bench("shared extract_audio (set de-duplication)", lambda: shared_playlist(posts), args.number, args.repeat)
+    print(f"  speedup {legacy / shared:.1f}x")
+
+    print("All resources on the page:")
+    bench("shared extract_resources", lambda: shared_resources(posts), args.number, args.repeat)
+
+    print("Floor viewer (every floor on the page):")
+    legacy = bench("legacy (11 substitution passes)",
+                   lambda: [legacy_floor(post['message']) for post in posts], args.number, args.repeat)
+    shared = bench("shared parse_content",
+                   lambda: [parse_content(post['message']) for post in posts], args.number, args.repeat)
+    print(f"  speedup {legacy / shared:.1f}x")
+
+if __name__ == '__main__':
+    main()
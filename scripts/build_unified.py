@@ -4,6 +4,9 @@ import shutil
 import subprocess
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.dependency_manifest import MANIFEST_FILE, load_manifest, write_dependencies_manifest
+
 def create_unified_structure(dist_dir: Path):
     """创建统一依赖结构"""
     print("正在创建目录结构...")
@@ -131,6 +134,23 @@ def copy_components_to_unified(dist_dir: Path):
         assets_dest.mkdir(exist_ok=True)
         print(f"    ✓ assets/ (创建空目录)")
 
+def create_manifest(dist_dir: Path):
+    """创建依赖清单，程序启动时只比对目录指纹，不再逐个检查文件"""
+    project_root = Path(__file__).parent.parent
+    dependencies_dir = dist_dir / 'dependencies'
+
+    vlc_manifest = load_manifest(str(project_root / 'vlc' / MANIFEST_FILE)) or {}
+    versions = {
+        'python_runtime': sys.version.split()[0],
+        'vlc': vlc_manifest.get('vlc', {}).get('version')
+    }
+
+    manifest = write_dependencies_manifest(str(dependencies_dir), versions)
+    for name, ok in manifest['status'].items():
+        mark = "✓" if ok else "⚠"
+        print(f"  {mark} {name} ({manifest['file_counts'].get(name, 0)} 个文件)")
+    print(f"  ✓ dependencies/{MANIFEST_FILE}")
+
 def create_readme(dist_dir: Path):
     """创建说明文件"""
     readme_content = """ForumAssist - 论坛助手
@@ -349,6 +369,10 @@ def build_unified_package():
     # 复制依赖
     copy_components_to_unified(dist_dir)
 
+    # 记录依赖清单
+    print("\n创建依赖清单...")
+    create_manifest(dist_dir)
+
     # 创建辅助文件
     print("\n创建辅助文件...")
     create_readme(dist_dir)
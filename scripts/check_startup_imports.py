@@ -0,0 +1,74 @@
+import os
+import re
+import subprocess
+import sys
+import argparse
+from pathlib import Path
+
+# Modules that must not be imported before the first window is shown
+DEFERRED_MODULES = ('bs4', 'vlc', 'cryptography', 'webbrowser')
+
+# Modules imported by main.py before the account selection dialog appears
+STARTUP_IMPORTS = 'import wx, config_manager, main_frame'
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def run_importtime(project_root):
+    """Run the startup imports under -X importtime and return the raw report"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(project_root / 'src'), str(project_root)])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_IMPORTS],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(f"Startup imports failed with exit code {result.returncode}")
+    return result.stderr
+
+def parse_importtime(report):
+    """Parse the importtime report into (module, self_us, cumulative_us, depth) tuples"""
+    modules = []
+    for line in report.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+def main():
+    """Check that heavy modules stay deferred and startup imports stay within budget"""
+    parser = argparse.ArgumentParser(description="Check startup imports of ForumAssist")
+    parser.add_argument('--budget-ms', type=float, default=1500.0,
+                        help="maximum cumulative import time before the first window (default: 1500)")
+    parser.add_argument('--top', type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    modules = parse_importtime(run_importtime(project_root))
+
+    # Top-level entries carry the cumulative time of everything imported below them
+    total_ms = sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000.0
+
+    print(f"Startup imports: {len(modules)} modules, {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print("Slowest modules (self time):")
+    for name, self_us, cumulative_us, _ in sorted(modules, key=lambda m: -m[1])[:args.top]:
+        print(f"  {self_us / 1000.0:8.1f} ms  {cumulative_us / 1000.0:8.1f} ms cumulative  {name}")
+
+    failed = False
+    eager = sorted({name for name, _, _, _ in modules
+                    if name.split('.')[0] in DEFERRED_MODULES})
+    if eager:
+        failed = True
+        print("[FAIL] Heavy modules imported at startup: " + ", ".join(eager))
+
+    if total_ms > args.budget_ms:
+        failed = True
+        print(f"[FAIL] Startup imports exceed budget: {total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+
+    if failed:
+        sys.exit(1)
+    print("[OK] Startup imports within budget")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ import requests
 import shutil
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.dependency_manifest import check_vlc, write_vlc_manifest
+
+# VLC version to download
+VLC_VERSION = "3.0.18"
+
 def download_vlc_components_for_development():
     """Download VLC components for development (core libraries and plugins only)"""
     project_root = Path(__file__).parent.parent
@@ -16,11 +22,11 @@ def download_vlc_components_for_development():
     import platform
     if platform.machine() == 'AMD64' or '64' in platform.architecture()[0]:
         # 64-bit Python uses 64-bit VLC
-        vlc_url = "https://download.videolan.org/pub/videolan/vlc/3.0.18/win64/vlc-3.0.18-win64.zip"
+        vlc_url = f"https://download.videolan.org/pub/videolan/vlc/{VLC_VERSION}/win64/vlc-{VLC_VERSION}-win64.zip"
         vlc_arch = "64-bit"
     else:
         # 32-bit Python uses 32-bit VLC
-        vlc_url = "https://download.videolan.org/pub/videolan/vlc/3.0.18/win32/vlc-3.0.18-win32.zip"
+        vlc_url = f"https://download.videolan.org/pub/videolan/vlc/{VLC_VERSION}/win32/vlc-{VLC_VERSION}-win32.zip"
         vlc_arch = "32-bit"
 
     try:
@@ -124,11 +130,12 @@ def download_vlc_components_for_development():
                 print(f"  [FAIL] {file} missing!")
                 all_files_exist = False
 
-        # Check plugins directory
+        # Check plugins directory and write the manifest used by the app at startup
         plugins_dir = vlc_dir / 'plugins'
         if plugins_dir.exists():
-            plugin_count = len(list(plugins_dir.rglob('*.dll')))
-            print(f"  [OK] plugins directory ({plugin_count} plugin files)")
+            manifest = write_vlc_manifest(str(vlc_dir), version=f"{VLC_VERSION} ({vlc_arch})")
+            print(f"  [OK] plugins directory ({manifest['vlc']['plugin_count']} plugin files)")
+            print(f"  [OK] {vlc_dir / 'manifest.json'}")
         else:
             print(f"  [FAIL] plugins directory missing!")
             all_files_exist = False
@@ -162,21 +169,8 @@ def check_vlc_installation():
     project_root = Path(__file__).parent.parent
     vlc_dir = project_root / "vlc"
 
-    if not vlc_dir.exists():
-        return False
-
-    # 检查核心文件（新的组件结构）
-    core_files = ['libvlc.dll', 'libvlccore.dll']
-    for file in core_files:
-        if not (vlc_dir / file).exists():
-            return False
-
-    # 检查插件目录
-    plugins_dir = vlc_dir / 'plugins'
-    if not plugins_dir.exists() or len(list(plugins_dir.rglob('*.dll'))) < 10:
-        return False
-
-    return True
+    # 检查核心文件和插件目录（目录指纹未变化时直接使用清单结果）
+    return check_vlc(str(vlc_dir))
 
 def main():
     print("ForumAssist VLC Components Download Tool")
@@ -153,7 +153,9 @@ class AccountManager(wx.Dialog):
             return
 
         account = self.accounts[selected]
-        dialog = AccountEditDialog(self, title="编辑账户", account=account)
+        # 只解密正在编辑的账户的密码
+        dialog = AccountEditDialog(self, title="编辑账户",
+                                   account=dict(account, password=self.config_manager.get_account_password(account)))
         if dialog.ShowModal() == wx.ID_OK:
             account_data = dialog.get_account_data()
             if account_data:
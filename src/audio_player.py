@@ -1,13 +1,26 @@
 import os
+import queue
 import threading
-import time
 from typing import List, Dict, Optional
 from pathlib import Path
 from environment_setup import EnvironmentSetup
+from src.utils.startup_profiler import startup_profiler
+from src.utils.dependency_manifest import check_vlc
+from src.utils.stream_tuning import StreamTuner, PlaybackSession
+
+# 媒体解析选项：解析网络媒体（libvlc_media_parse_network）
+MEDIA_PARSE_NETWORK = 0x01
+
+# 媒体解析超时（毫秒），超时后时长由播放时的LengthChanged事件补充
+MEDIA_PARSE_TIMEOUT_MS = 5000
+
+# 当前曲目剩余多少秒时预加载下一曲
+PRELOAD_SECONDS = 10
 
 class AudioPlayer:
     def __init__(self):
-        self.env_setup = EnvironmentSetup()
+        with startup_profiler.phase("EnvironmentSetup"):
+            self.env_setup = EnvironmentSetup()
         self.instance = None
         self.player = None
         self.playlist: List[Dict] = []
@@ -17,15 +30,87 @@ class AudioPlayer:
         self.current_volume = 100
         self.total_time = 0
         self.current_time = 0
-        self.update_timer = None
-        # 状态更新回调
+        # 状态更新回调（播放状态、曲目或整秒进度变化时调用，可能在VLC事件线程中调用）
         self.on_status_update = None
-
-        self.setup_vlc()
+        # 上一次通知的状态，状态未变化时不重复通知
+        self._last_status = None
+        # 最近一次播放错误
+        self.last_error = None
+        # 当前播放的媒体（用于忽略已切换媒体的解析结果）
+        self._current_media = None
+        # 播放结束后自动播放播放列表中的下一曲
+        self.auto_advance = True
+        # 本地音频缓存（AudioCache），为None时直接播放网络地址
+        self.audio_cache = None
+        # 音频信息探测器（第一次设置播放列表时创建），探测结果更新时递增版本号
+        self._prober = None
+        self._playlist_version = 0
+        # 程序活动状态监视器（ActivityMonitor），空闲时暂停探测
+        self.activity = None
+        # 按主机测得的网络状况选择每个媒体的网络缓冲，并记录起播耗时和卡顿次数
+        self.stream_tuner = StreamTuner()
+        self._playback = None
+        self._playback_lock = threading.Lock()
+        # 预加载的下一曲 (索引, 地址, 播放器, 媒体, 网络缓冲毫秒)，以及已请求预加载的索引
+        self._preloaded = None
+        self._preload_index = None
+        # 切换曲目的锁（界面线程和后台工作线程都会切换曲目）
+        self._play_lock = threading.RLock()
+        # 后台工作线程：VLC事件回调中不能调用播放器方法，预加载和自动切换交给它执行
+        self._tasks = queue.Queue()
+        self._worker = None
+        # VLC初始化完成回调（在初始化线程中调用，参数为是否成功）
+        self.on_ready = None
+
+        # VLC在第一次播放时才在后台线程中初始化
+        self._init_lock = threading.Lock()
+        self._init_thread = None
+        self._init_done = threading.Event()
+        self._pending_url = None
+
+    def start_initialization(self):
+        """在后台线程中初始化VLC（只会初始化一次，立即返回）"""
+        with self._init_lock:
+            if self._init_thread is not None:
+                return
+            self._init_thread = threading.Thread(target=self._initialize, name="VLCInit", daemon=True)
+            self._init_thread.start()
+
+    def _initialize(self):
+        """初始化线程：创建VLC实例并通知调用方"""
+        try:
+            with startup_profiler.phase("setup_vlc"):
+                self.setup_vlc()
+            # 应用初始化之前调整过的音量
+            if self.player:
+                self.player.audio_set_volume(self.current_volume)
+        finally:
+            self._init_done.set()
+            if self.on_ready:
+                self.on_ready(self.is_available())
+
+    def is_initializing(self) -> bool:
+        """VLC是否正在后台初始化"""
+        return self._init_thread is not None and not self._init_done.is_set()
+
+    def play_pending(self) -> bool:
+        """
+        播放初始化期间请求的音频（应在初始化完成后调用）
+
+        Returns:
+            bool: 是否开始播放
+        """
+        url = self._pending_url
+        self._pending_url = None
+        if url and self.is_available():
+            return self.play_url(url)
+        return False
 
     def setup_vlc(self):
         """设置VLC"""
-        if not self.check_vlc_available():
+        with startup_profiler.phase("检查VLC组件（含插件扫描）"):
+            vlc_available = self.check_vlc_available()
+        if not vlc_available:
             print("[WARN] VLC not available, audio playback features will be disabled")
             return
 
@@ -62,7 +147,7 @@ class AudioPlayer:
                 '--no-snapshot-preview',  # 不显示快照预览
                 '--no-stats',  # 不收集统计信息（减少资源占用）
                 '--no-audio-time-stretch',  # 禁用音频时间拉伸
-                '--network-caching=3000',  # 网络缓存3秒，提高流媒体稳定性
+                '--network-caching=3000',  # 默认网络缓存3秒，网络地址按测得的网络状况单独设置
                 '--http-reconnect',  # 启用HTTP重连
             ]
 
@@ -77,12 +162,13 @@ class AudioPlayer:
                     pass  # 使用默认音频输出
 
             try:
-                self.instance = vlc.Instance(args)
+                with startup_profiler.phase("创建VLC实例"):
+                    self.instance = vlc.Instance(args)
                 if self.instance is None:
                     print("[FAIL] Failed to create VLC instance")
                     return
 
-                self.player = self.instance.media_player_new()
+                self.player = self.create_player()
                 if self.player is None:
                     print("[FAIL] Failed to create VLC media player")
                     return
@@ -115,17 +201,10 @@ class AudioPlayer:
             project_root = Path(__file__).parent.parent
             vlc_dir = project_root / 'vlc'
 
-            if vlc_dir.exists():
-                # For optimized components, we only need core libraries, not vlc.exe
-                core_files = ['libvlc.dll', 'libvlccore.dll']
-                if all((vlc_dir / f).exists() for f in core_files):
-                    # 检查插件目录（VLC插件在子目录中）
-                    plugins_dir = vlc_dir / 'plugins'
-                    if plugins_dir.exists():
-                        # 查找所有子目录中的DLL文件
-                        plugin_dlls = list(plugins_dir.rglob('*.dll'))
-                        if len(plugin_dlls) > 10:
-                            return True
+            # For optimized components, we only need core libraries, not vlc.exe
+            # 目录指纹与清单一致时直接使用清单结果，不再扫描插件目录
+            if check_vlc(str(vlc_dir)):
+                return True
 
         # 检查打包环境
         status = self.env_setup.check_dependencies()
@@ -135,110 +214,346 @@ class AudioPlayer:
         """检查播放器是否可用"""
         return self.instance is not None and self.player is not None
 
-    def play_url(self, url: str) -> bool:
-        """直接播放URL音频"""
-        if not self.is_available():
-            return False
+    def create_player(self):
+        """创建VLC播放器并订阅播放事件"""
+        import vlc
+        player = self.instance.media_player_new()
+        if player is None:
+            return None
+
+        # 播放进度、时长、结束和错误都由VLC事件驱动，不再定时轮询
+        event_manager = player.event_manager()
+        for event_type in (vlc.EventType.MediaPlayerTimeChanged,
+                           vlc.EventType.MediaPlayerLengthChanged,
+                           vlc.EventType.MediaPlayerEndReached,
+                           vlc.EventType.MediaPlayerEncounteredError,
+                           vlc.EventType.MediaPlayerBuffering):
+            event_manager.event_attach(event_type, self._on_vlc_event, player)
+        return player
+
+    def _on_vlc_event(self, event, player):
+        """
+        VLC事件分发（在VLC事件线程中调用，不能在此调用播放器方法）
+
+        Args:
+            event: VLC事件
+            player: 产生事件的播放器，预加载播放器的事件被忽略
+        """
+        if player is not self.player:
+            return
+        import vlc
+        event_type = event.type
+        playback = self._playback
+        if event_type == vlc.EventType.MediaPlayerBuffering:
+            # 缓冲进度只用于统计卡顿，不影响状态栏
+            if playback is not None:
+                playback.on_buffering(event.u.new_cache)
+            return
+        if event_type == vlc.EventType.MediaPlayerTimeChanged:
+            self.current_time = max(0, event.u.new_time) // 1000
+            if playback is not None:
+                playback.on_time_changed(event.u.new_time)
+            self._maybe_preload_next()
+        elif event_type == vlc.EventType.MediaPlayerLengthChanged:
+            if event.u.new_length > 0:
+                self.total_time = event.u.new_length // 1000
+        elif event_type == vlc.EventType.MediaPlayerEndReached:
+            self.current_time = self.total_time
+            self._finish_playback()
+            if self.auto_advance and self.current_index + 1 < len(self.playlist):
+                # 保持播放状态，由工作线程切换到下一曲
+                self._submit(self._advance, self.current_index)
+            else:
+                self.is_playing = False
+                self.is_paused = False
+        elif event_type == vlc.EventType.MediaPlayerEncounteredError:
+            self.is_playing = False
+            self.is_paused = False
+            self.last_error = "播放出错，音频可能无法访问或格式不受支持"
+            self._finish_playback()
+            print(f"[FAIL] {self.last_error}")
+        self._notify_status()
+
+    def _submit(self, func, *args):
+        """把任务交给后台工作线程执行（线程在第一次使用时启动）"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_tasks, name="AudioWorker", daemon=True)
+            self._worker.start()
+        self._tasks.put((func, args))
+
+    def _run_tasks(self):
+        """后台工作线程：依次执行预加载和自动切换任务"""
+        while True:
+            func, args = self._tasks.get()
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"音频后台任务失败: {e}")
 
+    def _maybe_preload_next(self):
+        """当前曲目即将结束时请求预加载下一曲（每首曲目只请求一次）"""
+        next_index = self.current_index + 1
+        if (not self.auto_advance or next_index >= len(self.playlist) or self._preload_index == next_index
+                or self.total_time <= 0 or self.total_time - self.current_time > PRELOAD_SECONDS):
+            return
+        self._preload_index = next_index
+        self._submit(self._preload, next_index)
+
+    def _preload(self, index):
+        """
+        预加载播放列表中的曲目：创建媒体并以暂停状态打开网络流，提前完成连接和缓冲
+
+        Args:
+            index: 曲目在播放列表中的索引
+        """
+        with self._play_lock:
+            if not self.is_playing or index != self.current_index + 1 or index >= len(self.playlist):
+                return
+            self._discard_preload()
+            url = self.playlist[index]['url']
+            player = self.create_player()
+            if player is None:
+                return
+            source = self._resolve_source(url)
+            media = self.instance.media_new(source)
+            caching_ms = self._apply_network_caching(media, url, source)
+            # 打开输入并缓冲后停在开头，切换时直接继续播放
+            media.add_option(':start-paused')
+            player.set_media(media)
+            player.audio_set_volume(self.current_volume)
+            player.play()
+            self._parse_media_async(media, index)
+            self._preloaded = (index, url, player, media, caching_ms)
+
+    def _resolve_source(self, url):
+        """获取实际播放地址：已缓存时使用本地文件，否则使用网络地址（并在后台缓存）"""
+        if self.audio_cache is None:
+            return url
         try:
-            media = self.instance.media_new(url)
-            self.player.set_media(media)
+            return self.audio_cache.resolve(url)
+        except Exception as e:
+            print(f"[WARN] 读取音频缓存失败: {e}")
+            return url
+
+    def _apply_network_caching(self, media, url, source):
+        """
+        按该主机测得的首字节时间、下载速度和曲目位速设置媒体的网络缓冲
+
+        Args:
+            media: VLC媒体对象
+            url: 音频地址
+            source: 实际播放地址（本地缓存文件不设置网络缓冲）
+
+        Returns:
+            int: 网络缓冲时长（毫秒），播放本地文件时返回None
+        """
+        if source != url or not url.lower().startswith(('http://', 'https://')):
+            return None
+        caching_ms = self.stream_tuner.network_caching_ms(url, self._track_bitrate(url))
+        media.add_option(f':network-caching={caching_ms}')
+        return caching_ms
+
+    def _track_bitrate(self, url):
+        """获取已探测到的曲目位速（kbps），未知时返回None"""
+        if self._prober is None:
+            return None
+        info = self._prober.get_cached(url)
+        return info.get('bitrate') if info else None
+
+    def _start_playback(self, url, caching_ms):
+        """开始统计一次网络播放的起播耗时和卡顿次数（结束上一次统计）"""
+        self._finish_playback()
+        if caching_ms is not None:
+            with self._playback_lock:
+                self._playback = PlaybackSession(url, caching_ms)
+
+    def _finish_playback(self):
+        """结束当前播放的统计并交给缓冲调节器（可能在VLC事件线程中调用）"""
+        with self._playback_lock:
+            playback, self._playback = self._playback, None
+        if playback is not None:
+            self.stream_tuner.record_playback(playback.url, playback.start_latency_ms,
+                                              playback.rebuffers, playback.caching_ms)
+
+    def _discard_preload(self):
+        """释放预加载的播放器"""
+        preloaded, self._preloaded = self._preloaded, None
+        if preloaded:
+            player = preloaded[2]
+            try:
+                player.stop()
+                player.release()
+            except Exception:
+                pass
 
-            # 获取媒体信息 - 使用更深度的解析
-            media.parse()  # 基础解析
+    def _take_preloaded(self, index):
+        """
+        切换到预加载的曲目
 
-            # 尝试更深度的解析以获取更多信息
-            try:
-                # 等待解析完成
-                import time
-                time.sleep(0.1)
+        Args:
+            index: 要播放的曲目索引
+
+        Returns:
+            bool: 是否切换成功，没有对应的预加载曲目时返回False
+        """
+        preloaded = self._preloaded
+        if not preloaded or preloaded[0] != index or index >= len(self.playlist) \
+                or preloaded[1] != self.playlist[index]['url']:
+            return False
+        self._preloaded = None
+        _, url, player, media, caching_ms = preloaded
+
+        # 预加载尚未完成缓冲（仍在连接）时放弃预加载，按普通方式播放
+        import vlc
+        if player.get_state() != vlc.State.Paused:
+            player.stop()
+            player.release()
+            return False
 
-                # 尝试获取解析后的时长
+        old_player = self.player
+        self.player = player
+        self._current_media = media
+        self._start_playback(url, caching_ms)
+        self.current_index = index
+        self.current_time = 0
+        length = player.get_length()
+        self.total_time = length // 1000 if length > 0 else 0
+        self.is_playing = True
+        self.is_paused = False
+        self.last_error = None
+        player.audio_set_volume(self.current_volume)
+        player.set_pause(0)
+
+        if old_player is not None:
+            old_player.stop()
+            old_player.release()
+        self._notify_status()
+        return True
+
+    def _advance(self, from_index):
+        """
+        播放结束后自动播放下一曲（在工作线程中执行）
+
+        Args:
+            from_index: 播放结束的曲目索引，已手动切换曲目时不再自动切换
+        """
+        with self._play_lock:
+            if from_index != self.current_index or not self.is_playing:
+                return
+            next_index = from_index + 1
+            if next_index >= len(self.playlist):
+                return
+            if not self._take_preloaded(next_index):
+                self.current_index = next_index
+                self.play_current_track()
+
+    def _parse_media_async(self, media, index):
+        """
+        在VLC后台线程中解析媒体的时长和标题，解析完成后更新播放列表
+
+        Args:
+            media: VLC媒体对象
+            index: 媒体在播放列表中的索引
+        """
+        import vlc
+
+        url = self.playlist[index]['url'] if 0 <= index < len(self.playlist) else None
+
+        def on_parsed(event):
+            # 时长只用于当前媒体，预加载媒体的时长在切换时从播放器读取
+            if media is self._current_media:
                 duration = media.get_duration()
-                if duration > 0:
+                if duration > 0 and self.total_time <= 0:
                     self.total_time = duration // 1000
-                else:
-                    # 如果基础解析失败，尝试异步解析
-                    media.parse_with_options(1, 0)  # 1 = parse local, 0 = parse network
-                    time.sleep(0.2)  # 等待异步解析
-                    duration = media.get_duration()
-                    self.total_time = duration // 1000 if duration > 0 else 0
-
-            except Exception as parse_e:
-                print(f"媒体解析警告: {parse_e}")
-                self.total_time = 0
-
-            # 获取音频格式信息
-            import vlc  # 确保vlc模块已导入
-            title = ""
-            try:
-                title = media.get_meta(vlc.Meta.Title)
-            except:
-                title = ""
-
-            # 从URL推断音频格式
-            def infer_format_from_url(url):
-                """从URL推断音频格式"""
-                url_lower = url.lower()
-                if url_lower.endswith('.mp3') or 'mp3' in url_lower:
-                    return 'MP3'
-                elif url_lower.endswith('.wav') or 'wav' in url_lower:
-                    return 'WAV'
-                elif url_lower.endswith('.flac') or 'flac' in url_lower:
-                    return 'FLAC'
-                elif url_lower.endswith('.aac') or 'aac' in url_lower:
-                    return 'AAC'
-                elif url_lower.endswith('.ogg') or 'ogg' in url_lower:
-                    return 'OGG'
-                elif url_lower.endswith('.m4a') or 'm4a' in url_lower:
-                    return 'M4A'
-                elif url_lower.endswith('.opus') or 'opus' in url_lower:
-                    return 'OPUS'
-                else:
-                    return '未知格式'
+            title = media.get_meta(vlc.Meta.Title)
+            # 播放列表已更换时忽略旧媒体的标题
+            if title and 0 <= index < len(self.playlist) and self.playlist[index].get('url') == url:
+                # 论坛检测到的有效标题优先，只替换默认的“音频N”标题
+                forum_title = self.playlist[index].get('title', '')
+                if not forum_title or forum_title.startswith("音频"):
+                    self.playlist[index] = dict(self.playlist[index], title=title)
+            self._notify_status()
+
+        try:
+            media.event_manager().event_attach(vlc.EventType.MediaParsedChanged, on_parsed)
+            media.parse_with_options(MEDIA_PARSE_NETWORK, MEDIA_PARSE_TIMEOUT_MS)
+        except Exception as e:
+            print(f"媒体解析警告: {e}")
+
+    def _status_key(self):
+        """状态栏显示所依赖的状态"""
+        track_info = self.get_current_track_info()
+        return (self.is_initializing(), self.is_playing, self.is_paused, self.current_index,
+                len(self.playlist), track_info.get('title'), self.current_time, self.total_time,
+                self._playlist_version)
+
+    def _notify_status(self):
+        """状态变化时调用状态更新回调（整秒进度不变时不通知）"""
+        if not self.on_status_update:
+            return
+        status = self._status_key()
+        if status == self._last_status:
+            return
+        self._last_status = status
+        self.on_status_update()
+
+    def play_url(self, url: str) -> bool:
+        """直接播放URL音频"""
+        if not self.is_available():
+            if self._init_done.is_set():
+                return False
+            # VLC尚未初始化，记下要播放的音频，初始化完成后再播放
+            self._pending_url = url
+            self.start_initialization()
+            return True
+
+        with self._play_lock:
+            return self._play_media(url)
+
+    def _play_media(self, url: str) -> bool:
+        """创建媒体并开始播放（调用方持有 _play_lock）"""
+        self._discard_preload()
+        self._preload_index = None
+        self.current_time = 0
+        self.total_time = 0
+        self.last_error = None
+        try:
+            source = self._resolve_source(url)
+            media = self.instance.media_new(source)
+            caching_ms = self._apply_network_caching(media, url, source)
+            self.player.set_media(media)
+            self._current_media = media
+            self._start_playback(url, caching_ms)
 
             track_info = {
                 'url': url,
-                'title': title or f"音频{self.current_index + 1}",
+                'title': f"音频{self.current_index + 1}",
                 'format': '音频流',
                 'bitrate': '--'
             }
 
-            # 简化的音频信息获取
-            print(f"加载音频流: {url}")
-
             # 更新播放列表中的当前项目信息
             if 0 <= self.current_index < len(self.playlist):
-                # 合并现有信息和新获取的信息，但优先保留论坛检测到的标题
+                # 只补充缺少的信息，保留论坛检测到的标题和已探测到的格式、位速
                 existing_info = self.playlist[self.current_index].copy()
-
-                # 如果现有信息中有论坛检测到的标题，优先保留它
-                forum_title = existing_info.get('title', '')
-                if forum_title and not forum_title.startswith(f"音频"):
-                    # 论坛检测到的有效标题，保留它
-                    track_info['title'] = forum_title
-
-                # 更新其他信息（格式、位速等），但保留标题
-                existing_info.update({k: v for k, v in track_info.items() if k != 'title'})
+                existing_info['url'] = url
+                for key, value in track_info.items():
+                    existing_info.setdefault(key, value)
                 self.playlist[self.current_index] = existing_info
             else:
                 # 如果当前索引无效，添加到播放列表
                 self.playlist.append(track_info)
                 self.current_index = len(self.playlist) - 1
 
+            # 时长和标题在后台解析，解析完成后通过事件补充，不阻塞界面线程
+            self._parse_media_async(media, self.current_index)
+
             self.player.play()
             self.is_playing = True
             self.is_paused = False
 
-            # 重置音频信息更新标志
-            self._updated_audio_info = False
-
-            # 启动更新定时器
-            self.start_update_timer()
-
-            # 立即触发状态更新回调（在音频开始播放前）
-            if self.on_status_update:
-                self.on_status_update()
+            # 立即触发状态更新回调（在音频开始播放前），之后由VLC事件驱动
+            self._notify_status()
 
             return True
         except Exception as e:
@@ -254,14 +569,14 @@ class AudioPlayer:
 
                     # 重新创建播放器实例
                     if self.instance:
-                        self.player = self.instance.media_player_new()
+                        self.player = self.create_player()
                         print("音频播放器重新初始化成功")
                 except Exception as reinit_e:
                     print(f"重新初始化失败: {reinit_e}")
 
             # 播放失败时也触发状态更新回调
-            if self.on_status_update:
-                self.on_status_update()
+            self.is_playing = False
+            self._notify_status()
 
             return False
 
@@ -271,37 +586,42 @@ class AudioPlayer:
             self.player.play()
             self.is_paused = False
             # 触发状态更新回调
-            if self.on_status_update:
-                self.on_status_update()
+            self._notify_status()
         elif self.is_playing:
             self.player.pause()
             self.is_paused = True
             # 触发状态更新回调
-            if self.on_status_update:
-                self.on_status_update()
+            self._notify_status()
         else:
             # 开始播放当前曲目
             self.play_current_track()
 
     def stop(self):
         """停止播放"""
-        if self.player:
-            self.player.stop()
-        self.is_playing = False
-        self.is_paused = False
-        self.current_index = 0
-        self.current_time = 0
-        self.stop_update_timer()
+        self._pending_url = None
+        with self._play_lock:
+            self._discard_preload()
+            self._preload_index = None
+            self._finish_playback()
+            if self.player:
+                self.player.stop()
+            self.is_playing = False
+            self.is_paused = False
+            self.current_index = 0
+            self.current_time = 0
         # 触发状态更新回调
-        if self.on_status_update:
-            self.on_status_update()
+        self._notify_status()
 
     def next_track(self) -> bool:
         """播放下一首"""
-        if self.current_index < len(self.playlist) - 1:
-            self.current_index += 1
-            return self.play_current_track()
-        return False
+        with self._play_lock:
+            if self.current_index < len(self.playlist) - 1:
+                # 下一曲已预加载时直接切换，不重新连接和缓冲
+                if self._take_preloaded(self.current_index + 1):
+                    return True
+                self.current_index += 1
+                return self.play_current_track()
+            return False
 
     def previous_track(self) -> bool:
         """播放上一首"""
@@ -310,6 +630,88 @@ class AudioPlayer:
             return self.play_current_track()
         return False
 
+    def set_playlist(self, tracks: List[Dict]):
+        """
+        替换播放列表并回到第一首（没有标题的音频使用“音频N”）
+
+        Args:
+            tracks: 音频字典列表，包含url和title
+        """
+        with self._play_lock:
+            self._discard_preload()
+            self._preload_index = None
+            self.playlist = []
+            self.current_index = 0
+            self.append_tracks(tracks)
+
+    def append_tracks(self, tracks: List[Dict]) -> int:
+        """
+        在播放列表末尾追加音频（跳过已在列表中的地址），不影响正在播放的曲目
+
+        Args:
+            tracks: 音频字典列表，包含url和title
+
+        Returns:
+            int: 实际追加的数量
+        """
+        with self._play_lock:
+            seen_urls = {track['url'] for track in self.playlist}
+            added = 0
+            for track in tracks:
+                if track['url'] in seen_urls:
+                    continue
+                seen_urls.add(track['url'])
+                self.playlist.append(dict(track, title=track.get('title') or f"音频{len(self.playlist) + 1}"))
+                added += 1
+        if added:
+            self._probe_tracks(tracks)
+            self._notify_status()
+        return added
+
+    def _probe_tracks(self, tracks):
+        """在后台探测音频的格式、位速和时长"""
+        if self._prober is None:
+            from src.utils.audio_probe import AudioProber
+            self._prober = AudioProber(stream_tuner=self.stream_tuner, activity=self.activity)
+        self._prober.probe_tracks(tracks, self._on_track_probed)
+
+    def _on_track_probed(self, url, info):
+        """
+        音频信息探测完成，更新播放列表中对应的项目（在探测线程中调用）
+
+        Args:
+            url: 音频地址
+            info: 探测结果，可能包含 size, format, bitrate, duration
+        """
+        with self._play_lock:
+            for index, track in enumerate(self.playlist):
+                if track.get('url') != url:
+                    continue
+                updated = dict(track)
+                if info.get('format'):
+                    updated['format'] = info['format']
+                if info.get('bitrate'):
+                    updated['bitrate'] = f"{info['bitrate']}kbps"
+                if info.get('duration'):
+                    updated['duration'] = info['duration']
+                if info.get('size'):
+                    updated['size'] = info['size']
+                self.playlist[index] = updated
+                if index == self.current_index and self.total_time <= 0 and info.get('duration'):
+                    self.total_time = info['duration']
+            self._playlist_version += 1
+        self._notify_status()
+
+    def get_playlist_duration(self):
+        """
+        获取播放列表总时长
+
+        Returns:
+            tuple: (已知时长的总秒数, 已知时长的音频数)
+        """
+        durations = [track['duration'] for track in self.playlist if track.get('duration')]
+        return sum(durations), len(durations)
+
     def play_current_track(self) -> bool:
         """播放当前曲目"""
         if 0 <= self.current_index < len(self.playlist):
@@ -356,61 +758,6 @@ class AudioPlayer:
             new_time = min(total_time, current_time + seconds * 1000)
             self.player.set_time(new_time)
 
-    def start_update_timer(self):
-        """启动状态更新定时器"""
-        self.stop_update_timer()
-        self.update_timer = threading.Timer(1.0, self.update_position)
-        self.update_timer.daemon = True
-        self.update_timer.start()
-
-    def stop_update_timer(self):
-        """停止状态更新定时器"""
-        if self.update_timer:
-            self.update_timer.cancel()
-            self.update_timer = None
-
-    def update_position(self):
-        """更新播放位置信息"""
-        if self.is_playing and not self.is_paused and self.player:
-            try:
-                self.current_time = self.player.get_time() // 1000
-
-                # 在播放开始后尝试更新音频信息（第一次更新时）
-                if self.current_time <= 1 and hasattr(self, '_updated_audio_info') and not self._updated_audio_info:
-                    self.update_audio_info_from_playing()
-                    self._updated_audio_info = True
-
-                # 递归启动下一次更新
-                self.update_timer = threading.Timer(1.0, self.update_position)
-                self.update_timer.daemon = True
-                self.update_timer.start()
-            except:
-                pass
-
-    def update_audio_info_from_playing(self):
-        """在播放过程中更新基本信息（时长等）"""
-        try:
-            if self.player and self.player.get_media():
-                media = self.player.get_media()
-
-                print("播放开始后更新基本信息...")
-
-                # 等待一下让VLC完全加载媒体
-                import time
-                time.sleep(0.5)
-
-                # 尝试更新总时长信息
-                try:
-                    current_duration = media.get_duration()
-                    if current_duration > 0 and self.total_time <= 0:
-                        self.total_time = current_duration // 1000
-                        print(f"播放中更新总时长: {self.total_time}秒")
-                except Exception as dur_e:
-                    print(f"更新时长失败: {dur_e}")
-
-        except Exception as e:
-            print(f"更新音频信息时出错: {e}")
-
     def get_current_track_info(self) -> Dict:
         """获取当前曲目信息"""
         if 0 <= self.current_index < len(self.playlist):
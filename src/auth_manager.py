@@ -7,16 +7,59 @@
 import requests
 import sys
 import os
+import json
+import time
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.api_config import APPKEY, SECKEY
+from src.utils.startup_profiler import startup_profiler
+from config_manager import get_account_password
+
+# 持久化会话的最长保留时间（秒），超过后启动时不再复用
+SESSION_MAX_AGE = 7 * 24 * 3600
+
+# 重新登录失败后，在此时间（秒）内不再自动重试，避免密码错误时每个请求都去登录
+RELOGIN_RETRY_INTERVAL = 30
+
+# 不写入会话文件的用户信息字段
+_UNPERSISTED_FIELDS = ('password', 'encrypted_password')
 
 class AuthenticationManager:
     """认证管理器"""
 
-    def __init__(self):
-        """初始化认证管理器"""
+    def __init__(self, session_file=None, crypto=None):
+        """
+        初始化认证管理器
+
+        Args:
+            session_file: 会话持久化文件路径，为None时不持久化会话
+            crypto: 加密管理器实例，用于加密会话文件
+        """
         self.active_sessions = {}  # {forum_name: session}
         self.user_info = {}  # {forum_name: user_info}
+        self.session_pool = {}  # {(forum_name, username): (session, user_info)}
+        self._account_configs = {}  # {(forum_name, username): 账户配置}，重新登录时使用
+        self._login_times = {}  # {(forum_name, username): 会话登录的时间}，用于判断会话是否过期
+        self._pending_logins = {}  # {(forum_name, username): Future}
+        self._pool_lock = threading.Lock()
+        self._warmup_done = threading.Event()
+        self._warmup_done.set()
+
+        # 会话持久化
+        self.session_file = session_file if crypto else None
+        self.crypto = crypto
+        self._store_lock = threading.Lock()
+
+        # 会话失效后的自动重新登录
+        self._relogin_locks = {}  # {(forum_name, username): Lock}
+        self._replaced_sessions = weakref.WeakKeyDictionary()  # {失效会话: (forum_name, username)}
+        self._relogin_failures = {}  # {(forum_name, username): 最近一次重新登录失败的时间}
+
+    def _account_key(self, forum_config):
+        """获取账户在会话池中的键"""
+        return (forum_config.get('name'), forum_config.get('username'))
 
     def login_to_forum(self, forum_config):
         """
@@ -28,11 +71,191 @@ class AuthenticationManager:
         Returns:
             bool: 是否登录成功
         """
+        entry = self._authenticate(forum_config)
+        if entry is None:
+            return False
+
+        key = self._account_key(forum_config)
+        with self._pool_lock:
+            self.session_pool[key] = entry
+            self._account_configs[key] = dict(forum_config)
+            self._login_times[key] = time.time()
+        self._activate(forum_config['name'], entry)
+        self.save_sessions()
+        return True
+
+    def activate_account(self, forum_config):
+        """
+        切换到指定账户，会话池中已有该账户的会话时直接使用，不再重新登录
+
+        Args:
+            forum_config: 论坛配置，包含url, username, password等字段
+
+        Returns:
+            bool: 是否切换成功
+        """
+        # 后台预热尚未完成时先等待，以便复用恢复的会话
+        self._warmup_done.wait()
+
+        key = self._account_key(forum_config)
+        with self._pool_lock:
+            entry = self.session_pool.get(key)
+            pending = self._pending_logins.get(key)
+
+        # 后台预登录尚未完成时等待其结果，避免重复登录
+        if entry is None and pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass
+            with self._pool_lock:
+                entry = self.session_pool.get(key)
+
+        if entry is None:
+            return self.login_to_forum(forum_config)
+
+        with self._pool_lock:
+            self._account_configs[key] = dict(forum_config)
+        self._activate(forum_config['name'], entry)
+        return True
+
+    def warm_up(self, accounts):
+        """
+        在后台线程中恢复已保存的会话，再并发登录其余账户（立即返回）
+
+        会话文件的解密和网络登录都不在界面线程中进行，账户选择界面可以先显示出来
+
+        Args:
+            accounts: 账户配置列表
+        """
+        self._warmup_done.clear()
+
+        def run():
+            try:
+                with startup_profiler.phase("恢复已保存的会话"):
+                    self.restore_sessions(accounts)
+                self.prelogin_accounts(accounts)
+            except Exception:
+                pass
+            finally:
+                self._warmup_done.set()
+
+        threading.Thread(target=run, name="SessionWarmUp", daemon=True).start()
+
+    def prelogin_accounts(self, accounts, max_workers=4):
+        """
+        在后台并发登录所有账户，预热会话池（立即返回，不阻塞调用方）
+
+        Args:
+            accounts: 账户配置列表
+            max_workers: 最大并发登录数
+        """
+        to_login = []
+        with self._pool_lock:
+            for account in accounts:
+                key = self._account_key(account)
+                if key in self.session_pool or key in self._pending_logins:
+                    continue
+                to_login.append(account)
+
+            if not to_login:
+                return
+
+            executor = ThreadPoolExecutor(max_workers=min(max_workers, len(to_login)),
+                                          thread_name_prefix="prelogin")
+            for account in to_login:
+                self._pending_logins[self._account_key(account)] = executor.submit(self._prelogin, account)
+
+        executor.shutdown(wait=False)
+
+    def _prelogin(self, forum_config):
+        """后台登录单个账户并放入会话池"""
+        key = self._account_key(forum_config)
+        try:
+            entry = self._authenticate(forum_config)
+            if entry is not None:
+                with self._pool_lock:
+                    # 前台可能已经登录过该账户，保留已有会话
+                    if key not in self.session_pool:
+                        self.session_pool[key] = entry
+                        self._account_configs[key] = dict(forum_config)
+                        self._login_times[key] = time.time()
+                    else:
+                        entry[0].close()
+                self.save_sessions()
+        finally:
+            with self._pool_lock:
+                self._pending_logins.pop(key, None)
+
+    def prune_sessions(self, accounts):
+        """
+        移除会话池中已不在账户列表里的会话（账户被删除、改名或修改了地址和密码后调用）
+
+        Args:
+            accounts: 当前的账户配置列表
+        """
+        accounts_by_key = {self._account_key(account): account for account in accounts}
+        with self._pool_lock:
+            stale_keys = [key for key in self.session_pool
+                          if key not in accounts_by_key or self._credentials_changed(key, accounts_by_key[key])]
+            stale_entries = [self.session_pool.pop(key) for key in stale_keys]
+            for key in stale_keys:
+                self._account_configs.pop(key, None)
+                self._login_times.pop(key, None)
+                self._relogin_failures.pop(key, None)
+
+        # user_info中的username是服务器返回的昵称，不一定是登录账号，按会话对象判断是否为当前账户
+        for (forum_name, _), (session, _) in zip(stale_keys, stale_entries):
+            if self.active_sessions.get(forum_name) is session:
+                self.active_sessions.pop(forum_name, None)
+                self.user_info.pop(forum_name, None)
+
+        for session, _ in stale_entries:
+            session.close()
+
+        if stale_entries:
+            self.save_sessions()
+
+    def _credentials_changed(self, key, account):
+        """账户的地址或密码是否与会话池中的会话登录时使用的不同（调用方持有会话池锁）"""
+        old = self._account_configs.get(key)
+        if old is None:
+            return False
+        if old.get('url') != account.get('url'):
+            return True
+        if old.get('password') == account.get('password') and \
+                old.get('encrypted_password') == account.get('encrypted_password'):
+            return False
+        # 加密结果每次不同，密文不一致时再比较明文
+        try:
+            return get_account_password(old, self.crypto) != get_account_password(account, self.crypto)
+        except Exception:
+            return True
+
+    def _activate(self, forum_name, entry):
+        """把会话设为指定论坛的当前会话"""
+        session, user_info = entry
+        self.active_sessions[forum_name] = session
+        if user_info:
+            self.user_info[forum_name] = user_info
+        else:
+            self.user_info.pop(forum_name, None)
+
+    def _authenticate(self, forum_config):
+        """
+        向论坛发送登录请求
+
+        Args:
+            forum_config: 论坛配置，包含url, username, password等字段
+
+        Returns:
+            tuple: (session, user_info)，登录失败返回None
+        """
         try:
-            forum_name = forum_config['name']
             forum_url = forum_config['url']
             username = forum_config['username']
-            password = forum_config['password']
+            # 只带加密密码的账户在此处才解密
+            password = get_account_password(forum_config, self.crypto)
 
             # 创建会话
             session = requests.Session()
@@ -53,8 +276,7 @@ class AuthenticationManager:
             if response.status_code == 200:
                 result = response.json()
                 if result.get('status') == 1:
-                    # 登录成功，保存会话
-                    self.active_sessions[forum_name] = session
+                    user_info = None
 
                     # 用户ID在 message.user.uid 中
                     user_data = result.get('message', {}).get('user', {})
@@ -68,29 +290,28 @@ class AuthenticationManager:
                     # 如果从登录响应中获取到了用户信息，直接使用
                     if user_data and uid:
                         # 合并论坛配置和用户信息
-                        self.user_info[forum_name] = {
+                        user_info = {
                             **forum_config,  # 包含url, username, password等
                             **user_data      # 包含uid, nickname等
                         }
                     else:
                         # 尝试通过API获取用户信息
                         if uid:
-                            user_info = self._get_user_info(session, forum_url, uid)
-                            if user_info:
+                            fetched_info = self._get_user_info(session, forum_url, uid)
+                            if fetched_info:
                                 # 合并论坛配置和用户信息
-                                self.user_info[forum_name] = {
+                                user_info = {
                                     **forum_config,  # 包含url, username, password等
-                                    **user_info     # 包含uid, nickname等
+                                    **fetched_info   # 包含uid, nickname等
                                 }
 
-                    return True
-                else:
-                    return False
-            else:
-                return False
+                    return session, user_info
+
+            session.close()
+            return None
 
         except Exception as e:
-            return False
+            return None
 
     def logout_from_forum(self, forum_name):
         """
@@ -100,9 +321,16 @@ class AuthenticationManager:
             forum_name: 论坛名称
         """
         if forum_name in self.active_sessions:
-            # 关闭会话
-            self.active_sessions[forum_name].close()
-            del self.active_sessions[forum_name]
+            # 关闭会话并从会话池中移除
+            session = self.active_sessions.pop(forum_name)
+            with self._pool_lock:
+                for key, (pooled_session, _) in list(self.session_pool.items()):
+                    if pooled_session is session:
+                        del self.session_pool[key]
+                        self._account_configs.pop(key, None)
+                        self._login_times.pop(key, None)
+            session.close()
+            self.save_sessions()
 
         if forum_name in self.user_info:
             del self.user_info[forum_name]
@@ -191,6 +419,233 @@ class AuthenticationManager:
         return self.login_to_forum(forum_config)
 
     def logout_all(self):
-        """登出所有论坛"""
-        for forum_name in list(self.active_sessions.keys()):
-            self.logout_from_forum(forum_name)
\ No newline at end of file
+        """关闭会话池中的所有会话（已持久化的会话保留，下次启动时复用）"""
+        self.save_sessions()
+        self.active_sessions.clear()
+        self.user_info.clear()
+
+        with self._pool_lock:
+            entries = list(self.session_pool.values())
+            self.session_pool.clear()
+            self._account_configs.clear()
+            self._login_times.clear()
+        for session, _ in entries:
+            session.close()
+
+    def get_auth(self, forum_name):
+        """
+        获取指定论坛的auth参数
+
+        Args:
+            forum_name: 论坛名称
+
+        Returns:
+            str: auth参数，如果不存在则返回空字符串
+        """
+        user_info = self.user_info.get(forum_name) or {}
+        return user_info.get('auth', '')
+
+    # ========== 会话持久化 ==========
+
+    def restore_sessions(self, accounts):
+        """
+        从会话文件恢复已保存的会话到会话池，恢复的会话在第一次真实请求时才验证
+
+        Args:
+            accounts: 当前的账户配置列表，只恢复仍然存在的账户
+
+        Returns:
+            int: 恢复的会话数量
+        """
+        stored = self._load_session_file()
+        if not stored:
+            return 0
+
+        now = time.time()
+        restored = 0
+        for account in accounts:
+            record = stored.get(self._store_key(self._account_key(account)))
+            if not record:
+                continue
+            # 旧版本的会话文件只有保存时间
+            logged_in_at = record.get('logged_in_at', record.get('saved_at', 0))
+            if now - logged_in_at > SESSION_MAX_AGE:
+                continue
+            if record.get('url') != account.get('url'):
+                continue
+
+            session = requests.Session()
+            for cookie in record.get('cookies', []):
+                session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+                )
+            user_info = {**account, **record.get('user_info', {})}
+
+            key = self._account_key(account)
+            with self._pool_lock:
+                if key in self.session_pool:
+                    session.close()
+                    continue
+                self.session_pool[key] = (session, user_info)
+                self._account_configs[key] = dict(account)
+                self._login_times[key] = logged_in_at
+            restored += 1
+
+        return restored
+
+    def is_auth_failure(self, response):
+        """
+        判断响应是否表示登录状态已失效
+
+        Args:
+            response: 响应对象
+
+        Returns:
+            bool: 是否为认证失败响应
+        """
+        if response.status_code in (401, 403):
+            return True
+
+        # 被重定向到登录页面
+        if 'user-login' in (response.url or ''):
+            return True
+
+        # JSON接口返回的错误信息中提示需要登录（错误响应都很短，避免对大响应重复解析）
+        content = response.content
+        if response.status_code == 200 and len(content) < 2048 and b'"status"' in content:
+            try:
+                result = json.loads(content)
+            except ValueError:
+                return False
+            if isinstance(result, dict) and result.get('status') != 1:
+                message = str(result.get('message', ''))
+                return '登录' in message or 'login' in message.lower()
+
+        return False
+
+    def recover_session(self, session):
+        """
+        会话认证失败后重新登录对应账户
+
+        多个请求同时发现同一会话失效时只会重新登录一次，
+        后到的请求直接使用已经重新登录的会话
+
+        Args:
+            session: 认证失败的会话对象
+
+        Returns:
+            tuple: 重新登录后的 (session, user_info)，无法恢复时返回None
+        """
+        key = self._find_session_key(session)
+        if key is None:
+            return None
+
+        with self._get_relogin_lock(key):
+            with self._pool_lock:
+                current = self.session_pool.get(key)
+            if current is None:
+                return None
+
+            # 其他请求已经完成了重新登录
+            if current[0] is not session:
+                return current
+
+            # 最近重新登录失败过，暂不重试
+            failed_at = self._relogin_failures.get(key)
+            if failed_at and time.time() - failed_at < RELOGIN_RETRY_INTERVAL:
+                return None
+
+            # 合并后的用户信息中username已被服务器返回的昵称覆盖，使用登录时的账户配置
+            with self._pool_lock:
+                forum_config = self._account_configs.get(key)
+            if not forum_config or (not forum_config.get('password')
+                                    and not forum_config.get('encrypted_password')):
+                return None
+
+            entry = self._authenticate(forum_config)
+            if entry is None:
+                self._relogin_failures[key] = time.time()
+                return None
+            self._relogin_failures.pop(key, None)
+
+            with self._pool_lock:
+                self.session_pool[key] = entry
+                self._login_times[key] = time.time()
+            self._replaced_sessions[session] = key
+
+            forum_name = key[0]
+            if self.active_sessions.get(forum_name) is session:
+                self._activate(forum_name, entry)
+
+        # 旧会话可能仍被其他线程使用，不主动关闭，由垃圾回收释放
+        self.save_sessions()
+        return entry
+
+    def _find_session_key(self, session):
+        """查找会话所属账户在会话池中的键"""
+        with self._pool_lock:
+            for key, (pooled_session, _) in self.session_pool.items():
+                if pooled_session is session:
+                    return key
+        return self._replaced_sessions.get(session)
+
+    def _get_relogin_lock(self, key):
+        """获取账户的重新登录锁"""
+        with self._pool_lock:
+            lock = self._relogin_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._relogin_locks[key] = lock
+            return lock
+
+    def save_sessions(self):
+        """把会话池中的会话加密写入会话文件"""
+        if not self.session_file:
+            return
+
+        with self._pool_lock:
+            entries = list(self.session_pool.items())
+            login_times = dict(self._login_times)
+
+        stored = {}
+        now = time.time()
+        for key, (session, user_info) in entries:
+            if not user_info:
+                continue
+            stored[self._store_key(key)] = {
+                'url': user_info.get('url', ''),
+                # 保存会话时不更新登录时间，会话从登录起超过 SESSION_MAX_AGE 后不再复用
+                'logged_in_at': login_times.get(key, now),
+                'cookies': [
+                    {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+                    for c in session.cookies
+                ],
+                'user_info': {k: v for k, v in user_info.items() if k not in _UNPERSISTED_FIELDS}
+            }
+
+        try:
+            data = self.crypto.encrypt(json.dumps(stored, ensure_ascii=False))
+            with self._store_lock:
+                temp_file = f"{self.session_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_file, self.session_file)
+        except Exception as e:
+            pass
+
+    def _load_session_file(self):
+        """读取并解密会话文件"""
+        if not self.session_file or not os.path.exists(self.session_file):
+            return {}
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                data = self.crypto.decrypt(f.read())
+            return json.loads(data) if data else {}
+        except Exception:
+            return {}
+
+    def _store_key(self, key):
+        """会话池键在会话文件中的字符串形式"""
+        forum_name, username = key
+        return f"{forum_name}\n{username}"
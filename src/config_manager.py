@@ -5,20 +5,46 @@
 """
 
 import os
+import io
 import sys
+import atexit
+import threading
 import configparser
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.utils.crypto import CryptoManager
+from src.utils.settings import Settings
+
+# 保存配置的合并延迟（秒），此时间内的多次修改只写一次文件
+SAVE_DELAY = 0.5
+
+def get_account_password(account, crypto):
+    """
+    获取账户的明文密码，账户只带加密密码时才解密
+
+    Args:
+        account: 账户字典
+        crypto: 加密管理器实例
+
+    Returns:
+        str: 明文密码，没有密码时返回空字符串
+    """
+    if account.get('password'):
+        return account['password']
+    encrypted_password = account.get('encrypted_password')
+    if encrypted_password and crypto:
+        return crypto.decrypt(encrypted_password)
+    return ''
 
 class ConfigManager:
     """配置文件管理器"""
 
-    def __init__(self, config_file=None):
+    def __init__(self, config_file=None, use_sqlite=False):
         """
         初始化配置管理器
 
         Args:
             config_file: 配置文件路径，如果为None则使用默认路径
+            use_sqlite: 是否使用SQLite存储（与配置文件同名的 .db 文件已存在时自动使用）
         """
         if config_file is None:
             # 默认配置文件路径
@@ -32,61 +58,201 @@ class ConfigManager:
         self.config = configparser.ConfigParser()
         self.crypto = CryptoManager()
 
-        # 加载配置文件
-        self.load_config()
+        # 账户索引 {论坛名: {用户名: 序号}}，以及各论坛已分配过的最大序号
+        self._account_index = {}
+        self._max_slots = {}
+
+        # 延迟写入状态
+        self._pending_text = None  # 等待写入的配置内容
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        # 退出时写入尚未保存的修改
+        atexit.register(self.flush)
+
+        # SQLite存储，为None时使用INI配置文件
+        self.store = None
+        db_file = os.path.splitext(config_file)[0] + '.db'
+        if use_sqlite or os.path.exists(db_file):
+            self.open_store(db_file)
+        else:
+            # 加载配置文件
+            self.load_config()
+
+        # 软件设置快照（只在此处读取一次）
+        self.settings = Settings(self)
+
+        # 在后台派生密钥，账户列表只带加密后的密码，登录时才解密
+        self.crypto.prewarm()
 
     def load_config(self):
         """加载配置文件"""
         if os.path.exists(self.config_file):
             self.config.read(self.config_file, encoding='utf-8')
+        self._rebuild_account_index()
+
+    def open_store(self, db_file):
+        """
+        打开SQLite存储，首次打开时从INI配置文件迁移账户和设置
+
+        Args:
+            db_file: 数据库文件路径
+        """
+        from src.utils.sqlite_store import SQLiteStore
+
+        store = SQLiteStore(db_file)
+        if store.get_meta('migrated_at') is None:
+            # 读取旧配置文件并一次性导入（配置文件保留作为备份）
+            self.load_config()
+            settings = dict(self.config['Settings']) if 'Settings' in self.config else {}
+            store.migrate(self.get_forum_list(), settings, os.path.basename(self.config_file))
+
+            # 迁移后不再使用INI中的内容
+            self.config = configparser.ConfigParser()
+            self._rebuild_account_index()
+        self.store = store
+
+    def _rebuild_account_index(self):
+        """扫描配置文件建立账户索引（只在加载配置时执行一次）"""
+        self._account_index = {}
+        self._max_slots = {}
+        for section in self.config.sections():
+            if not section.startswith('Forum_'):
+                continue
+            forum_name = section[6:]  # 去掉 'Forum_' 前缀
+            slots = {}
+            max_slot = 0
+            for key, value in self.config[section].items():
+                # 查找所有用户名（跳过旧的username字段）
+                if key.startswith('username') and len(key) > 8:  # 确保是 username1, username2 等
+                    user_num = key[8:]  # 去掉 'username' 前缀
+                    slots[value] = user_num
+                # 已删除账户留下的其他字段也计入，避免新账户复用其序号
+                for prefix in ('username', 'password', 'nickname'):
+                    if key.startswith(prefix) and key[len(prefix):].isdigit():
+                        max_slot = max(max_slot, int(key[len(prefix):]))
+            self._account_index[forum_name] = slots
+            self._max_slots[forum_name] = max_slot
+
+    def _allocate_slot(self, forum_name):
+        """
+        为论坛分配新的账户序号（始终大于已分配过的序号，删除账户后也不会重复）
+
+        Args:
+            forum_name: 论坛名称
+
+        Returns:
+            str: 账户序号
+        """
+        slot = self._max_slots.get(forum_name, 0) + 1
+        self._max_slots[forum_name] = slot
+        return str(slot)
 
     def save_config(self):
-        """保存配置文件"""
+        """
+        保存配置文件
+
+        只在内存中生成配置内容，由后台定时器在 SAVE_DELAY 秒后写入磁盘，
+        期间的多次保存合并为一次写入
+        """
+        buffer = io.StringIO()
+        self.config.write(buffer)
+
+        with self._save_lock:
+            self._pending_text = buffer.getvalue()
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """
+        立即写入尚未保存的配置（程序退出时调用）
+
+        Returns:
+            bool: 是否写入成功，没有待写入的内容时返回True
+        """
+        with self._write_lock:
+            with self._save_lock:
+                text = self._pending_text
+                self._pending_text = None
+                if self._save_timer:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+
+            if text is None:
+                return True
+
+            try:
+                self._write_file(text)
+                return True
+            except Exception as e:
+                print(f"[WARN] 保存配置文件失败: {e}")
+                with self._save_lock:
+                    # 保留内容，下次保存或退出时重试（期间有新的修改时以新内容为准）
+                    if self._pending_text is None:
+                        self._pending_text = text
+                return False
+
+    def _write_file(self, text):
+        """
+        写入配置文件，先写临时文件再替换，写入中途崩溃也不会损坏原文件
+
+        Args:
+            text: 配置内容
+        """
         # 确保配置目录存在
         config_dir = os.path.dirname(self.config_file)
-        if not os.path.exists(config_dir):
+        if config_dir and not os.path.exists(config_dir):
             os.makedirs(config_dir)
 
-        # 保存配置文件
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            self.config.write(f)
+        temp_file = self.config_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.config_file)
 
     def get_forum_list(self):
         """
         获取论坛账户列表
 
         Returns:
-            list: 论坛账户列表，每个账户是一个字典
+            list: 论坛账户列表，每个账户是一个字典，密码以加密形式保存在 encrypted_password 中
         """
-        accounts = []
-        for section in self.config.sections():
-            if section.startswith('Forum_'):
-                forum_config = dict(self.config[section])
-                forum_name = section[6:]  # 去掉 'Forum_' 前缀
-                url = forum_config.get('url', '')
+        if self.store is not None:
+            return self.store.list_accounts()
 
-                # 查找所有用户名（跳过旧的username字段）
-                for key, value in forum_config.items():
-                    if key.startswith('username') and len(key) > 8:  # 确保是 username1, username2 等
-                        # 提取用户名序号
-                        user_num = key[8:]  # 去掉 'username' 前缀
-                        nickname_key = f'nickname{user_num}'
-                        password_key = f'password{user_num}'
-
-                        # 解密密码
-                        password_value = forum_config.get(password_key, '')
-                        password = self.crypto.decrypt(password_value) if password_value else ''
-                        nickname = forum_config.get(nickname_key, '')
-
-                        accounts.append({
-                            'name': forum_name,
-                            'url': url,
-                            'username': value,  # 存储的是用户名
-                            'password': password,
-                            'nickname': nickname
-                        })
+        accounts = []
+        for forum_name, slots in self._account_index.items():
+            section = self.config[f"Forum_{forum_name}"]
+            url = section.get('url', '')
+
+            for username, user_num in slots.items():
+                accounts.append({
+                    'name': forum_name,
+                    'url': url,
+                    'username': username,  # 存储的是用户名
+                    # 密码保持加密，真正登录该账户时才解密
+                    'encrypted_password': section.get(f'password{user_num}', ''),
+                    'nickname': section.get(f'nickname{user_num}', '')
+                })
         return accounts
 
+    def get_account_password(self, account):
+        """
+        获取账户的明文密码
+
+        Args:
+            account: 账户字典（get_forum_list 返回的账户或包含明文 password 的账户）
+
+        Returns:
+            str: 明文密码，没有密码时返回空字符串
+        """
+        return get_account_password(account, self.crypto)
+
     def add_forum(self, forum_data):
         """
         添加论坛账户
@@ -97,6 +263,14 @@ class ConfigManager:
         Returns:
             bool: 是否添加成功
         """
+        if self.store is not None:
+            try:
+                encrypted_password = self.crypto.encrypt(forum_data['password']) if 'password' in forum_data else ''
+                return self.store.add_account(forum_data['name'], forum_data['url'], forum_data['username'],
+                                              forum_data['nickname'], encrypted_password)
+            except Exception as e:
+                return False
+
         try:
             # 生成配置节名
             section_name = f"Forum_{forum_data['name']}"
@@ -108,9 +282,8 @@ class ConfigManager:
                     'url': forum_data['url']
                 }
 
-            # 为该论坛的所有账户查找序号
-            existing_accounts = self.get_forum_accounts(forum_data['name'])
-            user_num = len(existing_accounts) + 1
+            # 分配新的账户序号
+            user_num = self._allocate_slot(forum_data['name'])
 
             # 添加新账户
             self.config[section_name][f'username{user_num}'] = forum_data['username']
@@ -120,6 +293,9 @@ class ConfigManager:
             if 'password' in forum_data:
                 self.config[section_name][f'password{user_num}'] = self.crypto.encrypt(forum_data['password'])
 
+            # 更新账户索引
+            self._account_index.setdefault(forum_data['name'], {})[forum_data['username']] = user_num
+
             # 保存配置
             self.save_config()
             return True
@@ -137,20 +313,9 @@ class ConfigManager:
         Returns:
             list: 该论坛的账户列表
         """
-        section_name = f"Forum_{forum_name}"
-        if section_name not in self.config:
-            return []
-
-        accounts = []
-        forum_config = dict(self.config[section_name])
-
-        # 查找所有用户名（跳过旧的username字段）
-        for key, value in forum_config.items():
-            if key.startswith('username') and len(key) > 8:  # 确保是 username1, username2 等
-                user_num = key[8:]  # 去掉 'username' 前缀
-                accounts.append(value)  # 存储用户名
-
-        return accounts
+        if self.store is not None:
+            return self.store.get_forum_usernames(forum_name)
+        return list(self._account_index.get(forum_name, {}))
 
     def forum_account_exists(self, forum_name, username):
         """
@@ -163,8 +328,9 @@ class ConfigManager:
         Returns:
             bool: 是否存在
         """
-        existing_accounts = self.get_forum_accounts(forum_name)
-        return username in existing_accounts
+        if self.store is not None:
+            return self.store.account_exists(forum_name, username)
+        return username in self._account_index.get(forum_name, {})
 
     def delete_forum_account(self, forum_name, username):
         """
@@ -177,21 +343,17 @@ class ConfigManager:
         Returns:
             bool: 是否删除成功
         """
+        if self.store is not None:
+            return self.store.delete_account(forum_name, username)
+
         try:
             section_name = f"Forum_{forum_name}"
             if section_name not in self.config:
                 return False
 
             # 查找要删除的账户
-            forum_config = dict(self.config[section_name])
-            key_to_delete = None
-
-            for key, value in forum_config.items():
-                if key.startswith('username') and len(key) > 8 and value == username:
-                    user_num = key[8:]  # 去掉 'username' 前缀
-                    key_to_delete = user_num
-                    break
-
+            slots = self._account_index.get(forum_name, {})
+            key_to_delete = slots.get(username)
             if not key_to_delete:
                 return False
 
@@ -201,10 +363,13 @@ class ConfigManager:
                 if key in self.config[section_name]:
                     del self.config[section_name][key]
 
+            del slots[username]
+
             # 如果没有账户了，删除整个论坛
-            remaining_accounts = self.get_forum_accounts(forum_name)
-            if not remaining_accounts:
+            if not slots:
                 self.config.remove_section(section_name)
+                self._account_index.pop(forum_name, None)
+                self._max_slots.pop(forum_name, None)
 
             # 保存配置
             self.save_config()
@@ -225,21 +390,24 @@ class ConfigManager:
         Returns:
             bool: 是否更新成功
         """
+        if self.store is not None:
+            try:
+                encrypted_password = None
+                if 'password' in new_account_data:
+                    encrypted_password = self.crypto.encrypt(new_account_data['password'])
+                return self.store.update_account(forum_name, old_username, new_account_data['username'],
+                                                 new_account_data['nickname'], encrypted_password)
+            except Exception as e:
+                return False
+
         try:
             section_name = f"Forum_{forum_name}"
             if section_name not in self.config:
                 return False
 
             # 查找要更新的账户
-            forum_config = dict(self.config[section_name])
-            key_to_update = None
-
-            for key, value in forum_config.items():
-                if key.startswith('username') and len(key) > 8 and value == old_username:
-                    user_num = key[8:]  # 去掉 'username' 前缀
-                    key_to_update = user_num
-                    break
-
+            slots = self._account_index.get(forum_name, {})
+            key_to_update = slots.get(old_username)
             if not key_to_update:
                 return False
 
@@ -256,6 +424,13 @@ class ConfigManager:
             if 'password' in new_account_data:
                 self.config[section_name][f'password{key_to_update}'] = self.crypto.encrypt(new_account_data['password'])
 
+            # 更新账户索引（保持账户顺序不变）
+            if old_username != new_account_data['username']:
+                self._account_index[forum_name] = {
+                    (new_account_data['username'] if username == old_username else username): user_num
+                    for username, user_num in slots.items()
+                }
+
             # 保存配置
             self.save_config()
             return True
@@ -273,6 +448,9 @@ class ConfigManager:
         Returns:
             bool: 是否删除成功
         """
+        if self.store is not None:
+            return self.store.delete_forum(forum_name)
+
         try:
             section_name = f"Forum_{forum_name}"
 
@@ -282,6 +460,8 @@ class ConfigManager:
 
             # 删除配置
             self.config.remove_section(section_name)
+            self._account_index.pop(forum_name, None)
+            self._max_slots.pop(forum_name, None)
 
             # 保存配置
             self.save_config()
@@ -300,6 +480,9 @@ class ConfigManager:
         Returns:
             dict: 论坛配置，如果不存在则返回None
         """
+        if self.store is not None:
+            return self.store.get_forum(forum_name)
+
         section_name = f"Forum_{forum_name}"
         if section_name not in self.config:
             return None
@@ -321,6 +504,9 @@ class ConfigManager:
         Returns:
             bool: 是否存在
         """
+        if self.store is not None:
+            return self.store.get_forum(forum_name) is not None
+
         section_name = f"Forum_{forum_name}"
         return section_name in self.config
 
@@ -335,6 +521,9 @@ class ConfigManager:
         Returns:
             设置值，如果不存在则返回默认值
         """
+        if self.store is not None:
+            return self.store.get_setting(key, default_value)
+
         section_name = "Settings"
         if section_name not in self.config:
             return default_value
@@ -352,6 +541,13 @@ class ConfigManager:
         Returns:
             bool: 是否设置成功
         """
+        if self.store is not None:
+            try:
+                self.store.set_setting(key, value)
+                return True
+            except Exception as e:
+                return False
+
         try:
             section_name = "Settings"
             if section_name not in self.config:
@@ -370,7 +566,7 @@ class ConfigManager:
         Returns:
             bool: 是否显示列表序号
         """
-        return self.get_setting("show_list_numbers", "false").lower() == "true"
+        return self.settings.show_list_numbers
 
     def set_show_list_numbers(self, show):
         """
@@ -382,4 +578,42 @@ class ConfigManager:
         Returns:
             bool: 是否设置成功
         """
-        return self.set_setting("show_list_numbers", show)
\ No newline at end of file
+        self.settings.update(show_list_numbers=show)
+        return True
+
+    def get_account_state(self, forum_name, username, key, default_value=None):
+        """
+        获取按账户保存的状态（如阅读位置、关注的帖子，仅SQLite存储支持）
+
+        Args:
+            forum_name: 论坛名称
+            username: 用户名
+            key: 状态名
+            default_value: 默认值
+
+        Returns:
+            状态值，不存在或未使用SQLite存储时返回默认值
+        """
+        if self.store is None:
+            return default_value
+        return self.store.get_account_state(forum_name, username, key, default_value)
+
+    def set_account_state(self, forum_name, username, key, value):
+        """
+        保存按账户的状态（仅SQLite存储支持）
+
+        Args:
+            forum_name: 论坛名称
+            username: 用户名
+            key: 状态名
+            value: 状态值，需可序列化为JSON
+
+        Returns:
+            bool: 是否保存成功
+        """
+        if self.store is None:
+            return False
+        try:
+            return self.store.set_account_state(forum_name, username, key, value)
+        except Exception as e:
+            return False
@@ -1,6 +1,7 @@
 import os
 import sys
 from pathlib import Path
+from src.utils.dependency_manifest import check_dependencies as check_manifest_dependencies
 
 class EnvironmentSetup:
     """运行时环境配置"""
@@ -52,25 +53,8 @@ class EnvironmentSetup:
         if not status['dependencies_folder']:
             return status
 
-        # 检查各组件
-        components = {
-            'python_runtime': ['python', ['python311.dll', 'python311.zip']],
-            'python_libs': ['libraries', ['wx', 'requests', 'vlc', 'src']],
-            'vlc': ['vlc', ['vlc.exe', 'libvlc.dll', 'libvlccore.dll']],
-            'config': ['config', []]
-        }
-
-        for comp_name, (subdir, required_files) in components.items():
-            comp_dir = os.path.join(dep_dir, subdir)
-            if os.path.exists(comp_dir):
-                if required_files:
-                    status[comp_name] = all(
-                        os.path.exists(os.path.join(comp_dir, f)) for f in required_files
-                    )
-                else:
-                    status[comp_name] = True
-            else:
-                status[comp_name] = False
+        # 目录指纹与清单一致时直接使用清单结果，指纹变化时才重新扫描各组件
+        status.update(check_manifest_dependencies(dep_dir))
 
         return status
 
@@ -4,9 +4,10 @@
 负责与论坛API交互，获取论坛数据
 """
 
-import requests
 import sys
 import os
+import time
+from urllib.parse import urlsplit
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.api_config import API_ENDPOINTS, ORDERBY_OPTIONS
 from src.utils.html_parser import HTMLParser
@@ -14,16 +15,117 @@ from src.utils.html_parser import HTMLParser
 class ForumClient:
     """论坛客户端"""
 
-    def __init__(self, auth_manager):
+    def __init__(self, auth_manager, perf_monitor=None):
         """
         初始化论坛客户端
 
         Args:
             auth_manager: 认证管理器实例
+            perf_monitor: 性能监测器实例（可选）
         """
         self.auth_manager = auth_manager
+        self.perf_monitor = perf_monitor
         self.html_parser = HTMLParser()
 
+    def _request(self, session, method, url, **kwargs):
+        """
+        统一的请求入口，所有论坛请求都经过这里
+
+        Args:
+            session: 会话对象
+            method: 请求方法（GET/POST）
+            url: 请求地址
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        response = self._send(session, method, url, **kwargs)
+
+        if not self.auth_manager.is_auth_failure(response):
+            return response
+
+        # 会话已失效（包括从文件恢复的会话），重新登录一次后重放原请求
+        entry = self.auth_manager.recover_session(session)
+        if entry:
+            new_session, user_info = entry
+            self._refresh_auth_param(kwargs, user_info)
+            response = self._send(new_session, method, url, **kwargs)
+
+        return response
+
+    def _refresh_auth_param(self, kwargs, user_info):
+        """重新登录后更新请求参数中的auth值"""
+        auth = (user_info or {}).get('auth')
+        for field in ('params', 'data'):
+            values = kwargs.get(field)
+            if isinstance(values, dict) and 'auth' in values and auth:
+                values['auth'] = auth
+
+    def _send(self, session, method, url, **kwargs):
+        """
+        发送请求并记录耗时、数据量和错误
+
+        Args:
+            session: 会话对象
+            method: 请求方法（GET/POST）
+            url: 请求地址
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        endpoint = urlsplit(url).path.lstrip('/') or url
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except Exception:
+            if self.perf_monitor:
+                self.perf_monitor.record_request(endpoint, time.perf_counter() - start, error=True)
+            raise
+
+        if self.perf_monitor:
+            self.perf_monitor.record_request(
+                endpoint,
+                time.perf_counter() - start,
+                size=len(response.content),
+                error=response.status_code != 200
+            )
+        return response
+
+    def _json(self, response):
+        """
+        解码JSON响应并记录解码耗时
+
+        Args:
+            response: 响应对象
+
+        Returns:
+            解码后的数据
+        """
+        if not self.perf_monitor:
+            return response.json()
+
+        with self.perf_monitor.stage('decode'):
+            return response.json()
+
+    def _parse(self, parse_func, html_content):
+        """
+        解析HTML页面并记录解析耗时
+
+        Args:
+            parse_func: 解析函数
+            html_content: HTML内容
+
+        Returns:
+            解析结果
+        """
+        if not self.perf_monitor:
+            return parse_func(html_content)
+
+        with self.perf_monitor.stage('parse'):
+            return parse_func(html_content)
+
     def get_forum_list(self, forum_name):
         """
         获取论坛板块列表
@@ -50,9 +152,9 @@ class ForumClient:
             forum_list_url = f"{forum_url.rstrip('/')}/{API_ENDPOINTS['forum_list']}"
             params = {"format": "json"}
 
-            response = session.get(forum_list_url, params=params)
+            response = self._request(session, 'GET', forum_list_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 论坛列表在 message 中，不是 data.forumlist
                     forum_list = result.get('message', [])
@@ -95,9 +197,9 @@ class ForumClient:
                 "page": page
             }
 
-            response = session.get(home_url, params=params)
+            response = self._request(session, 'GET', home_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 首页内容在 message.threadlist 中，不是 data.threadlist
                     message = result.get('message', {})
@@ -148,9 +250,9 @@ class ForumClient:
                 "page": page
             }
 
-            response = session.get(thread_url, params=params)
+            response = self._request(session, 'GET', thread_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     message = result.get('message', {})
                     return {
@@ -200,9 +302,9 @@ class ForumClient:
             # 添加所有API参数
             params.update(api_params)
 
-            response = session.get(thread_url, params=params)
+            response = self._request(session, 'GET', thread_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     message = result.get('message', {})
                     return {
@@ -263,9 +365,9 @@ class ForumClient:
                 if auth:
                     params['auth'] = auth
 
-            response = session.get(detail_url, params=params)
+            response = self._request(session, 'GET', detail_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 帖子详情数据在 message 中，不是 data 中
                     message = result.get('message', {})
@@ -317,9 +419,9 @@ class ForumClient:
                 "page": page
             }
 
-            response = session.get(user_threads_url, params=params)
+            response = self._request(session, 'GET', user_threads_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 用户帖子数据在 message 中，不是 data 中
                     message = result.get('message', {})
@@ -368,9 +470,9 @@ class ForumClient:
                 "page": page
             }
 
-            response = session.get(user_posts_url, params=params)
+            response = self._request(session, 'GET', user_posts_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 用户回复数据在 message 中，不是 data 中
                     message = result.get('message', {})
@@ -419,9 +521,9 @@ class ForumClient:
                 "page": page
             }
 
-            response = session.get(search_url, params=params)
+            response = self._request(session, 'GET', search_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     # 搜索内容在 message.threadlist 中，不是 data.threadlist（与其他API一致）
                     message = result.get('message', {})
@@ -477,9 +579,9 @@ class ForumClient:
             if pid:
                 data['pid'] = pid
 
-            response = session.post(post_url, data=data)
+            response = self._request(session, 'POST', post_url, data=data)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return {"success": True, "error": None}
                 else:
@@ -517,11 +619,11 @@ class ForumClient:
 
             # 获取消息列表页面
             message_url = f"{forum_url.rstrip('/')}/pm?type=to"
-            response = session.get(message_url)
+            response = self._request(session, 'GET', message_url)
 
             if response.status_code == 200:
                 # 解析HTML获取消息列表
-                return self.html_parser.parse_message_list(response.text)
+                return self._parse(self.html_parser.parse_message_list, response.text)
 
         except Exception as e:
             pass
@@ -554,11 +656,11 @@ class ForumClient:
 
             # 获取消息详情页面
             message_url = f"{forum_url.rstrip('/')}/pm/view?touid={touid}"
-            response = session.get(message_url)
+            response = self._request(session, 'GET', message_url)
 
             if response.status_code == 200:
                 # 解析HTML获取消息详情
-                return self.html_parser.parse_message_detail(response.text)
+                return self._parse(self.html_parser.parse_message_detail, response.text)
 
         except Exception as e:
             pass
@@ -599,7 +701,7 @@ class ForumClient:
                 "message": message
             }
 
-            response = session.post(message_url, data=data)
+            response = self._request(session, 'POST', message_url, data=data)
             return response.status_code == 200
 
         except Exception as e:
@@ -639,10 +741,10 @@ class ForumClient:
 
             # 发送请求
             profile_url = f"{forum_url.rstrip('/')}/user-index.htm"
-            response = session.get(profile_url, params=params, timeout=10)
+            response = self._request(session, 'GET', profile_url, params=params, timeout=10)
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return result.get('message', {})
                 else:
@@ -707,10 +809,10 @@ class ForumClient:
 
             # 发送编辑请求
             update_url = f"{forum_url.rstrip('/')}/post-update.htm"
-            response = session.post(update_url, data=params, timeout=10)
+            response = self._request(session, 'POST', update_url, data=params, timeout=10)
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return True
                 else:
@@ -760,9 +862,9 @@ class ForumClient:
                 if auth:
                     params['auth'] = auth
 
-            response = session.get(follow_url, params=params)
+            response = self._request(session, 'GET', follow_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return {"success": True, "error": None}
                 else:
@@ -813,9 +915,9 @@ class ForumClient:
                 if auth:
                     params['auth'] = auth
 
-            response = session.get(unfollow_url, params=params)
+            response = self._request(session, 'GET', unfollow_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return {"success": True, "error": None}
                 else:
@@ -859,9 +961,9 @@ class ForumClient:
                 "uid": uid
             }
 
-            response = session.get(following_url, params=params)
+            response = self._request(session, 'GET', following_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return result.get('message', [])
 
@@ -902,9 +1004,9 @@ class ForumClient:
                 "uid": uid
             }
 
-            response = session.get(followers_url, params=params)
+            response = self._request(session, 'GET', followers_url, params=params)
             if response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 if result.get('status') == 1:
                     return result.get('message', [])
 
@@ -7,17 +7,27 @@
 import wx
 import wx.dataview
 import wx.lib.newevent
+import os
 import re
-import webbrowser
 from auth_manager import AuthenticationManager
 from forum_client import ForumClient
-from account_manager import AccountManager
-from message_manager import MessageManager, MessageDialog, MessageListDialog
-from audio_player import AudioPlayer
+from message_manager import MessageManager
+from src.utils.activity import ActivityMonitor, ACTIVE, INACTIVE, MINIMIZED
+from src.utils.perf_monitor import PerfMonitor
+from src.utils.content_resources import TYPE_LABELS, build_audio_tag, parse_content
+from src.utils.records import Thread, Post, PaginationRow, MessageRow, ConversationRow
+from src.utils.stall_watchdog import StallWatchdog
+from src.utils.startup_profiler import startup_profiler
 
 # 创建自定义事件
 AccountSelectedEvent, EVT_ACCOUNT_SELECTED = wx.lib.newevent.NewEvent()
 
+# 程序不在前台时卡顿监视的心跳间隔（秒），最小化时停止监视
+IDLE_WATCHDOG_INTERVAL = 0.5
+
+# 列表项末尾的序号后缀，如 " ，1之24项"
+LIST_NUMBER_SUFFIX = re.compile(r' ，\d+之\d+项$')
+
 class CodeGeneratorDialog(wx.Dialog):
     """代码生成对话框"""
 
@@ -129,7 +139,7 @@ class CodeGeneratorDialog(wx.Dialog):
         elif selected_type == "图片":
             self.generated_code = f'<a href="{field_2_value}"><img alt="{field_1_value}" src="{field_2_value}" /></a>'
         elif selected_type == "音频":
-            self.generated_code = f'<audio controls="controls" src="{field_2_value}" title="{field_1_value}"> </audio>'
+            self.generated_code = build_audio_tag(field_2_value, field_1_value)
 
         self.EndModal(wx.ID_OK)
 
@@ -145,8 +155,11 @@ class MainFrame(wx.Frame):
         """
         # 初始化组件
         self.config_manager = config_manager
-        self.auth_manager = AuthenticationManager()
-        self.forum_client = ForumClient(self.auth_manager)
+        self.settings = config_manager.settings
+        self.perf_monitor = PerfMonitor()
+        session_file = os.path.join(os.path.dirname(self.config_manager.config_file), 'sessions.dat')
+        self.auth_manager = AuthenticationManager(session_file, self.config_manager.crypto)
+        self.forum_client = ForumClient(self.auth_manager, self.perf_monitor)
         self.message_manager = MessageManager(self.forum_client, self.auth_manager)
         self.current_forum = None
 
@@ -155,7 +168,11 @@ class MainFrame(wx.Frame):
         self.saved_page_info = None  # 保存页面信息：{page: int, content_type: str, params: dict}
 
         # 获取账户列表
-        self.accounts = self.config_manager.get_forum_list()
+        with startup_profiler.phase("读取账户列表"):
+            self.accounts = self.config_manager.get_forum_list()
+
+        # 在后台复用上次保存的会话并并发登录其余账户，不阻塞账户选择界面的显示
+        self.auth_manager.warm_up(self.accounts)
 
         # 创建主窗口
         super().__init__(None, title="论坛助手", size=(1024, 768))
@@ -165,15 +182,34 @@ class MainFrame(wx.Frame):
 
         # 绑定事件
         self.Bind(EVT_ACCOUNT_SELECTED, self.on_account_selected)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.settings.subscribe(self.on_settings_changed)
+
+        # 窗口最小化或程序切到后台时放慢或暂停后台工作，回到前台时恢复
+        self.activity = ActivityMonitor()
+        self.app_active = True
+        self.window_minimized = False
+        self.audio_status_deferred = False
+        self.activity.subscribe(self.on_activity_changed)
+        self.Bind(wx.EVT_ICONIZE, self.on_iconize)
+        app = wx.GetApp()
+        if app:
+            app.Bind(wx.EVT_ACTIVATE_APP, self.on_activate_app)
+
+        # 启动界面卡顿监视
+        self.start_stall_watchdog()
 
         # 初始化音频播放器（在菜单创建之前）
-        self.init_audio_player()
+        with startup_profiler.phase("初始化音频播放器"):
+            self.init_audio_player()
 
         # 创建UI
-        self.create_ui()
+        with startup_profiler.phase("创建界面"):
+            self.create_ui()
 
         # 创建菜单（现在音频菜单已经可用）
-        self.create_menu()
+        with startup_profiler.phase("创建菜单"):
+            self.create_menu()
 
         # 设置键盘快捷键
         self.setup_keyboard_shortcuts()
@@ -370,6 +406,7 @@ class MainFrame(wx.Frame):
             wx.AcceleratorEntry(wx.ACCEL_CTRL, ord('W'), 1006),  # Ctrl+W - 网页打开
             wx.AcceleratorEntry(wx.ACCEL_CTRL, ord('C'), 1007),  # Ctrl+C - 拷贝帖子标题
             wx.AcceleratorEntry(wx.ACCEL_CTRL, ord('D'), 1008),  # Ctrl+D - 拷贝帖子地址
+            wx.AcceleratorEntry(wx.ACCEL_CTRL | wx.ACCEL_SHIFT, ord('D'), 1009),  # Ctrl+Shift+D - 性能统计（隐藏）
         ]
 
         # 创建加速器表
@@ -385,6 +422,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_open_in_browser, id=1006)
         self.Bind(wx.EVT_MENU, self.on_copy_title, id=1007)
         self.Bind(wx.EVT_MENU, self.on_copy_url, id=1008)
+        self.Bind(wx.EVT_MENU, self.on_perf_stats, id=1009)
 
     def show_account_selection(self):
         """显示账户选择界面"""
@@ -435,7 +473,8 @@ class MainFrame(wx.Frame):
             list_ctrl.SetFocus()
 
         # 显示对话框
-        result = dialog.ShowModal()
+        with startup_profiler.phase("等待选择账户"):
+            result = dialog.ShowModal()
         if result == wx.ID_OK:
             selected = list_ctrl.GetFirstSelected()
             if selected != -1:
@@ -454,11 +493,14 @@ class MainFrame(wx.Frame):
 
     def select_account(self, account):
         """选择账户"""
-        # 登录到论坛
-        if self.auth_manager.login_to_forum(account):
+        # 切换到该账户的会话（会话池中没有时才登录）
+        with startup_profiler.phase("登录"):
+            activated = self.auth_manager.activate_account(account)
+        if activated:
             self.current_forum = account['name']
             self.update_window_title()
             self.load_forum_data()
+            startup_profiler.finish()
         else:
             wx.MessageBox("登录失败，请检查账户信息", "错误", wx.OK | wx.ICON_ERROR)
 
@@ -489,7 +531,8 @@ class MainFrame(wx.Frame):
         self.messages_item = self.tree_ctrl.AppendItem(root, "我的消息")
 
         # 添加论坛板块
-        forum_list = self.forum_client.get_forum_list(self.current_forum)
+        with startup_profiler.phase("获取论坛板块列表"):
+            forum_list = self.forum_client.get_forum_list(self.current_forum)
         for forum in forum_list:
             forum_name = forum.get('name', '')
             forum_id = forum.get('fid', '')
@@ -611,7 +654,8 @@ class MainFrame(wx.Frame):
             self.tree_ctrl.SelectItem(self.latest_threads_item)
             self.tree_ctrl.EnsureVisible(self.latest_threads_item)
             # 触发选择事件来加载内容
-            self.load_content("最新发表")
+            with startup_profiler.phase("首次加载内容"):
+                self.load_content("最新发表")
 
     def on_account_selected(self, event):
         """账户选择事件"""
@@ -963,22 +1007,26 @@ class MainFrame(wx.Frame):
     def reset_keyboard_cursor(self, target_index):
         """重置键盘游标位置到指定索引 - DataViewListCtrl版本"""
         try:
-            if 0 <= target_index < self.list_ctrl.GetItemCount():
-                # 取消所有选择
-                self.list_ctrl.UnselectAll()
+            with self.perf_monitor.stage('focus'):
+                self._reset_keyboard_cursor(target_index)
+        except Exception as e:
+            pass
 
-                # 选择目标项目
-                self.list_ctrl.SelectRow(target_index)
+    def _reset_keyboard_cursor(self, target_index):
+        """重置键盘游标位置的具体实现"""
+        if 0 <= target_index < self.list_ctrl.GetItemCount():
+            # 取消所有选择
+            self.list_ctrl.UnselectAll()
 
-                # DataViewListCtrl 的 EnsureVisible 需要 DataViewItem 对象
-                # 这里暂时跳过 EnsureVisible，因为 SelectRow 应该会自动滚动到可见位置
-                # self.list_ctrl.EnsureVisible(target_index)
+            # 选择目标项目
+            self.list_ctrl.SelectRow(target_index)
 
-                # 设置焦点到列表控件
-                self.list_ctrl.SetFocus()
+            # DataViewListCtrl 的 EnsureVisible 需要 DataViewItem 对象
+            # 这里暂时跳过 EnsureVisible，因为 SelectRow 应该会自动滚动到可见位置
+            # self.list_ctrl.EnsureVisible(target_index)
 
-        except Exception as e:
-            pass
+            # 设置焦点到列表控件
+            self.list_ctrl.SetFocus()
 
     def get_current_page_params(self):
         """获取当前页面的参数"""
@@ -1130,7 +1178,7 @@ class MainFrame(wx.Frame):
                         display_text = f"分页控制"
 
                     # 添加序号（如果启用）
-                    if hasattr(self, 'show_list_numbers') and self.show_list_numbers:
+                    if self.settings.show_list_numbers:
                         total_items = len(saved_list_data)
                         item_index = len(self.list_data)
                         display_text += f" ，{item_index+1}之{total_items}项"
@@ -1147,7 +1195,7 @@ class MainFrame(wx.Frame):
                     display_text = display_text.strip()
 
                     self.list_ctrl.AppendItem([display_text])
-                    self.list_data.append({'type': 'pagination', 'action': action})
+                    self.list_data.append(PaginationRow(action))
 
                 elif 'tid' in item_data:
                     # 处理帖子项 - 使用与display_threads相同的逻辑
@@ -1165,7 +1213,7 @@ class MainFrame(wx.Frame):
                         display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername}"
 
                         # 添加序号（如果启用）
-                        if hasattr(self, 'show_list_numbers') and self.show_list_numbers:
+                        if self.settings.show_list_numbers:
                             total_items = len(saved_list_data)
                             item_index = len(self.list_data)
                             display_text += f" ，{item_index+1}之{total_items}项"
@@ -1660,11 +1708,67 @@ class MainFrame(wx.Frame):
         dialog = SettingsDialog(self, self.config_manager)
         dialog.ShowModal()
 
-        # 设置改变后，重新加载当前列表以应用新的设置
-        self.reload_current_list()
+        # 设置的变化通过 on_settings_changed 应用，无需重新加载列表
+        dialog.Destroy()
+
+    def on_settings_changed(self, changed):
+        """
+        设置变化事件，只更新受影响的显示
 
+        Args:
+            changed: 变化的设置项 {设置名: 新值}
+        """
+        if 'show_list_numbers' in changed:
+            self.apply_list_numbers()
+        if 'stall_threshold_ms' in changed and self.stall_watchdog:
+            self.stall_watchdog.threshold = changed['stall_threshold_ms'] / 1000.0
+        if 'audio_cache_enabled' in changed or 'audio_cache_mb' in changed:
+            self.apply_audio_cache_settings()
+
+    def apply_list_numbers(self):
+        """按当前设置为列表各项添加或移除序号后缀（只修改显示文本，不重新获取数据）"""
+        if not hasattr(self, 'list_ctrl'):
+            return
+
+        show = self.settings.show_list_numbers
+        total_items = self.list_ctrl.GetItemCount()
+        for i in range(total_items):
+            text = LIST_NUMBER_SUFFIX.sub('', self.list_ctrl.GetTextValue(i, 0))
+            if show:
+                text += f" ，{i+1}之{total_items}项"
+            self.list_ctrl.SetTextValue(text, i, 0)
+
+            # 在数据中存储序号信息
+            if i < len(self.list_data):
+                if show:
+                    self.list_data[i]['list_number'] = f"{i+1}之{total_items}项"
+                else:
+                    self.list_data[i].pop('list_number', None)
+
+    def on_perf_stats(self, event):
+        """性能统计事件"""
+        from perf_dialog import PerfDialog
+        audio_player = getattr(self, 'audio_player', None)
+        stream_tuner = audio_player.stream_tuner if audio_player else None
+        dialog = PerfDialog(self, self.perf_monitor, self.stall_watchdog, stream_tuner)
+        dialog.ShowModal()
         dialog.Destroy()
 
+    def begin_navigation(self, label):
+        """
+        开始记录一次导航的性能数据
+
+        Args:
+            label: 导航名称
+        """
+        # 同一次操作内的嵌套调用（如加载内容时再加载消息列表）沿用外层的导航记录
+        if self.perf_monitor.has_fresh_navigation():
+            return
+
+        self.perf_monitor.begin_navigation(label)
+        # 焦点恢复通过CallAfter执行，这里二次延迟以确保在焦点恢复之后结束记录
+        wx.CallAfter(wx.CallAfter, self.perf_monitor.end_navigation)
+
     def on_refresh(self, event):
         """刷新当前内容"""
         # 保存当前状态以便刷新后恢复焦点
@@ -1770,6 +1874,7 @@ class MainFrame(wx.Frame):
                 return
 
             # 在默认浏览器中打开
+            import webbrowser
             webbrowser.open(url)
 
         except Exception:
@@ -1859,61 +1964,89 @@ class MainFrame(wx.Frame):
             # 静默处理异常
             pass
 
-    def reload_current_list(self):
-        """重新加载当前列表以应用设置变更"""
-        try:
-            # 根据当前内容类型重新加载列表
-            if hasattr(self, 'current_content_type'):
-                if self.current_content_type == 'thread_list':
-                    # 重新加载当前板块
-                    if hasattr(self, 'current_fid') and self.current_fid:
-                        self.load_forum_section_with_type(None, self.current_fid,
-                                                          self.current_api_params.get('typeid1'),
-                                                          self.current_api_params.get('typeid2'))
-                elif self.current_content_type == 'thread_detail':
-                    # 重新加载帖子详情
-                    if hasattr(self, 'current_thread_info') and self.current_thread_info:
-                        tid = self.current_thread_info.get('tid')
-                        if tid:
-                            self.load_thread_detail(tid)
-                elif self.current_content_type == 'home_content':
-                    # 重新加载首页内容
-                    if hasattr(self, 'current_orderby'):
-                        if self.current_orderby == 'latest':
-                            self.load_latest_threads_and_restore_focus()
-                        elif self.current_orderby == 'lastpost':
-                            self.load_latest_replies_and_restore_focus()
-                elif self.current_content_type == 'user_threads':
-                    # 重新加载我的发表
-                    self.load_my_threads_and_restore_focus()
-                elif self.current_content_type == 'user_posts':
-                    # 重新加载我的回复
-                    self.load_my_posts_and_restore_focus()
-                elif self.current_content_type == 'message_list':
-                    # 重新加载消息列表
-                    self.load_messages()
-                elif self.current_content_type == 'message_detail':
-                    # 重新加载消息详情
-                    if hasattr(self, 'current_touid') and self.current_touid:
-                        self.load_message_detail(self.current_touid)
-                elif self.current_content_type == 'search_result':
-                    # 重新加载搜索结果
-                    if hasattr(self, 'current_keyword') and self.current_keyword:
-                        self.search_content_and_restore_focus(self.current_keyword)
-        except Exception as e:
-            # 重新加载失败时不显示错误，保持用户体验
-            pass
-
     def on_exit(self, event):
         """退出事件"""
         self.Close()
 
+    def on_close(self, event):
+        """窗口关闭事件"""
+        if self.stall_watchdog:
+            self.stall_watchdog.stop()
+
+        # 放行因程序空闲而等待的后台任务
+        self.activity.close()
+
+        # 保存会话，下次启动时跳过登录请求
+        self.auth_manager.save_sessions()
+
+        # 写入尚未保存的配置修改和音频缓存索引
+        self.config_manager.flush()
+        audio_cache = getattr(getattr(self, 'audio_player', None), 'audio_cache', None)
+        if audio_cache is not None:
+            audio_cache.flush()
+        event.Skip()
+
+    def start_stall_watchdog(self):
+        """启动界面卡顿监视，卡顿阈值可通过 stall_threshold_ms 设置项调整"""
+        threshold_ms = self.settings.stall_threshold_ms
+        log_file = os.path.join(os.path.dirname(self.config_manager.config_file), 'stalls.log')
+        self.stall_watchdog = StallWatchdog(wx.CallAfter, threshold=threshold_ms / 1000.0, log_file=log_file)
+        self.stall_watchdog_interval = self.stall_watchdog.interval
+        self.stall_watchdog.start()
+
+    def on_activate_app(self, event):
+        """程序切到前台或后台（打开本程序的对话框不算切到后台）"""
+        self.app_active = event.GetActive()
+        self.update_activity_state()
+        event.Skip()
+
+    def on_iconize(self, event):
+        """窗口最小化或还原"""
+        self.window_minimized = event.IsIconized()
+        self.update_activity_state()
+        event.Skip()
+
+    def update_activity_state(self):
+        """根据窗口状态更新程序活动状态"""
+        if self.window_minimized:
+            self.activity.set_state(MINIMIZED)
+        elif self.app_active:
+            self.activity.set_state(ACTIVE)
+        else:
+            self.activity.set_state(INACTIVE)
+
+    def on_activity_changed(self, old_state, state):
+        """
+        程序活动状态变化（在界面线程中执行）
+
+        后台的探测和缓存下载在程序空闲时自行暂停，播放列表构建放慢；这里处理界面线程相关的工作：
+        不在前台时放慢卡顿监视，最小化时停止卡顿监视并暂停状态栏的播放进度刷新
+
+        Args:
+            old_state: 原活动状态
+            state: 新活动状态
+        """
+        if self.stall_watchdog:
+            if state == MINIMIZED:
+                self.stall_watchdog.stop()
+            else:
+                self.stall_watchdog.interval = (self.stall_watchdog_interval if state == ACTIVE
+                                                else IDLE_WATCHDOG_INTERVAL)
+                self.stall_watchdog.start()
+
+        # 恢复显示时补上最小化期间推迟的状态栏更新
+        if old_state == MINIMIZED and self.audio_status_deferred:
+            self.audio_status_deferred = False
+            self.schedule_audio_status_update()
+
     def on_about(self, event):
         """关于事件"""
         wx.MessageBox("论坛助手 v1.0\n\n专为视障用户设计的无障碍论坛客户端", "关于", wx.OK | wx.ICON_INFORMATION)
 
     def load_content(self, text, fid=None):
         """加载内容"""
+        self.begin_navigation(text)
+
         # 清理消息界面（如果存在）
         self.hide_message_interface()
 
@@ -1934,6 +2067,8 @@ class MainFrame(wx.Frame):
 
     def load_content_with_type(self, text, type_data):
         """加载带有分类类型的内容"""
+        self.begin_navigation(text)
+
         # 清理消息界面（如果存在）
         self.hide_message_interface()
 
@@ -2052,6 +2187,7 @@ class MainFrame(wx.Frame):
 
     def load_messages(self):
         """加载消息 - 直接在列表中显示"""
+        self.begin_navigation("我的消息")
         try:
             # 设置内容类型为消息列表
             self.current_content_type = 'message_list'
@@ -2154,6 +2290,7 @@ class MainFrame(wx.Frame):
 
     def search_content(self, keyword):
         """搜索内容"""
+        self.begin_navigation("搜索")
         self.current_keyword = keyword
         result = self.forum_client.search(self.current_forum, keyword)
         threads = result.get('threadlist', [])
@@ -2182,6 +2319,11 @@ class MainFrame(wx.Frame):
 
     def display_threads(self, threads, pagination=None, content_type='thread_list', api_params=None):
         """显示帖子列表 - DataViewListCtrl版本"""
+        with self.perf_monitor.stage('render', exclude=('parse',)):
+            self._display_threads(threads, pagination, content_type, api_params)
+
+    def _display_threads(self, threads, pagination=None, content_type='thread_list', api_params=None):
+        """显示帖子列表的具体实现"""
         self.list_ctrl.DeleteAllItems()
         # 清空数据存储
         self.list_data = []
@@ -2189,24 +2331,24 @@ class MainFrame(wx.Frame):
         # 保存当前内容类型和分页信息
         self.current_content_type = content_type
         self.current_pagination = pagination or {}
-        self.current_threads = threads
+
+        # 由接口数据创建一次主题记录，列表数据和返回状态共享同一组记录
+        records = [Thread.from_api(thread, self.clean_html_tags) for thread in threads]
+        self.current_threads = records
 
         # 保存API参数用于分页操作
         self.current_api_params = api_params or {}
 
-        # 检查是否需要显示列表序号
-        show_list_numbers = self.config_manager.get_show_list_numbers()
-
-        for thread in threads:
+        for thread in records:
             # 构建新的显示格式
-            subject = self.clean_html_tags(thread.get('subject', ''))
-            username = thread.get('username', '')
-            views = thread.get('views', 0)
-            forumname = thread.get('forumname', '')
-            dateline_fmt = thread.get('dateline_fmt', '')
-            posts = thread.get('posts', 0)
-            lastpost_fmt = thread.get('lastpost_fmt', '')
-            lastusername = thread.get('lastusername', '')
+            subject = thread.subject
+            username = thread.username
+            views = thread.views
+            forumname = thread.forumname
+            dateline_fmt = thread.dateline_fmt
+            posts = thread.posts
+            lastpost_fmt = thread.lastpost_fmt
+            lastusername = thread.lastusername
 
             # 按照要求的格式拼接：标题 作者:用户名;浏览:数量;板块:板块名;发表时间:时间;回复:数量;回复时间:时间;最后回复:用户名
             display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername}"
@@ -2228,24 +2370,9 @@ class MainFrame(wx.Frame):
             display_text = display_text.strip()
 
             # 使用 DataViewListCtrl 的 AppendItem 方法，只显示内容列
-            # 将帖子ID等信息存储在 list_data 数组中
+            # 将主题记录存储在 list_data 数组中（恢复列表时使用）
             self.list_ctrl.AppendItem([display_text])
-
-            # 构建存储的数据 - 保存完整的帖子数据以便恢复时使用
-            thread_data = {
-                'tid': thread.get('tid', 0),
-                'type': 'thread',
-                'subject': subject,
-                'username': username,
-                'views': views,
-                'forumname': forumname,
-                'dateline_fmt': dateline_fmt,
-                'posts': posts,
-                'lastpost_fmt': lastpost_fmt,
-                'lastusername': lastusername
-            }
-
-            self.list_data.append(thread_data)
+            self.list_data.append(thread)
 
         # 根据设计文档添加4个分页控制项
         # 如果没有分页信息，创建默认分页信息
@@ -2255,120 +2382,9 @@ class MainFrame(wx.Frame):
         # 总是添加分页控制，即使只有一页
         self.add_pagination_controls(pagination)
 
-        # 如果需要显示序号，使用重新构建列表的方式
-        if show_list_numbers:
-            total_items = len(self.list_data)  # 使用list_data的长度，因为已经包含了所有项
-            # 清空列表
-            self.list_ctrl.DeleteAllItems()
-            # 重新构建所有项目，这次包含序号
-            for i in range(total_items):
-                # 获取存储的数据
-                data = self.list_data[i]
-                if data['type'] == 'thread':
-                    # 帖子项目 - 构建包含序号的显示文本
-                    try:
-                        thread = self.current_threads[i] if i < len(self.current_threads) else {}
-                        subject = thread.get('subject', '')
-                        username = thread.get('username', '')
-                        views = thread.get('views', 0)
-                        forumname = thread.get('forumname', '')
-                        dateline_fmt = thread.get('dateline_fmt', '')
-                        posts = thread.get('posts', 0)
-                        lastpost_fmt = thread.get('lastpost_fmt', '')
-                        lastusername = thread.get('lastusername', '')
-
-                        display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"帖子数据加载失败 ，{i+1}之{total_items}项"
-
-                    # 清理多余信息
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                elif data['type'] == 'post':
-                    # 回复项目 - 构建包含序号的显示文本
-                    try:
-                        post_data = data.get('post_data', {})
-                        floor = data.get('floor', i + 1)
-                        username = post_data.get('username', '')
-                        content = self.clean_html_tags(post_data.get('message', ''))
-                        create_date = post_data.get('dateline_fmt', '')
-
-                        if floor == 1:
-                            formatted_content = f"楼主 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        else:
-                            formatted_content = f"{floor}楼 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        display_text = formatted_content
-                    except:
-                        display_text = f"回复数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'message':
-                    # 消息项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        username = message_data.get('username', '')
-                        display_text = f"{username} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"消息数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'conversation':
-                    # 消息对话项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        content = message_data.get('content', '')
-                        formatted_content = content
-
-                        if len(formatted_content) > 200:
-                            formatted_content = formatted_content[:200] + '...'
-                        display_text = f"{formatted_content} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"对话数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'pagination':
-                    # 分页控制项目 - 构建包含序号的显示文本
-                    action = data.get('action', '')
-                    page = data.get('page', 1)
-
-                    if action == 'prev':
-                        display_text = f"上一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'next':
-                        display_text = f"下一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'jump':
-                        current_page = self.current_pagination.get('page', 1)
-                        total_page = self.current_pagination.get('totalpage', 1)
-                        display_text = f"当前第{current_page}页共{total_page}页，回车输入页码跳转 ，{i+1}之{total_items}项"
-                    elif action == 'reply':
-                        display_text = f"回复帖子 ，{i+1}之{total_items}项"
-                    else:
-                        display_text = f"分页控制 ，{i+1}之{total_items}项"
-
-                    # 清理分页文本
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                else:
-                    # 其他类型的项目
-                    display_text = f"项目 ，{i+1}之{total_items}项"
-
-                # 重新添加到列表
-                self.list_ctrl.AppendItem([display_text])
-
-                # 在数据中存储序号信息
-                data['list_number'] = f"{i+1}之{total_items}项"
+        # 如果需要显示序号，在各项文本后追加序号
+        if self.settings.show_list_numbers:
+            self.apply_list_numbers()
 
     
     def add_pagination_controls(self, pagination):
@@ -2397,7 +2413,7 @@ class MainFrame(wx.Frame):
             cleaned_text = re.sub(r';+\s*$', '', cleaned_text)
             cleaned_text = cleaned_text.strip()
             self.list_ctrl.AppendItem([cleaned_text])
-            self.list_data.append({'type': 'pagination', 'action': 'prev', 'page': current_page - 1})
+            self.list_data.append(PaginationRow('prev', page=current_page - 1))
 
         # 2. 下一页控制项
         if current_page < total_page:
@@ -2416,7 +2432,7 @@ class MainFrame(wx.Frame):
             cleaned_text = re.sub(r';+\s*$', '', cleaned_text)
             cleaned_text = cleaned_text.strip()
             self.list_ctrl.AppendItem([cleaned_text])
-            self.list_data.append({'type': 'pagination', 'action': 'next', 'page': current_page + 1})
+            self.list_data.append(PaginationRow('next', page=current_page + 1))
 
         # 3. 当前页码跳转控制项
         if is_filter_mode:
@@ -2434,7 +2450,7 @@ class MainFrame(wx.Frame):
         cleaned_text = re.sub(r';+\s*$', '', cleaned_text)
         cleaned_text = cleaned_text.strip()
         self.list_ctrl.AppendItem([cleaned_text])
-        self.list_data.append({'type': 'pagination', 'action': 'jump', 'current_page': current_page, 'total_page': total_page})
+        self.list_data.append(PaginationRow('jump', current_page=current_page, total_page=total_page))
 
         # 4. 回复帖子控制项（仅在帖子详情时显示）
         if self.current_content_type == 'thread_detail':
@@ -2450,7 +2466,7 @@ class MainFrame(wx.Frame):
             cleaned_text = re.sub(r';+\s*$', '', cleaned_text)
             cleaned_text = cleaned_text.strip()
             self.list_ctrl.AppendItem([cleaned_text])
-            self.list_data.append({'type': 'pagination', 'action': 'reply'})
+            self.list_data.append(PaginationRow('reply'))
 
     def load_thread_detail(self, tid):
         """加载帖子详情"""
@@ -2477,6 +2493,7 @@ class MainFrame(wx.Frame):
 
     def load_thread_detail_and_restore_page(self, tid, target_page=1, save_state=True):
         """加载帖子详情并恢复到指定页面"""
+        self.begin_navigation("帖子详情")
         try:
             # 保存当前状态，用于退格键返回（仅在首次进入时保存）
             if save_state and hasattr(self, 'current_content_type'):
@@ -2508,7 +2525,7 @@ class MainFrame(wx.Frame):
                 if hasattr(self, 'list_ctrl') and hasattr(self, 'list_data'):
                     # 保存当前列表的所有数据
                     self.saved_list_state = {
-                        'list_data': self.list_data.copy(),  # 深拷贝列表数据
+                        'list_data': tuple(self.list_data),  # 记录按引用共享，只保存行的顺序
                         'current_pagination': getattr(self, 'current_pagination', {}).copy(),
                         'current_content_type': getattr(self, 'current_content_type', ''),
                         'current_forum': getattr(self, 'current_forum', ''),
@@ -2536,6 +2553,7 @@ class MainFrame(wx.Frame):
 
     def load_next_page(self):
         """加载下一页"""
+        self.begin_navigation("下一页")
         try:
             if not hasattr(self, 'current_content_type') or not hasattr(self, 'current_pagination'):
                 return
@@ -2652,6 +2670,11 @@ class MainFrame(wx.Frame):
         Returns:
             str: 清理后的纯文本内容
         """
+        with self.perf_monitor.stage('parse'):
+            return self._clean_html_tags(html_content)
+
+    def _clean_html_tags(self, html_content):
+        """清理HTML标签的具体实现"""
         if not html_content:
             return ''
 
@@ -2710,6 +2733,20 @@ class MainFrame(wx.Frame):
 
     def display_posts(self, posts, pagination=None, thread_info=None):
         """显示回复列表 - DataViewListCtrl版本"""
+        with self.perf_monitor.stage('render', exclude=('parse',)):
+            self._display_posts(posts, pagination, thread_info)
+
+        # 检测并询问是否播放音频（对话框等待时间不计入渲染耗时）
+        if thread_info:
+            self.offer_audio_in_posts(posts)
+
+        # 设置焦点到索引0（楼主），确保屏幕阅读器能朗读
+        if self.list_ctrl.GetItemCount() > 0:
+            # 使用游标重置方式设置楼主焦点
+            wx.CallAfter(self.reset_keyboard_cursor, 0)
+
+    def _display_posts(self, posts, pagination=None, thread_info=None):
+        """显示回复列表的具体实现"""
         self.list_ctrl.DeleteAllItems()
         # 清空数据存储
         self.list_data = []
@@ -2719,22 +2756,22 @@ class MainFrame(wx.Frame):
             self.current_content_type = 'thread_detail'
             self.current_thread_info = thread_info
 
-        self.current_posts = posts
         self.current_pagination = pagination or {}
 
-        # 检查是否需要显示列表序号
-        show_list_numbers = self.config_manager.get_show_list_numbers()
+        # 获取楼层信息 - 需要考虑当前页码来计算正确的楼层
+        current_page = pagination.get('page', 1) if pagination else 1
+        posts_per_page = 20  # 假设每页显示20条
+        floor_offset = (current_page - 1) * posts_per_page
 
-        for i, post in enumerate(posts):
-            # 获取楼层信息 - 需要考虑当前页码来计算正确的楼层
-            current_page = pagination.get('page', 1) if pagination else 1
-            posts_per_page = 20  # 假设每页显示20条
-            floor_offset = (current_page - 1) * posts_per_page
-            floor = i + 1 + floor_offset  # 实际楼层
+        # 由接口数据创建一次回复记录，current_posts 和 list_data 共享同一组记录
+        records = [Post.from_api(post, index=i, floor=i + 1 + floor_offset) for i, post in enumerate(posts)]
+        self.current_posts = records
 
-            username = post.get('username', '')
-            content = self.clean_html_tags(post.get('message', ''))
-            create_date = post.get('dateline_fmt', '')
+        for post in records:
+            floor = post.floor  # 实际楼层
+            username = post.username
+            content = self.clean_html_tags(post.message)
+            create_date = post.dateline_fmt
 
             # 格式化显示
             if floor == 1:
@@ -2745,18 +2782,9 @@ class MainFrame(wx.Frame):
                 formatted_content = f"{floor}楼 {username} 说\n{content}\n发表时间：{create_date}"
 
             # 使用 DataViewListCtrl 的 AppendItem 方法，只显示内容列
-            # 将索引信息存储在 list_data 数组中
+            # 将回复记录存储在 list_data 数组中
             self.list_ctrl.AppendItem([formatted_content])
-
-            # 构建存储的数据
-            post_data = {
-                'type': 'post',
-                'index': i,  # 保持从0开始的索引
-                'floor': floor,
-                'post_data': post
-            }
-
-            self.list_data.append(post_data)
+            self.list_data.append(post)
 
         # 根据设计文档添加4个分页控制项
         # 如果没有分页信息，创建默认分页信息
@@ -2768,141 +2796,24 @@ class MainFrame(wx.Frame):
         # 总是添加分页控制，即使只有一页
         self.add_pagination_controls(pagination)
 
-        # 如果需要显示序号，使用重新构建列表的方式
-        if show_list_numbers:
-            total_items = len(self.list_data)  # 使用list_data的长度，因为已经包含了所有项
-            # 清空列表
-            self.list_ctrl.DeleteAllItems()
-            # 重新构建所有项目，这次包含序号
-            for i in range(total_items):
-                # 获取存储的数据
-                data = self.list_data[i]
-                if data['type'] == 'thread':
-                    # 帖子项目 - 构建包含序号的显示文本
-                    try:
-                        thread = self.current_threads[i] if i < len(self.current_threads) else {}
-                        subject = thread.get('subject', '')
-                        username = thread.get('username', '')
-                        views = thread.get('views', 0)
-                        forumname = thread.get('forumname', '')
-                        dateline_fmt = thread.get('dateline_fmt', '')
-                        posts = thread.get('posts', 0)
-                        lastpost_fmt = thread.get('lastpost_fmt', '')
-                        lastusername = thread.get('lastusername', '')
-
-                        display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"帖子数据加载失败 ，{i+1}之{total_items}项"
-
-                    # 清理多余信息
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                elif data['type'] == 'post':
-                    # 回复项目 - 构建包含序号的显示文本
-                    try:
-                        post_data = data.get('post_data', {})
-                        floor = data.get('floor', i + 1)
-                        username = post_data.get('username', '')
-                        content = self.clean_html_tags(post_data.get('message', ''))
-                        create_date = post_data.get('dateline_fmt', '')
-
-                        if floor == 1:
-                            formatted_content = f"楼主 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        else:
-                            formatted_content = f"{floor}楼 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        display_text = formatted_content
-                    except:
-                        display_text = f"回复数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'message':
-                    # 消息项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        username = message_data.get('username', '')
-                        display_text = f"{username} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"消息数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'conversation':
-                    # 消息对话项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        content = message_data.get('content', '')
-                        formatted_content = content
-
-                        if len(formatted_content) > 200:
-                            formatted_content = formatted_content[:200] + '...'
-                        display_text = f"{formatted_content} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"对话数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'pagination':
-                    # 分页控制项目 - 构建包含序号的显示文本
-                    action = data.get('action', '')
-                    page = data.get('page', 1)
-
-                    if action == 'prev':
-                        display_text = f"上一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'next':
-                        display_text = f"下一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'jump':
-                        current_page = self.current_pagination.get('page', 1)
-                        total_page = self.current_pagination.get('totalpage', 1)
-                        display_text = f"当前第{current_page}页共{total_page}页，回车输入页码跳转 ，{i+1}之{total_items}项"
-                    elif action == 'reply':
-                        display_text = f"回复帖子 ，{i+1}之{total_items}项"
-                    else:
-                        display_text = f"分页控制 ，{i+1}之{total_items}项"
+        # 如果需要显示序号，在各项文本后追加序号
+        if self.settings.show_list_numbers:
+            self.apply_list_numbers()
 
-                    # 清理分页文本
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                else:
-                    # 其他类型的项目
-                    display_text = f"项目 ，{i+1}之{total_items}项"
-
-                # 重新添加到列表
-                self.list_ctrl.AppendItem([display_text])
-
-                # 在数据中存储序号信息
-                data['list_number'] = f"{i+1}之{total_items}项"
-
-        # 检测并询问是否播放音频
-        if thread_info and hasattr(self, 'audio_menu_available') and self.audio_menu_available:
-            # 合并所有帖子的内容来检测音频
-            all_content = ""
-            for post in posts:
-                if 'message' in post:
-                    all_content += post['message'] + "\n"
-
-            if all_content.strip():
-                audio_count = self.detect_audio_in_content(all_content)
-                if audio_count > 0:
-                    self.ask_to_play_audio(audio_count)
+    def offer_audio_in_posts(self, posts):
+        """检测帖子中的音频并询问是否播放"""
+        if not (hasattr(self, 'audio_menu_available') and self.audio_menu_available):
+            return
 
-        # 设置焦点到索引0（楼主），确保屏幕阅读器能朗读
-        if self.list_ctrl.GetItemCount() > 0:
-            # 使用游标重置方式设置楼主焦点
-            wx.CallAfter(self.reset_keyboard_cursor, 0)
+        # 按楼层顺序检测当前页的音频
+        from playlist_builder import extract_audio_tracks
+        tracks = extract_audio_tracks(posts)
+        if tracks:
+            self.ask_to_play_audio(tracks)
 
     def load_previous_page(self):
         """加载上一页"""
+        self.begin_navigation("上一页")
         try:
             if not hasattr(self, 'current_content_type') or not hasattr(self, 'current_pagination'):
                 return
@@ -3100,6 +3011,7 @@ class MainFrame(wx.Frame):
 
     def jump_to_page(self, target_page):
         """跳转到指定页码"""
+        self.begin_navigation(f"跳转到第{target_page}页")
         try:
             # 检查是否在筛选模式下
             if hasattr(self, 'filter_mode') and self.filter_mode:
@@ -3373,6 +3285,11 @@ class MainFrame(wx.Frame):
 
     def display_messages(self, messages):
         """显示消息列表（只显示用户名，隐藏消息内容） - DataViewListCtrl版本"""
+        with self.perf_monitor.stage('render', exclude=('parse',)):
+            self._display_messages(messages)
+
+    def _display_messages(self, messages):
+        """显示消息列表的具体实现"""
         self.list_ctrl.DeleteAllItems()
         # 清空数据存储
         self.list_data = []
@@ -3380,9 +3297,6 @@ class MainFrame(wx.Frame):
         # 保存消息列表
         self.current_messages = messages
 
-        # 检查是否需要显示列表序号
-        show_list_numbers = self.config_manager.get_show_list_numbers()
-
         for i, message in enumerate(messages):
             username = message.get('username', '')
             touid = message.get('touid', '')
@@ -3399,133 +3313,15 @@ class MainFrame(wx.Frame):
             # 使用 DataViewListCtrl 的 AppendItem 方法，只显示内容列
             # 将用户ID信息存储在 list_data 数组中
             self.list_ctrl.AppendItem([display_text])
+            self.list_data.append(MessageRow(uid_value, message))
 
-            # 构建存储的数据
-            message_data = {
-                'type': 'message',
-                'touid': uid_value,
-                'message_data': message
-            }
-
-            self.list_data.append(message_data)
-
-        # 如果需要显示序号，使用重新构建列表的方式
-        if show_list_numbers:
-            total_items = len(self.list_data)  # 使用list_data的长度，因为已经包含了所有项
-            # 清空列表
-            self.list_ctrl.DeleteAllItems()
-            # 重新构建所有项目，这次包含序号
-            for i in range(total_items):
-                # 获取存储的数据
-                data = self.list_data[i]
-                if data['type'] == 'thread':
-                    # 帖子项目 - 构建包含序号的显示文本
-                    try:
-                        thread = self.current_threads[i] if i < len(self.current_threads) else {}
-                        subject = thread.get('subject', '')
-                        username = thread.get('username', '')
-                        views = thread.get('views', 0)
-                        forumname = thread.get('forumname', '')
-                        dateline_fmt = thread.get('dateline_fmt', '')
-                        posts = thread.get('posts', 0)
-                        lastpost_fmt = thread.get('lastpost_fmt', '')
-                        lastusername = thread.get('lastusername', '')
-
-                        display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"帖子数据加载失败 ，{i+1}之{total_items}项"
-
-                    # 清理多余信息
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                elif data['type'] == 'post':
-                    # 回复项目 - 构建包含序号的显示文本
-                    try:
-                        post_data = data.get('post_data', {})
-                        floor = data.get('floor', i + 1)
-                        username = post_data.get('username', '')
-                        content = self.clean_html_tags(post_data.get('message', ''))
-                        create_date = post_data.get('dateline_fmt', '')
-
-                        if floor == 1:
-                            formatted_content = f"楼主 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        else:
-                            formatted_content = f"{floor}楼 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        display_text = formatted_content
-                    except:
-                        display_text = f"回复数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'message':
-                    # 消息项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        username = message_data.get('username', '')
-                        display_text = f"{username} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"消息数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'conversation':
-                    # 消息对话项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        content = message_data.get('content', '')
-                        formatted_content = content
-
-                        if len(formatted_content) > 200:
-                            formatted_content = formatted_content[:200] + '...'
-                        display_text = f"{formatted_content} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"对话数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'pagination':
-                    # 分页控制项目 - 构建包含序号的显示文本
-                    action = data.get('action', '')
-                    page = data.get('page', 1)
-
-                    if action == 'prev':
-                        display_text = f"上一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'next':
-                        display_text = f"下一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'jump':
-                        current_page = self.current_pagination.get('page', 1)
-                        total_page = self.current_pagination.get('totalpage', 1)
-                        display_text = f"当前第{current_page}页共{total_page}页，回车输入页码跳转 ，{i+1}之{total_items}项"
-                    elif action == 'reply':
-                        display_text = f"回复帖子 ，{i+1}之{total_items}项"
-                    else:
-                        display_text = f"分页控制 ，{i+1}之{total_items}项"
-
-                    # 清理分页文本
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                else:
-                    # 其他类型的项目
-                    display_text = f"项目 ，{i+1}之{total_items}项"
-
-                # 重新添加到列表
-                self.list_ctrl.AppendItem([display_text])
-
-                # 在数据中存储序号信息
-                data['list_number'] = f"{i+1}之{total_items}项"
+        # 如果需要显示序号，在各项文本后追加序号
+        if self.settings.show_list_numbers:
+            self.apply_list_numbers()
 
     def load_message_detail(self, touid):
         """加载消息详情"""
+        self.begin_navigation("消息详情")
         try:
             self.current_touid = touid
             self.current_content_type = 'message_detail'
@@ -3542,6 +3338,11 @@ class MainFrame(wx.Frame):
 
     def display_message_conversation(self, messages):
         """显示消息对话（按时间升序：最老消息在最上面，最新消息在最下面）- DataViewListCtrl版本"""
+        with self.perf_monitor.stage('render', exclude=('parse',)):
+            self._display_message_conversation(messages)
+
+    def _display_message_conversation(self, messages):
+        """显示消息对话的具体实现"""
         self.list_ctrl.DeleteAllItems()
         # 清空数据存储
         self.list_data = []
@@ -3553,9 +3354,6 @@ class MainFrame(wx.Frame):
         # HTML解析器返回的消息是降序排列的（最新的在前面），需要反转
         messages = messages[::-1]
 
-        # 检查是否需要显示列表序号
-        show_list_numbers = self.config_manager.get_show_list_numbers()
-
         for i, message in enumerate(messages):
             # 字段名映射：HTML解析器返回的是content、username、datetime
             content = message.get('content', '')
@@ -3570,129 +3368,11 @@ class MainFrame(wx.Frame):
             # 使用 DataViewListCtrl 的 AppendItem 方法，只显示内容列
             # 将消息信息存储在 list_data 数组中
             self.list_ctrl.AppendItem([formatted_content])
+            self.list_data.append(ConversationRow(message))
 
-            # 构建存储的数据
-            conversation_data = {
-                'type': 'conversation',
-                'message_data': message
-            }
-
-            self.list_data.append(conversation_data)
-
-        # 如果需要显示序号，使用重新构建列表的方式
-        if show_list_numbers:
-            total_items = len(self.list_data)  # 使用list_data的长度，因为已经包含了所有项
-            # 清空列表
-            self.list_ctrl.DeleteAllItems()
-            # 重新构建所有项目，这次包含序号
-            for i in range(total_items):
-                # 获取存储的数据
-                data = self.list_data[i]
-                if data['type'] == 'thread':
-                    # 帖子项目 - 构建包含序号的显示文本
-                    try:
-                        thread = self.current_threads[i] if i < len(self.current_threads) else {}
-                        subject = thread.get('subject', '')
-                        username = thread.get('username', '')
-                        views = thread.get('views', 0)
-                        forumname = thread.get('forumname', '')
-                        dateline_fmt = thread.get('dateline_fmt', '')
-                        posts = thread.get('posts', 0)
-                        lastpost_fmt = thread.get('lastpost_fmt', '')
-                        lastusername = thread.get('lastusername', '')
-
-                        display_text = f"{subject} 作者:{username};浏览:{views};板块:{forumname};发表时间:{dateline_fmt};回复:{posts};回复时间:{lastpost_fmt};最后回复:{lastusername} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"帖子数据加载失败 ，{i+1}之{total_items}项"
-
-                    # 清理多余信息
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                elif data['type'] == 'post':
-                    # 回复项目 - 构建包含序号的显示文本
-                    try:
-                        post_data = data.get('post_data', {})
-                        floor = data.get('floor', i + 1)
-                        username = post_data.get('username', '')
-                        content = self.clean_html_tags(post_data.get('message', ''))
-                        create_date = post_data.get('dateline_fmt', '')
-
-                        if floor == 1:
-                            formatted_content = f"楼主 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        else:
-                            formatted_content = f"{floor}楼 {username} 说\n{content}\n发表时间：{create_date} ，{i+1}之{total_items}项"
-                        display_text = formatted_content
-                    except:
-                        display_text = f"回复数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'message':
-                    # 消息项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        username = message_data.get('username', '')
-                        display_text = f"{username} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"消息数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'conversation':
-                    # 消息对话项目 - 构建包含序号的显示文本
-                    try:
-                        message_data = data.get('message_data', {})
-                        content = message_data.get('content', '')
-                        formatted_content = content
-
-                        if len(formatted_content) > 200:
-                            formatted_content = formatted_content[:200] + '...'
-                        display_text = f"{formatted_content} ，{i+1}之{total_items}项"
-                    except:
-                        display_text = f"对话数据加载失败 ，{i+1}之{total_items}项"
-
-                elif data['type'] == 'pagination':
-                    # 分页控制项目 - 构建包含序号的显示文本
-                    action = data.get('action', '')
-                    page = data.get('page', 1)
-
-                    if action == 'prev':
-                        display_text = f"上一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'next':
-                        display_text = f"下一页({page}) ，{i+1}之{total_items}项"
-                    elif action == 'jump':
-                        current_page = self.current_pagination.get('page', 1)
-                        total_page = self.current_pagination.get('totalpage', 1)
-                        display_text = f"当前第{current_page}页共{total_page}页，回车输入页码跳转 ，{i+1}之{total_items}项"
-                    elif action == 'reply':
-                        display_text = f"回复帖子 ，{i+1}之{total_items}项"
-                    else:
-                        display_text = f"分页控制 ，{i+1}之{total_items}项"
-
-                    # 清理分页文本
-                    import re
-                    display_text = re.sub(r';?\s*数据:\s*\d+\s*', '', display_text)
-                    display_text = re.sub(r';?\s*data:\s*\d+\s*', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';\s*数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r';\s*data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r'\s+数据:\s*\d+.*$', '', display_text)
-                    display_text = re.sub(r'\s+data:\s*\d+.*$', '', display_text, flags=re.IGNORECASE)
-                    display_text = re.sub(r';+\s*$', '', display_text)
-                    display_text = display_text.strip()
-
-                else:
-                    # 其他类型的项目
-                    display_text = f"项目 ，{i+1}之{total_items}项"
-
-                # 重新添加到列表
-                self.list_ctrl.AppendItem([display_text])
-
-                # 在数据中存储序号信息
-                data['list_number'] = f"{i+1}之{total_items}项"
+        # 如果需要显示序号，在各项文本后追加序号
+        if self.settings.show_list_numbers:
+            self.apply_list_numbers()
 
     def create_message_input_panel(self):
         """创建消息输入面板"""
@@ -3783,210 +3463,7 @@ class MainFrame(wx.Frame):
             return '', [], {}
 
         try:
-            # 资源列表和位置映射
-            resources = []
-            resource_map = {}
-
-            # 统一的资源名称生成函数
-            def generate_fallback_name(url, resource_type):
-                """为资源生成备用名称"""
-                try:
-                    if not url:
-                        return f'未命名{resource_type}'
-
-                    # 从URL中提取文件名
-                    if '/' in url:
-                        filename = url.split('/')[-1]
-                        if '?' in filename:  # 移除查询参数
-                            filename = filename.split('?')[0]
-                        if '#' in filename:  # 移除锚点
-                            filename = filename.split('#')[0]
-                        if filename:  # 如果有文件名
-                            # 移除文件扩展名
-                            if '.' in filename and resource_type != '链接':
-                                name_without_ext = filename.split('.')[0]
-                                return name_without_ext or f'未命名{resource_type}'
-                            return filename
-                        else:  # 如果URL以/结尾
-                            path_parts = url.strip('/').split('/')
-                            return path_parts[-1] if path_parts else f'未命名{resource_type}'
-                    else:
-                        return url or f'未命名{resource_type}'
-                except Exception:
-                    return f'未命名{resource_type}'
-
-            # 处理换行相关的HTML标签
-            # 将<br>、<br/>、<br />等替换为换行符
-            clean_text = re.sub(r'<br\s*/?>', '\n', html_content, flags=re.IGNORECASE)
-
-            # 只对结束标签替换为换行符，避免重复换行
-            clean_text = re.sub(r'</(p|div|h[1-6]|blockquote|li|tr|td|th)>', '\n', clean_text, flags=re.IGNORECASE)
-
-            # 移除开始标签（不添加换行符）
-            clean_text = re.sub(r'<(?!/)(p|div|h[1-6]|blockquote|li|tr|td|th)[^>]*>', '', clean_text, flags=re.IGNORECASE)
-
-            # 提取链接资源 <a href="url">text</a>
-            def extract_link(match):
-                try:
-                    groups = match.groups()
-                    url = groups[0] if groups[0] else ''
-                    text = groups[1].strip() if len(groups) > 1 and groups[1] else ''
-
-                    # 如果链接文字为空或只有空白字符，使用备用名称
-                    if not text:
-                        text = generate_fallback_name(url, '链接')
-
-                    resource_name = f"{text}【链接】"
-                    resource_info = {
-                        'name': text,
-                        'type': 'link',
-                        'url': url,
-                        'display_name': resource_name
-                    }
-                    resources.append(resource_info)
-                    return resource_name
-                except Exception:
-                    return match.group(0) if match else ""
-
-            # 提取音频资源 <audio controls src="url" title="title"></audio>
-            def extract_audio(match):
-                try:
-                    groups = match.groups()
-
-                    # 安全地获取src和title，处理不同的匹配模式
-                    if len(groups) >= 2:
-                        # 模式1和模式2：有两个捕获组 (src, title) 或 (title, src)
-                        src = groups[0] if groups[0] else groups[1]
-                        title = groups[1] if groups[1] else groups[0]
-                    else:
-                        # 模式3：只有一个捕获组 (src)
-                        src = groups[0] if groups[0] else ''
-                        title = None
-
-                    # 如果没有title或title为空，使用备用名称
-                    if not title:
-                        title = generate_fallback_name(src, '音频')
-
-                    resource_name = f"{title}【音频】"
-                    resource_info = {
-                        'name': title,
-                        'type': 'audio',
-                        'url': src,
-                        'display_name': resource_name
-                    }
-                    resources.append(resource_info)
-                    return resource_name
-                except Exception:
-                    return match.group(0) if match else ""
-
-            # 提取图片资源 <img alt="alt" src="src"> 或 <img src="src" alt="alt">
-            def extract_image(match):
-                try:
-                    groups = match.groups()
-
-                    # 安全地获取src和alt，处理不同的匹配模式
-                    if len(groups) >= 2:
-                        # 模式1和模式2：有两个捕获组 (alt, src) 或 (src, alt)
-                        src = groups[0] if groups[0] else groups[1]
-                        alt = groups[1] if groups[1] else groups[0]
-                    else:
-                        # 模式3：只有一个捕获组 (src)
-                        src = groups[0] if groups[0] else ''
-                        alt = None
-
-                    # 如果没有alt或alt为空，使用备用名称
-                    if not alt:
-                        alt = generate_fallback_name(src, '图片')
-
-                    resource_name = f"{alt}【图片】"
-                    resource_info = {
-                        'name': alt,
-                        'type': 'image',
-                        'url': src,
-                        'display_name': resource_name
-                    }
-                    resources.append(resource_info)
-                    return resource_name
-                except Exception:
-                    return match.group(0) if match else ""
-
-          # 提取链接
-            # 改进的链接正则表达式，确保文字组总是存在（即使是空的）
-            link_pattern = r'<a\s+[^>]*href\s*=\s*["\']([^"\']+)["\'][^>]*>([^<]*)</a>'
-            clean_text = re.sub(link_pattern, extract_link, clean_text, flags=re.IGNORECASE)
-
-            # 提取音频（处理三种常见格式）
-            # 第一种格式：src在前，title在后
-            pattern1 = r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>'
-            clean_text = re.sub(pattern1, extract_audio, clean_text, flags=re.IGNORECASE | re.DOTALL)
-
-            # 第二种格式：title在前，src在后
-            pattern2 = r'<audio\s+[^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>'
-            clean_text = re.sub(pattern2, extract_audio, clean_text, flags=re.IGNORECASE | re.DOTALL)
-
-            # 第三种格式：只有src
-            pattern3 = r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>'
-            clean_text = re.sub(pattern3, lambda m: extract_audio(m), clean_text, flags=re.IGNORECASE | re.DOTALL)
-
-            # 提取图片（处理三种常见格式）
-            # 第一种格式：alt在前，src在后
-            img_pattern1 = r'<img\s+[^>]*alt\s*=\s*["\']([^"\']*)["\'][^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>'
-            clean_text = re.sub(img_pattern1, extract_image, clean_text, flags=re.IGNORECASE)
-
-            # 第二种格式：src在前，alt在后
-            img_pattern2 = r'<img\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*alt\s*=\s*["\']([^"\']*)["\'][^>]*>'
-            clean_text = re.sub(img_pattern2, extract_image, clean_text, flags=re.IGNORECASE)
-
-            # 第三种格式：只有src
-            img_pattern3 = r'<img\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>'
-            clean_text = re.sub(img_pattern3, lambda m: extract_image(m), clean_text, flags=re.IGNORECASE)
-
-            # 移除剩余的HTML标签
-            clean_text = re.sub(r'<[^>]+>', '', clean_text)
-
-            # 处理HTML实体
-            html_entities = {
-                '&nbsp;': ' ',
-                '&lt;': '<',
-                '&gt;': '>',
-                '&amp;': '&',
-                '&quot;': '"',
-                '&apos;': "'",
-                '&copy;': '©',
-                '&reg;': '®',
-                '&hellip;': '…',
-                '&ndash;': '–',
-                '&mdash;': '—',
-                '&lsquo;': ''',
-                '&rsquo;': ''',
-                '&ldquo;': '"',
-                '&rdquo;': '"',
-                '&euro;': '€',
-                '&pound;': '£',
-                '&yen;': '¥'
-            }
-
-            for entity, char in html_entities.items():
-                clean_text = clean_text.replace(entity, char)
-
-            # 建立资源位置映射
-            current_pos = 0
-            for i, resource in enumerate(resources):
-                resource_name = resource['display_name']
-                pos = clean_text.find(resource_name, current_pos)
-                if pos != -1:
-                    resource_map[pos] = resource
-                    current_pos = pos + len(resource_name)
-
-            # 清理多余的空行和空格
-            # 将多个连续换行符合并为单个换行符
-            clean_text = re.sub(r'\n+', '\n', clean_text)
-
-            # 清理首尾空白
-            clean_text = clean_text.strip()
-
-            return clean_text, resources, resource_map
-
+            return parse_content(html_content)
         except Exception as e:
             # 如果整个解析过程失败，返回基础的HTML清理结果
             print(f"[DEBUG] HTML解析整体失败，使用基础清理: {e}")
@@ -4080,6 +3557,7 @@ class MainFrame(wx.Frame):
             url = resource['url']
             resource_type = resource['type']
 
+            import webbrowser
             if resource_type == 'link':
                 # 链接使用浏览器打开
                 webbrowser.open(url)
@@ -4172,7 +3650,7 @@ class MainFrame(wx.Frame):
                 # 添加资源数据
                 resource_data = []
                 for i, resource in enumerate(resources):
-                    type_text = {'link': '链接', 'audio': '音频', 'image': '图片'}.get(resource['type'], '其他')
+                    type_text = TYPE_LABELS.get(resource['type'], '其他')
                     index = resource_list_ctrl.InsertItem(i, str(i+1))
                     resource_list_ctrl.SetItem(index, 1, resource['name'])
                     resource_list_ctrl.SetItem(index, 2, type_text)
@@ -4542,6 +4020,7 @@ class MainFrame(wx.Frame):
 
     def show_account_manager(self):
         """显示账户管理界面"""
+        from account_manager import AccountManager
         account_manager = AccountManager(self.config_manager, self)
         account_manager.ShowModal()
         account_manager.Destroy()
@@ -4549,11 +4028,15 @@ class MainFrame(wx.Frame):
         # 刷新账户列表
         self.accounts = self.config_manager.get_forum_list()
 
+        # 同步会话池：移除已删除或修改了密码的账户的会话，预登录新增和修改的账户
+        self.auth_manager.prune_sessions(self.accounts)
+        self.auth_manager.prelogin_accounts(self.accounts)
+
         # 如果没有账户，退出程序
         if not self.accounts:
             self.Close()
-        elif self.current_forum is None:
-            # 如果还没有选择论坛，显示账户选择界面
+        elif self.current_forum is None or not self.auth_manager.is_logged_in(self.current_forum):
+            # 如果还没有选择论坛，或当前账户已被删除或修改，显示账户选择界面
             self.show_account_selection()
 
     def set_window_icon(self):
@@ -5176,16 +4659,22 @@ class MainFrame(wx.Frame):
         self.list_ctrl.DeleteAllItems()
         self.list_data.clear()
 
-        # 添加筛选后的帖子项，保持原始楼层号（无论是否有内容都要显示分页）
+        # 由接口数据创建回复记录，保持原始楼层号
+        records = []
         for post in filtered_posts:
+            floor_number = post.get('floor', 1)
+            records.append(Post.from_api(post, index=floor_number - 1, floor=floor_number))
+
+        # 添加筛选后的帖子项，保持原始楼层号（无论是否有内容都要显示分页）
+        for post in records:
             try:
                 # 格式化帖子内容
-                username = post.get('username', '')
-                message = post.get('message', '')
-                dateline = post.get('dateline_fmt', '')
+                username = post.username
+                message = post.message
+                dateline = post.dateline_fmt
 
                 # 使用正确的楼层号字段名
-                floor_number = post.get('floor', 1)
+                floor_number = post.floor
 
                 # 清理HTML标签
                 clean_message = self.clean_html_tags(message)
@@ -5198,12 +4687,7 @@ class MainFrame(wx.Frame):
 
                 # 添加到列表
                 index = self.list_ctrl.AppendItem([display_text])
-                self.list_data.append({
-                    'type': 'post',
-                    'data': post,
-                    'floor_index': floor_number - 1,  # 保持原始楼层索引
-                    'post_data': post  # 兼容现有代码结构
-                })
+                self.list_data.append(post)
 
             except Exception as e:
                 print(f"显示筛选帖子项时出错: {e}")
@@ -5218,7 +4702,7 @@ class MainFrame(wx.Frame):
 
         # 在筛选模式下，需要设置 current_posts 为筛选后的帖子列表
         # 这样 show_floor_editor 才能正确获取帖子内容
-        self.current_posts = filtered_posts
+        self.current_posts = records
 
     def exit_filter_mode(self):
         """退出筛选模式，返回原始帖子详情"""
@@ -5702,12 +5186,18 @@ class MainFrame(wx.Frame):
     def init_audio_player(self):
         """初始化音频播放器"""
         try:
+            from audio_player import AudioPlayer
             self.audio_player = AudioPlayer()
+            self.audio_player.activity = self.activity
 
-            if self.audio_player.is_available():
+            # 只根据依赖清单检查组件，VLC实例在第一次播放时才在后台创建
+            if self.audio_player.check_vlc_available():
                 print("[OK] Audio playback functionality available")
-                # 设置状态更新回调
-                self.audio_player.on_status_update = self.update_audio_status_bar
+                # 设置状态更新回调（由VLC事件线程调用，合并后在界面线程中更新状态栏）
+                self.audio_status_update_pending = False
+                self.audio_player.on_status_update = self.schedule_audio_status_update
+                self.audio_player.on_ready = lambda success: wx.CallAfter(self.on_audio_player_ready, success)
+                self.apply_audio_cache_settings()
                 self.setup_audio_menu()
                 self.setup_audio_status_bar()
                 self.setup_audio_hotkeys()
@@ -5722,6 +5212,45 @@ class MainFrame(wx.Frame):
             self.setup_unavailable_audio_menu()
             self.audio_menu_available = False
 
+    def apply_audio_cache_settings(self):
+        """按设置启用、停用本地音频缓存或调整缓存大小"""
+        if not getattr(self, 'audio_player', None):
+            return
+
+        if not self.settings.audio_cache_enabled:
+            if self.audio_player.audio_cache is not None:
+                self.audio_player.audio_cache.flush()
+            self.audio_player.audio_cache = None
+            return
+
+        max_bytes = max(1, self.settings.audio_cache_mb) * 1024 * 1024
+        if self.audio_player.audio_cache is not None:
+            self.audio_player.audio_cache.set_max_bytes(max_bytes)
+            return
+
+        try:
+            from src.utils.audio_cache import AudioCache
+            cache_dir = os.path.join(os.path.dirname(self.config_manager.config_file), 'audio_cache')
+            self.audio_player.audio_cache = AudioCache(cache_dir, max_bytes,
+                                                       stream_tuner=self.audio_player.stream_tuner,
+                                                       activity=self.activity)
+        except Exception as e:
+            print(f"[WARN] 音频缓存不可用: {e}")
+
+    def on_audio_player_ready(self, success):
+        """
+        VLC后台初始化完成（在界面线程中执行）
+
+        Args:
+            success: 是否初始化成功
+        """
+        if success:
+            self.audio_player.play_pending()
+            self.update_play_pause_menu_state()
+            self.update_audio_status_bar()
+        else:
+            self.show_status("音频播放器初始化失败，VLC组件可能已损坏")
+
     def setup_audio_status_bar(self):
         """设置音频播放状态栏"""
         # 创建5个字段的状态栏
@@ -5729,38 +5258,66 @@ class MainFrame(wx.Frame):
         # 设置状态栏宽度，所有字段都自适应宽度
         self.status_bar.SetStatusWidths([-1, -1, -1, -1, -1])
 
-        # 初始化状态栏内容
+        # 初始化状态栏内容（之后只在播放状态变化时更新，空闲时没有定时刷新）
         self.update_status_bar_idle()
 
-        # 启动状态更新定时器
-        self.start_status_update_timer()
+    def set_status_text(self, text, field):
+        """设置状态栏字段文本（文本未变化时不重绘）"""
+        if self.status_bar.GetStatusText(field) != text:
+            self.status_bar.SetStatusText(text, field)
 
     def update_status_bar_idle(self):
         """更新空闲状态栏"""
-        self.status_bar.SetStatusText("就绪", 0)
-        self.status_bar.SetStatusText("[无音频播放]", 1)
-        self.status_bar.SetStatusText("", 2)
-        self.status_bar.SetStatusText("", 3)
-        self.status_bar.SetStatusText("Alt+P打开播放菜单", 4)
+        self.set_status_text("就绪", 0)
+        self.set_status_text("[无音频播放]", 1)
+        self.set_status_text("", 2)
+        self.set_status_text("", 3)
+        self.update_help_text()
+
+    def schedule_audio_status_update(self):
+        """请求更新音频状态栏（可在任意线程调用，界面线程处理前的多次请求只更新一次）"""
+        if self.audio_status_update_pending:
+            return
+        if self.activity.state == MINIMIZED:
+            # 最小化时不刷新状态栏，还原窗口时再更新
+            self.audio_status_deferred = True
+            return
+        self.audio_status_update_pending = True
+        wx.CallAfter(self.on_audio_status_changed)
+
+    def on_audio_status_changed(self):
+        """播放状态变化（在界面线程中执行）"""
+        self.audio_status_update_pending = False
+        self.update_play_pause_menu_state()
+        self.update_audio_status_bar()
+
+        # 播放出错时提示一次
+        error = self.audio_player.last_error
+        if error:
+            self.audio_player.last_error = None
+            self.show_status(error)
 
     def update_audio_status_bar(self):
         """更新音频播放状态栏"""
+        if self.audio_player and self.audio_player.is_initializing():
+            self.set_status_text("正在加载播放器...", 0)
+            return
         if not self.audio_player or (not self.audio_player.is_playing and not self.audio_player.is_paused):
             self.update_status_bar_idle()
             return
 
         # 播放状态
         if self.audio_player.is_paused:
-            self.status_bar.SetStatusText("已暂停", 0)
+            self.set_status_text("已暂停", 0)
         else:
-            self.status_bar.SetStatusText("播放中", 0)
+            self.set_status_text("播放中", 0)
 
         # 曲目信息
         current = self.audio_player.current_index + 1
         total = len(self.audio_player.playlist)
         track_info = self.audio_player.get_current_track_info()
         track_name = track_info.get('title', f"音频{current}")
-        self.status_bar.SetStatusText(f"正在播放第{current}个，共{total}个 - {track_name}", 1)
+        self.set_status_text(f"正在播放第{current}个，共{total}个 - {track_name}", 1)
 
         # 进度信息
         current_time = self.audio_player.current_time
@@ -5769,11 +5326,38 @@ class MainFrame(wx.Frame):
 
         time_str = f"已播放：{self.format_time(current_time)} / 总时间：{self.format_time(total_time)}"
         progress_str = f"进度：{progress:.2f}%"
-        self.status_bar.SetStatusText(f"{time_str} ({progress_str})", 2)
+        self.set_status_text(f"{time_str} ({progress_str})", 2)
+
+        # 格式和播放列表总时长（由后台探测得到）
+        self.set_status_text(self.format_playlist_summary(track_info), 3)
 
         # 更新帮助文本
         self.update_help_text()
 
+    def format_playlist_summary(self, track_info):
+        """
+        生成当前曲目格式和播放列表总时长的摘要
+
+        Args:
+            track_info: 当前曲目信息
+
+        Returns:
+            str: 摘要文本，如"MP3 128kbps，列表共1小时2分"
+        """
+        parts = []
+        track_format = track_info.get('format', '')
+        bitrate = track_info.get('bitrate', '')
+        if track_format and bitrate and bitrate != '待检测':
+            parts.append(f"{track_format} {bitrate}")
+
+        total, known = self.audio_player.get_playlist_duration()
+        if known:
+            text = f"列表共{self.format_time(total)}"
+            if known < len(self.audio_player.playlist):
+                text += f"（{known}/{len(self.audio_player.playlist)}个已知）"
+            parts.append(text)
+        return "，".join(parts)
+
     def format_time(self, seconds: int) -> str:
         """格式化时间显示"""
         if seconds < 60:
@@ -5787,15 +5371,26 @@ class MainFrame(wx.Frame):
             minutes = (seconds % 3600) // 60
             return f"{hours}小时{minutes}分"
 
+    def format_size(self, size):
+        """格式化数据量显示"""
+        if size < 1024:
+            return f"{size}B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f}KB"
+        return f"{size / (1024 * 1024):.1f}MB"
+
     def update_help_text(self):
-        """更新操作提示文本"""
-        if self.audio_player and (self.audio_player.is_playing or self.audio_player.is_paused):
+        """更新操作提示文本（导出音频时显示导出进度）"""
+        export_status = getattr(self, 'audio_export_status', None)
+        if export_status:
+            self.set_status_text(export_status, 4)
+        elif self.audio_player and (self.audio_player.is_playing or self.audio_player.is_paused):
             if self.audio_player.is_paused:
-                self.status_bar.SetStatusText("Ctrl+Home播放，Ctrl+左右快进退", 4)
+                self.set_status_text("Ctrl+Home播放，Ctrl+左右快进退", 4)
             else:
-                self.status_bar.SetStatusText("Ctrl+Home暂停，Ctrl+End停止", 4)
+                self.set_status_text("Ctrl+Home暂停，Ctrl+End停止", 4)
         else:
-            self.status_bar.SetStatusText("Alt+P打开播放菜单", 4)
+            self.set_status_text("Alt+P打开播放菜单", 4)
 
     def setup_audio_menu(self):
         """设置音频菜单"""
@@ -5851,6 +5446,14 @@ class MainFrame(wx.Frame):
         vol_down_id = wx.NewId()
         self.audio_menu.Append(vol_down_id, "音量减少(&VolDown)\tCtrl+Down")
 
+        # 播放列表信息
+        playlist_info_id = wx.NewId()
+        self.audio_menu.Append(playlist_info_id, "播放列表信息(&I)")
+
+        # 导出音频
+        export_audio_id = wx.NewId()
+        self.audio_menu.Append(export_audio_id, "导出音频(&E)...")
+
         # 设备选择菜单项
         self.audio_menu.AppendSubMenu(
             self.audio_device_menu,
@@ -5866,6 +5469,8 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_forward, id=forward_id)
         self.Bind(wx.EVT_MENU, self.on_volume_up, id=vol_up_id)
         self.Bind(wx.EVT_MENU, self.on_volume_down, id=vol_down_id)
+        self.Bind(wx.EVT_MENU, self.on_playlist_info, id=playlist_info_id)
+        self.Bind(wx.EVT_MENU, self.on_export_audio, id=export_audio_id)
 
     def setup_unavailable_audio_menu(self):
         """设置不可用的音频菜单"""
@@ -6008,6 +5613,92 @@ class MainFrame(wx.Frame):
         self.audio_player.set_volume(new_vol)
         self.show_status(f"音量: {new_vol}%")
 
+    def on_playlist_info(self, event):
+        """显示播放列表中各音频的格式、位速和时长"""
+        playlist = list(self.audio_player.playlist)
+        if not playlist:
+            wx.MessageBox("播放列表为空", "播放列表信息", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        lines = []
+        for i, track in enumerate(playlist):
+            duration = track.get('duration')
+            duration_text = self.format_time(duration) if duration else "时长未知"
+            lines.append(f"{i + 1}. {track.get('title', '')} - {track.get('format', '')} "
+                         f"{track.get('bitrate', '')} {duration_text}")
+
+        total, known = self.audio_player.get_playlist_duration()
+        summary = f"共{len(playlist)}个音频，已知总时长{self.format_time(total)}（{known}个已知）"
+        wx.MessageBox(summary + "\n\n" + "\n".join(lines), "播放列表信息", wx.OK | wx.ICON_INFORMATION)
+
+    def on_export_audio(self, event):
+        """把播放列表中的音频下载到选择的文件夹（正在导出时询问是否取消）"""
+        exporter = getattr(self, 'audio_exporter', None)
+        if exporter and exporter.is_running():
+            if wx.MessageBox("正在导出音频，是否取消？\n已下载的部分会保留，再次导出到同一文件夹时继续下载。",
+                             "导出音频", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
+                exporter.cancel()
+            return
+
+        tracks = list(self.audio_player.playlist)
+        if not tracks:
+            wx.MessageBox("播放列表为空", "导出音频", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        # 使用当前论坛的会话下载，复用其连接和登录状态
+        session = self.auth_manager.get_session(self.current_forum) if self.current_forum else None
+        if session is None:
+            wx.MessageBox("请先登录论坛", "导出音频", wx.OK | wx.ICON_WARNING)
+            return
+
+        dialog = wx.DirDialog(self, f"选择导出{len(tracks)}个音频的文件夹",
+                              defaultPath=getattr(self, 'audio_export_dir', ''),
+                              style=wx.DD_DEFAULT_STYLE)
+        if dialog.ShowModal() != wx.ID_OK:
+            dialog.Destroy()
+            return
+        target_dir = dialog.GetPath()
+        dialog.Destroy()
+        self.audio_export_dir = target_dir
+
+        from src.utils.audio_export import AudioExporter
+        self.audio_exporter = AudioExporter(session)
+        self.audio_export_status = f"导出音频 0/{len(tracks)}"
+        self.update_help_text()
+        self.audio_exporter.export(
+            tracks, target_dir,
+            on_progress=lambda progress: wx.CallAfter(self.on_audio_export_progress, progress),
+            on_done=lambda result: wx.CallAfter(self.on_audio_export_done, target_dir, result)
+        )
+
+    def on_audio_export_progress(self, progress):
+        """导出进度更新（在界面线程中执行）"""
+        if not getattr(self, 'audio_export_status', None):
+            return
+        text = f"导出音频 {progress['done']}/{progress['total']}，{self.format_size(progress['bytes'])}"
+        if progress['failed']:
+            text += f"，{progress['failed']}个失败"
+        self.audio_export_status = text
+        self.update_help_text()
+
+    def on_audio_export_done(self, target_dir, result):
+        """导出结束（在界面线程中执行）"""
+        self.audio_export_status = None
+        self.update_help_text()
+
+        if result['cancelled']:
+            self.show_status(f"已取消导出音频，已保存{result['saved'] + result['skipped']}个")
+            return
+        summary = f"已导出{result['saved']}个音频到 {target_dir}"
+        if result['skipped']:
+            summary += f"，{result['skipped']}个已存在"
+        if result['failed']:
+            names = "\n".join(result['failed'][:20])
+            wx.MessageBox(f"{summary}\n\n{len(result['failed'])}个下载失败，再次导出时继续下载:\n{names}",
+                          "导出音频", wx.OK | wx.ICON_WARNING)
+        else:
+            self.show_status(summary)
+
     def on_device_selected(self, device):
         """设备选择"""
         if self.audio_player.set_audio_device(device['id']):
@@ -6033,63 +5724,25 @@ class MainFrame(wx.Frame):
             else:
                 menu_item.SetItemLabel("播放(&Play)\tCtrl+Home")
 
-    def start_status_update_timer(self):
-        """启动状态更新定时器"""
-        if hasattr(self, 'status_timer'):
-            self.status_timer.Stop()
-
-        self.status_timer = wx.Timer(self)
-        self.Bind(wx.EVT_TIMER, self.on_status_timer, self.status_timer)
-        self.status_timer.Start(1000)  # 每秒更新一次
-
-    def on_status_timer(self, event):
-        """状态栏定时器事件"""
-        self.update_audio_status_bar()
-
     # 音频检测和播放
-    def detect_audio_in_content(self, content: str) -> int:
-        """检测内容中的音频数量"""
-        import re
-
-        audio_list = []
-
-        # 使用现有的音频提取逻辑
-        def extract_audio(match):
-            src = match.group(1)
-            title = match.group(2) if len(match.groups()) > 1 else ""
-
-            if src and src not in [a['url'] for a in audio_list]:
-                audio_list.append({
-                    'url': src,
-                    'title': title or f"音频{len(audio_list)+1}",
-                    'format': 'MP3',  # 默认格式
-                    'bitrate': '待检测'  # 初始为待检测，播放时会更新为实际值
-                })
-            return ""
-
-        # 应用音频提取正则
-        patterns = [
-            r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>',
-            r'<audio\s+[^>]*title\s*=\s*["\']([^"\']+)["\'][^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>',
-            r'<audio\s+[^>]*src\s*=\s*["\']([^"\']+)["\'][^>]*>.*?</audio>'
-        ]
-
-        for pattern in patterns:
-            re.sub(pattern, extract_audio, content, flags=re.IGNORECASE | re.DOTALL)
-
-        # 设置播放列表
-        if hasattr(self, 'audio_player') and self.audio_player:
-            self.audio_player.playlist = audio_list
-            self.audio_player.current_index = 0
-
-        return len(audio_list)
+    def ask_to_play_audio(self, tracks):
+        """
+        询问是否播放检测到的音频，同意后以这些音频作为新的播放列表，并在后台加入后续页面的音频
 
-    def ask_to_play_audio(self, audio_count: int):
-        """询问是否播放检测到的音频"""
+        Args:
+            tracks: 当前页检测到的音频列表
+        """
         if not self.audio_menu_available:
             return
 
-        message = f"检测到 {audio_count} 个音频文件，是否开始播放？"
+        pagination = getattr(self, 'current_pagination', {}) or {}
+        page_offset = pagination.get('page_offset', 0)
+        current_page = pagination.get('page', 1) + page_offset
+        total_page = pagination.get('totalpage', 1) + page_offset
+
+        message = f"检测到 {len(tracks)} 个音频文件，是否开始播放？"
+        if current_page < total_page:
+            message += "\n后续页面中的音频将在后台加入播放列表。"
         dlg = wx.MessageDialog(
             self, message, "发现音频",
             wx.YES_NO | wx.ICON_QUESTION
@@ -6103,11 +5756,58 @@ class MainFrame(wx.Frame):
             if hasattr(self, 'audio_player') and self.audio_player:
                 # 停止当前播放，重置播放列表，开始播放新音频
                 self.audio_player.stop()
-                self.audio_player.current_index = 0
+                self.audio_player.set_playlist(tracks)
                 self.audio_player.play_current_track()
                 self.update_play_pause_menu_state()
                 self.update_audio_status_bar()
 
+                # 在后台读取后续页面，把其中的音频追加到播放列表
+                self.build_thread_playlist(current_page, total_page)
+
+    def build_thread_playlist(self, current_page, total_page):
+        """
+        在后台读取当前帖子的后续页面，把其中的音频按楼层顺序追加到播放列表
+
+        Args:
+            current_page: 当前页码（已加入播放列表）
+            total_page: 总页数
+        """
+        if not hasattr(self, 'playlist_builder'):
+            from playlist_builder import PlaylistBuilder
+            self.playlist_builder = PlaylistBuilder(self.forum_client, activity=self.activity)
+            self.playlist_build_id = 0
+
+        # 新的播放列表替代旧的，旧构建的结果不再加入
+        self.playlist_build_id += 1
+        build_id = self.playlist_build_id
+        if current_page >= total_page:
+            self.playlist_builder.cancel()
+            return
+
+        # 只看某用户时，后续页面也只读取该用户的回复，与列表中显示的一致
+        filter_mode = getattr(self, 'filter_mode', None)
+        filter_uid = filter_mode.get('uid') if filter_mode else None
+
+        seen_urls = {track['url'] for track in self.audio_player.playlist}
+        self.playlist_builder.build(
+            self.current_forum, self.current_tid, current_page, total_page, seen_urls,
+            on_tracks=lambda tracks: wx.CallAfter(self.on_playlist_tracks_found, build_id, tracks),
+            on_done=lambda cancelled: wx.CallAfter(self.on_playlist_build_done, build_id, cancelled),
+            uid=filter_uid
+        )
+
+    def on_playlist_tracks_found(self, build_id, tracks):
+        """后台构建找到新的音频（在界面线程中执行）"""
+        if build_id != self.playlist_build_id or not self.audio_player:
+            return
+        self.audio_player.append_tracks(tracks)
+
+    def on_playlist_build_done(self, build_id, cancelled):
+        """后台构建结束（在界面线程中执行）"""
+        if build_id != self.playlist_build_id or cancelled or not self.audio_player:
+            return
+        self.show_status(f"播放列表已加载全部页面，共{len(self.audio_player.playlist)}个音频")
+
     def show_status(self, message: str):
         """在状态栏显示临时消息"""
         if hasattr(self, 'status_bar'):
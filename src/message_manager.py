@@ -5,8 +5,6 @@
 """
 
 import wx
-from forum_client import ForumClient
-from auth_manager import AuthenticationManager
 
 class MessageManager:
     """消息管理器"""
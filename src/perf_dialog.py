@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+性能统计对话框
+显示各接口的耗时分布、最近导航的分阶段耗时和音频网络统计
+"""
+
+import json
+import os
+import sys
+import wx
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.perf_monitor import NAVIGATION_STAGES, STAGE_NAMES
+
+class PerfDialog(wx.Dialog):
+    """性能统计对话框"""
+
+    def __init__(self, parent, perf_monitor, stall_watchdog=None, stream_tuner=None):
+        """
+        初始化性能统计对话框
+
+        Args:
+            parent: 父窗口
+            perf_monitor: 性能监测器实例
+            stall_watchdog: 界面卡顿监视器实例（可选）
+            stream_tuner: 音频流缓冲调节器实例（可选）
+        """
+        super().__init__(parent, title="性能统计", size=(760, 520),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+
+        self.perf_monitor = perf_monitor
+        self.stall_watchdog = stall_watchdog
+        self.stream_tuner = stream_tuner
+        self.stall_summary = []
+
+        # 创建UI
+        self.create_ui()
+
+        # 加载数据
+        self.load_data()
+
+        # 居中显示
+        self.Center()
+
+    def create_ui(self):
+        """创建用户界面"""
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        # 创建选项卡
+        self.notebook = wx.Notebook(self)
+
+        # 接口统计选项卡
+        endpoint_panel = wx.Panel(self.notebook)
+        endpoint_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.endpoint_list = wx.ListCtrl(endpoint_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.endpoint_list.SetName("接口统计")
+        for i, (label, width) in enumerate([("接口", 200), ("请求数", 70), ("错误数", 70),
+                                            ("数据量", 100), ("P50", 90), ("P95", 90), ("最大", 90)]):
+            self.endpoint_list.InsertColumn(i, label, width=width)
+        endpoint_sizer.Add(self.endpoint_list, 1, wx.ALL | wx.EXPAND, 5)
+        endpoint_panel.SetSizer(endpoint_sizer)
+        self.notebook.AddPage(endpoint_panel, "接口统计")
+
+        # 最近导航选项卡
+        navigation_panel = wx.Panel(self.notebook)
+        navigation_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.navigation_list = wx.ListCtrl(navigation_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.navigation_list.SetName("最近导航")
+        columns = [("时间", 80), ("导航", 140), ("总耗时", 90)]
+        columns += [(STAGE_NAMES[stage], 80) for stage in NAVIGATION_STAGES]
+        for i, (label, width) in enumerate(columns):
+            self.navigation_list.InsertColumn(i, label, width=width)
+        navigation_sizer.Add(self.navigation_list, 1, wx.ALL | wx.EXPAND, 5)
+        navigation_panel.SetSizer(navigation_sizer)
+        self.notebook.AddPage(navigation_panel, "最近导航")
+
+        # 界面卡顿选项卡
+        if self.stall_watchdog:
+            stall_panel = wx.Panel(self.notebook)
+            stall_sizer = wx.BoxSizer(wx.VERTICAL)
+            self.stall_list = wx.ListCtrl(stall_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+            self.stall_list.SetName("卡顿位置")
+            for i, (label, width) in enumerate([("调用位置", 360), ("次数", 60), ("总时长", 100), ("最长", 100)]):
+                self.stall_list.InsertColumn(i, label, width=width)
+            self.stall_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_stall_selected)
+
+            stack_label = wx.StaticText(stall_panel, label="最长一次卡顿的调用栈:")
+            self.stall_stack_text = wx.TextCtrl(stall_panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_DONTWRAP)
+            self.stall_stack_text.SetName("最长一次卡顿的调用栈")
+
+            stall_sizer.Add(self.stall_list, 1, wx.ALL | wx.EXPAND, 5)
+            stall_sizer.Add(stack_label, 0, wx.LEFT | wx.RIGHT, 5)
+            stall_sizer.Add(self.stall_stack_text, 1, wx.ALL | wx.EXPAND, 5)
+            stall_panel.SetSizer(stall_sizer)
+            self.notebook.AddPage(stall_panel, "界面卡顿")
+
+        # 音频网络选项卡
+        if self.stream_tuner:
+            audio_panel = wx.Panel(self.notebook)
+            audio_sizer = wx.BoxSizer(wx.VERTICAL)
+            self.audio_list = wx.ListCtrl(audio_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+            self.audio_list.SetName("音频网络")
+            for i, (label, width) in enumerate([("主机", 180), ("首字节", 80), ("下载速度", 100),
+                                                ("播放次数", 70), ("平均起播", 90), ("卡顿次数", 70),
+                                                ("上次缓冲", 90)]):
+                self.audio_list.InsertColumn(i, label, width=width)
+            audio_sizer.Add(self.audio_list, 1, wx.ALL | wx.EXPAND, 5)
+            audio_panel.SetSizer(audio_sizer)
+            self.notebook.AddPage(audio_panel, "音频网络")
+
+        main_sizer.Add(self.notebook, 1, wx.EXPAND | wx.ALL, 10)
+
+        # 创建按钮区域
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        refresh_button = wx.Button(self, wx.ID_ANY, "刷新(&R)")
+        refresh_button.Bind(wx.EVT_BUTTON, self.on_refresh)
+
+        export_button = wx.Button(self, wx.ID_ANY, "导出JSON(&E)")
+        export_button.Bind(wx.EVT_BUTTON, self.on_export)
+
+        reset_button = wx.Button(self, wx.ID_ANY, "清空(&L)")
+        reset_button.Bind(wx.EVT_BUTTON, self.on_reset)
+
+        close_button = wx.Button(self, wx.ID_CANCEL, "关闭(&C)")
+
+        button_sizer.AddStretchSpacer(1)
+        button_sizer.Add(refresh_button, 0, wx.ALL, 5)
+        button_sizer.Add(export_button, 0, wx.ALL, 5)
+        button_sizer.Add(reset_button, 0, wx.ALL, 5)
+        button_sizer.Add(close_button, 0, wx.ALL, 5)
+
+        main_sizer.Add(button_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
+        self.SetSizer(main_sizer)
+
+        # 设置初始焦点到接口统计列表
+        self.endpoint_list.SetFocus()
+
+    def load_data(self):
+        """加载统计数据到列表"""
+        self.endpoint_list.DeleteAllItems()
+        summary = self.perf_monitor.get_endpoint_summary()
+        # 按P95从高到低排列，最慢的接口排在最前
+        for i, (endpoint, stats) in enumerate(sorted(summary.items(), key=lambda item: -item[1]['p95_ms'])):
+            self.endpoint_list.InsertItem(i, endpoint)
+            self.endpoint_list.SetItem(i, 1, str(stats['requests']))
+            self.endpoint_list.SetItem(i, 2, str(stats['errors']))
+            self.endpoint_list.SetItem(i, 3, self.format_size(stats['bytes_received']))
+            self.endpoint_list.SetItem(i, 4, f"{stats['p50_ms']}毫秒")
+            self.endpoint_list.SetItem(i, 5, f"{stats['p95_ms']}毫秒")
+            self.endpoint_list.SetItem(i, 6, f"{stats['max_ms']}毫秒")
+
+        self.navigation_list.DeleteAllItems()
+        for i, navigation in enumerate(self.perf_monitor.get_recent_navigations()):
+            self.navigation_list.InsertItem(i, navigation['started'])
+            self.navigation_list.SetItem(i, 1, navigation['label'])
+            self.navigation_list.SetItem(i, 2, f"{navigation['total_ms']}毫秒")
+            for column, stage in enumerate(NAVIGATION_STAGES, start=3):
+                self.navigation_list.SetItem(i, column, f"{navigation['stages_ms'].get(stage, 0)}毫秒")
+
+        if self.endpoint_list.GetItemCount() > 0:
+            self.endpoint_list.SetItemState(0, wx.LIST_STATE_SELECTED | wx.LIST_STATE_FOCUSED,
+                                            wx.LIST_STATE_SELECTED | wx.LIST_STATE_FOCUSED)
+
+        if self.stall_watchdog:
+            self.stall_list.DeleteAllItems()
+            self.stall_stack_text.SetValue("")
+            self.stall_summary = self.stall_watchdog.get_summary()
+            for i, stats in enumerate(self.stall_summary):
+                self.stall_list.InsertItem(i, stats['site'])
+                self.stall_list.SetItem(i, 1, str(stats['count']))
+                self.stall_list.SetItem(i, 2, f"{stats['total_ms']:.0f}毫秒")
+                self.stall_list.SetItem(i, 3, f"{stats['max_ms']:.0f}毫秒")
+
+        if self.stream_tuner:
+            self.audio_list.DeleteAllItems()
+            for i, stats in enumerate(self.stream_tuner.get_summary()):
+                self.audio_list.InsertItem(i, stats['host'])
+                self.audio_list.SetItem(i, 1, self.format_ms(stats['ttfb_ms']))
+                throughput = stats['throughput_kbps']
+                self.audio_list.SetItem(i, 2, f"{throughput}kbps" if throughput is not None else "--")
+                self.audio_list.SetItem(i, 3, str(stats['playbacks']))
+                self.audio_list.SetItem(i, 4, self.format_ms(stats['avg_start_ms']))
+                self.audio_list.SetItem(i, 5, str(stats['rebuffers']))
+                self.audio_list.SetItem(i, 6, self.format_ms(stats['last_caching_ms']))
+
+    def format_size(self, size):
+        """格式化数据量显示"""
+        if size < 1024:
+            return f"{size}B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f}KB"
+        return f"{size / (1024 * 1024):.1f}MB"
+
+    def format_ms(self, value):
+        """格式化毫秒数显示，没有数据时显示--"""
+        return f"{value}毫秒" if value is not None else "--"
+
+    def on_stall_selected(self, event):
+        """卡顿位置选择事件，显示对应的调用栈"""
+        index = event.GetIndex()
+        if 0 <= index < len(self.stall_summary):
+            self.stall_stack_text.SetValue(self.stall_summary[index]['stack'])
+
+    def on_refresh(self, event):
+        """刷新按钮事件"""
+        self.load_data()
+
+    def on_export(self, event):
+        """导出按钮事件"""
+        dialog = wx.FileDialog(
+            self, "导出性能统计", wildcard="JSON文件 (*.json)|*.json",
+            defaultFile="forum_assist_perf.json",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT
+        )
+        if dialog.ShowModal() == wx.ID_OK:
+            path = dialog.GetPath()
+            try:
+                data = self.perf_monitor.export()
+                if self.stall_watchdog:
+                    data['stalls'] = self.stall_watchdog.get_summary()
+                if self.stream_tuner:
+                    data['audio_hosts'] = self.stream_tuner.get_summary()
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                wx.MessageBox(f"已导出到: {path}", "提示", wx.OK | wx.ICON_INFORMATION)
+            except Exception as e:
+                wx.MessageBox(f"导出失败: {str(e)}", "错误", wx.OK | wx.ICON_ERROR)
+        dialog.Destroy()
+
+    def on_reset(self, event):
+        """清空按钮事件"""
+        self.perf_monitor.reset()
+        if self.stall_watchdog:
+            self.stall_watchdog.reset()
+        self.load_data()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+播放列表构建器
+在后台按楼层顺序读取帖子的后续页面，提取其中的音频并追加到播放列表
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.content_resources import extract_audio
+
+# 同时获取的页面数
+MAX_CONCURRENT_PAGES = 3
+
+# 程序空闲时每页之间的间隔（秒），空闲时逐页获取
+IDLE_PAGE_INTERVAL = 5
+
+
+def extract_audio_tracks(posts, seen_urls=None):
+    """
+    按楼层顺序提取回复中的音频
+
+    Args:
+        posts: 回复列表（字典或回复记录，包含message）
+        seen_urls: 已提取过的音频地址集合，提取时会加入新地址；为None时只在本次提取中去重
+
+    Returns:
+        list: 音频字典列表 [{'url', 'title', 'format', 'bitrate'}]，没有标题时title为空字符串
+    """
+    if seen_urls is None:
+        seen_urls = set()
+
+    tracks = []
+    for post in posts:
+        for audio in extract_audio(post.get('message', ''), seen_urls):
+            tracks.append({
+                'url': audio['url'],
+                'title': audio['title'],
+                'format': 'MP3',  # 默认格式
+                'bitrate': '待检测'  # 初始为待检测，播放时会更新为实际值
+            })
+    return tracks
+
+
+class PlaylistBuilder:
+    """后台播放列表构建器（同一时间只构建一个帖子的播放列表）"""
+
+    def __init__(self, forum_client, max_workers=MAX_CONCURRENT_PAGES, activity=None):
+        """
+        初始化播放列表构建器
+
+        Args:
+            forum_client: 论坛客户端实例
+            max_workers: 同时获取的页面数
+            activity: 程序活动状态监视器（ActivityMonitor），空闲时放慢页面获取
+        """
+        self.forum_client = forum_client
+        self.max_workers = max_workers
+        self.activity = activity
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._idle_slot = threading.Lock()
+
+    def build(self, forum_name, tid, start_page, total_page, seen_urls, on_tracks, on_done=None, uid=None):
+        """
+        开始在后台读取 start_page 之后的所有页面（会取消正在进行的构建）
+
+        Args:
+            forum_name: 论坛名称
+            tid: 帖子ID
+            start_page: 已提取音频的当前页码，从下一页开始读取
+            total_page: 总页数
+            seen_urls: 已在播放列表中的音频地址（用于去重）
+            on_tracks: 回调函数，参数为按楼层顺序新发现的音频列表（在后台线程中调用）
+            on_done: 构建结束回调，参数为是否被取消（在后台线程中调用）
+            uid: 只看该用户时的用户ID，与当前列表一样只读取该用户的回复；为None时读取所有回复
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+
+        pages = list(range(start_page + 1, total_page + 1))
+        if not pages:
+            if on_done:
+                on_done(False)
+            return
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(generation, forum_name, tid, pages, set(seen_urls), on_tracks, on_done, uid),
+            name="PlaylistBuilder",
+            daemon=True
+        )
+        thread.start()
+
+    def cancel(self):
+        """取消正在进行的构建"""
+        with self._lock:
+            self._generation += 1
+
+    def is_cancelled(self, generation):
+        """构建是否已被取消或被新的构建替代"""
+        return generation != self._generation
+
+    def _run(self, generation, forum_name, tid, pages, seen_urls, on_tracks, on_done, uid):
+        """构建线程：并发获取页面，按页码顺序提取音频"""
+        def get_posts(page):
+            if self.is_cancelled(generation):
+                return []
+            result = self.forum_client.get_thread_detail(forum_name, tid, page=page, uid=uid)
+            posts = result.get('postlist', [])
+            if uid is not None:
+                # 接口未按用户筛选时也只保留该用户的回复
+                posts = [post for post in posts if str(post.get('uid')) == str(uid)]
+            return posts
+
+        def fetch(page):
+            if self.activity is not None and self.activity.is_idle():
+                # 空闲时不停止（后台播放仍需要后续曲目），但逐页获取并放慢
+                with self._idle_slot:
+                    self.activity.wait_active(IDLE_PAGE_INTERVAL)
+                    return get_posts(page)
+            return get_posts(page)
+
+        cancelled = False
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="PlaylistPage") as executor:
+            futures = [executor.submit(fetch, page) for page in pages]
+            for page, future in zip(pages, futures):
+                try:
+                    posts = future.result()
+                except Exception as e:
+                    print(f"获取第{page}页音频失败: {e}")
+                    continue
+                if self.is_cancelled(generation):
+                    cancelled = True
+                    break
+                tracks = extract_audio_tracks(posts, seen_urls)
+                if tracks:
+                    on_tracks(tracks)
+            if cancelled:
+                for future in futures:
+                    future.cancel()
+
+        if on_done:
+            on_done(cancelled)
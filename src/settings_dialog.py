@@ -73,7 +73,7 @@ class SettingsDialog(wx.Dialog):
         )
 
         # 设置当前状态
-        current_state = self.config_manager.get_show_list_numbers()
+        current_state = self.config_manager.settings.show_list_numbers
         self.show_list_numbers_checkbox.SetValue(current_state)
 
         # 添加说明文字
@@ -86,6 +86,25 @@ class SettingsDialog(wx.Dialog):
 
         sizer.Add(self.show_list_numbers_checkbox, 0, wx.ALL, 10)
         sizer.Add(info_text, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
+        # 音频缓存
+        settings = self.config_manager.settings
+        self.audio_cache_checkbox = wx.CheckBox(
+            panel,
+            label="缓存播放过的音频",
+            style=wx.ALIGN_LEFT
+        )
+        self.audio_cache_checkbox.SetValue(settings.audio_cache_enabled)
+
+        cache_size_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        cache_size_label = wx.StaticText(panel, label="音频缓存上限(MB):")
+        self.audio_cache_size_ctrl = wx.SpinCtrl(panel, min=50, max=102400, initial=settings.audio_cache_mb)
+        self.audio_cache_size_ctrl.SetName("音频缓存上限(MB)")
+        cache_size_sizer.Add(cache_size_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        cache_size_sizer.Add(self.audio_cache_size_ctrl, 0)
+
+        sizer.Add(self.audio_cache_checkbox, 0, wx.ALL, 10)
+        sizer.Add(cache_size_sizer, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
         sizer.AddStretchSpacer(1)
 
         panel.SetSizer(sizer)
@@ -93,9 +112,13 @@ class SettingsDialog(wx.Dialog):
 
     def on_ok(self, event):
         """确定按钮事件"""
-        # 保存设置
+        # 保存设置，订阅者（如主窗口列表）会收到变化通知
         show_list_numbers = self.show_list_numbers_checkbox.GetValue()
-        self.config_manager.set_show_list_numbers(show_list_numbers)
+        self.config_manager.settings.update(
+            show_list_numbers=show_list_numbers,
+            audio_cache_enabled=self.audio_cache_checkbox.GetValue(),
+            audio_cache_mb=self.audio_cache_size_ctrl.GetValue()
+        )
 
         # 关闭对话框
         self.EndModal(wx.ID_OK)
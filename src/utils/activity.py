@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+程序活动状态模块
+记录主窗口是否在前台、是否最小化；窗口空闲时后台预取任务暂停或放慢，界面定时工作停止，
+回到前台时恢复
+"""
+
+import threading
+
+# 活动状态
+ACTIVE = 'active'        # 程序在前台
+INACTIVE = 'inactive'    # 窗口可见但程序不在前台
+MINIMIZED = 'minimized'  # 窗口已最小化
+
+
+class ActivityMonitor:
+    """程序活动状态监视器"""
+
+    def __init__(self):
+        self._state = ACTIVE
+        self._active = threading.Event()
+        self._active.set()
+        self._closed = False
+        self._listeners = []
+
+    @property
+    def state(self):
+        """当前活动状态"""
+        return self._state
+
+    def is_idle(self):
+        """程序是否空闲（不在前台或已最小化）"""
+        return self._state != ACTIVE
+
+    def subscribe(self, callback):
+        """
+        订阅状态变化
+
+        Args:
+            callback: 回调函数，参数为 (旧状态, 新状态)，在调用 set_state 的线程（界面线程）中调用
+        """
+        self._listeners.append(callback)
+
+    def set_state(self, state):
+        """
+        更新活动状态（在界面线程中调用），状态变化时通知订阅者
+
+        Args:
+            state: ACTIVE、INACTIVE 或 MINIMIZED
+        """
+        if self._closed or state == self._state:
+            return
+        old_state, self._state = self._state, state
+        if state == ACTIVE:
+            self._active.set()
+        else:
+            self._active.clear()
+        for callback in list(self._listeners):
+            try:
+                callback(old_state, state)
+            except Exception as e:
+                print(f"活动状态回调失败: {e}")
+
+    def wait_active(self, timeout=None):
+        """
+        在后台线程中等待程序回到前台
+
+        Args:
+            timeout: 最长等待时间（秒），为None时一直等待；用于放慢而不是暂停的任务
+
+        Returns:
+            bool: 程序是否已在前台（超时返回False）
+        """
+        return self._active.wait(timeout)
+
+    def close(self):
+        """程序退出：放行所有等待中的后台任务，之后不再进入空闲状态"""
+        self._closed = True
+        self._state = ACTIVE
+        self._active.set()
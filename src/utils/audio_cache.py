@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+音频缓存模块
+把播放过的论坛音频在后台下载到本地，再次播放时直接使用本地文件；按最近使用时间淘汰，总大小不超过设定的字节数
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# 索引文件名
+INDEX_FILE = 'index.json'
+
+# 同时进行的下载数
+MAX_DOWNLOADS = 2
+
+# 下载分块大小
+CHUNK_SIZE = 64 * 1024
+
+# 请求超时（秒）
+REQUEST_TIMEOUT = 15
+
+# 已缓存文件多久之后播放时重新校验ETag（秒）
+REVALIDATE_INTERVAL = 24 * 3600
+
+# 程序空闲时每个下载或校验开始前最多等待的时间（秒），空闲期间逐个进行
+IDLE_INTERVAL = 5
+
+# 只有最近使用时间变化时，延迟多久写入索引（秒），期间的多次播放合并为一次写入
+INDEX_SAVE_DELAY = 10
+
+
+class AudioCache:
+    """磁盘音频缓存"""
+
+    def __init__(self, cache_dir, max_bytes, stream_tuner=None, activity=None):
+        """
+        初始化音频缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            stream_tuner: 音频流缓冲调节器（StreamTuner），用于记录各主机的首字节时间和下载速度
+            activity: 程序活动状态监视器（ActivityMonitor），空闲时推迟下载和校验
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stream_tuner = stream_tuner
+        self.activity = activity
+        self._lock = threading.Lock()
+        self._download_slots = threading.Semaphore(MAX_DOWNLOADS)
+        self._idle_slot = threading.Lock()
+        self._downloading = set()
+        self._session = None
+        self._save_timer = None
+        os.makedirs(cache_dir, exist_ok=True)
+        self._entries = self._load_index()
+
+    # ========== 索引 ==========
+
+    def _load_index(self):
+        """读取缓存索引，丢弃文件已不存在的条目"""
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {key: entry for key, entry in entries.items()
+                if isinstance(entry, dict) and os.path.exists(self._path(key))}
+
+    def _save_index(self):
+        """写入缓存索引（先写临时文件再替换，调用方持有锁）"""
+        if self._save_timer:
+            self._save_timer.cancel()
+            self._save_timer = None
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"[WARN] 写入音频缓存索引失败: {e}")
+
+    def _schedule_save(self):
+        """在 INDEX_SAVE_DELAY 秒后由后台定时器写入索引（调用方持有锁）"""
+        if self._save_timer:
+            return
+        self._save_timer = threading.Timer(INDEX_SAVE_DELAY, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self):
+        """立即写入尚未保存的索引（程序退出或停用缓存时调用）"""
+        with self._lock:
+            if self._save_timer:
+                self._save_index()
+
+    @staticmethod
+    def _key(url):
+        """缓存键（URL的SHA1）"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        """缓存文件路径"""
+        return os.path.join(self.cache_dir, key + '.audio')
+
+    def _get_session(self):
+        """获取下载用的HTTP会话（第一次使用时创建）"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = 'Mozilla/5.0'
+        return self._session
+
+    # ========== 对外接口 ==========
+
+    def resolve(self, url):
+        """
+        获取播放地址：已完整缓存时返回本地文件路径，否则返回原地址并在后台开始下载
+
+        Args:
+            url: 音频地址
+
+        Returns:
+            str: 本地文件路径或原地址
+        """
+        if not url.lower().startswith(('http://', 'https://')):
+            return url
+
+        key = self._key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.get('complete'):
+                # 最近使用时间只影响淘汰顺序，不在界面线程中立即写入磁盘
+                entry['last_access'] = time.time()
+                revalidate = time.time() - entry.get('validated_at', 0) > REVALIDATE_INTERVAL
+                self._schedule_save()
+            else:
+                revalidate = False
+                entry = None
+
+        if entry:
+            if revalidate:
+                self._start(self._revalidate, url, key)
+            return self._path(key)
+
+        self.fetch(url)
+        return url
+
+    def fetch(self, url):
+        """
+        在后台下载音频（已在下载或已完整缓存时不重复下载）
+
+        Args:
+            url: 音频地址
+        """
+        key = self._key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if key in self._downloading or (entry and entry.get('complete')):
+                return
+            self._downloading.add(key)
+        self._start(self._download, url, key)
+
+    def set_max_bytes(self, max_bytes):
+        """修改缓存大小上限并立即按新上限淘汰"""
+        self.max_bytes = max_bytes
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    def clear(self):
+        """清空缓存（正在下载的文件除外）"""
+        with self._lock:
+            for key in list(self._entries):
+                if key not in self._downloading:
+                    self._remove(key)
+            self._save_index()
+
+    def total_bytes(self):
+        """已缓存的总字节数"""
+        with self._lock:
+            return sum(entry.get('size', 0) for entry in self._entries.values())
+
+    # ========== 下载 ==========
+
+    def _start(self, target, *args):
+        """启动后台线程"""
+        threading.Thread(target=target, args=args, name="AudioCache", daemon=True).start()
+
+    def _wait_if_idle(self):
+        """程序空闲时放慢下载和校验（逐个进行，每个最多等待 IDLE_INTERVAL 秒），不让线程一直等待"""
+        if self.activity is not None and self.activity.is_idle():
+            with self._idle_slot:
+                self.activity.wait_active(IDLE_INTERVAL)
+
+    def _download(self, url, key):
+        """
+        下载音频到缓存目录，已有部分文件时使用Range请求续传
+
+        Args:
+            url: 音频地址
+            key: 缓存键
+        """
+        path = self._path(key)
+        try:
+            # 程序空闲时放慢下载（播放不依赖缓存）
+            self._wait_if_idle()
+            with self._download_slots:
+                with self._lock:
+                    entry = dict(self._entries.get(key) or {'url': url})
+                offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+                headers = {}
+                validator = entry.get('etag') or entry.get('last_modified')
+                if offset and validator:
+                    # 源文件未变化时续传，变化时服务器返回完整文件
+                    headers['Range'] = f'bytes={offset}-'
+                    headers['If-Range'] = validator
+
+                requested = time.perf_counter()
+                with self._get_session().get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    first_byte = time.perf_counter()
+                    if response.status_code == 206 and headers and \
+                            response.headers.get('Content-Range', '').startswith(f'bytes {offset}-'):
+                        mode = 'ab'
+                    elif response.status_code == 200:
+                        mode, offset = 'wb', 0
+                    else:
+                        print(f"[WARN] 缓存音频失败 ({response.status_code}): {url}")
+                        if response.status_code in (206, 416):
+                            # 续传位置与服务器不一致，丢弃部分文件，下次重新下载
+                            with self._lock:
+                                self._remove(key)
+                                self._save_index()
+                        return
+
+                    length = response.headers.get('Content-Length')
+                    expected = offset + int(length) if length and length.isdigit() else None
+                    if mode == 'wb' or response.headers.get('ETag') or response.headers.get('Last-Modified'):
+                        entry.update(etag=response.headers.get('ETag'),
+                                     last_modified=response.headers.get('Last-Modified'))
+                    entry.update(complete=False, last_access=time.time())
+                    with self._lock:
+                        self._entries[key] = dict(entry, size=offset)
+                        self._save_index()
+
+                    size = offset
+                    with open(path, mode) as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                            size += len(chunk)
+
+                if expected is not None and size != expected:
+                    if size > expected:
+                        os.remove(path)
+                    raise IOError(f"下载不完整（{size}/{expected}字节）")
+
+                if self.stream_tuner is not None:
+                    self.stream_tuner.record_transfer(url, first_byte - requested, size - offset,
+                                                      time.perf_counter() - first_byte)
+
+            with self._lock:
+                self._entries[key] = dict(entry, size=size, complete=True, validated_at=time.time())
+                self._evict(keep=key)
+                self._save_index()
+            print(f"音频已缓存: {url} ({size // 1024}KB)")
+        except Exception as e:
+            # 保留已下载的部分，下次播放时续传
+            print(f"[WARN] 缓存音频中断: {e}")
+            with self._lock:
+                if key in self._entries and os.path.exists(path):
+                    self._entries[key]['size'] = os.path.getsize(path)
+                    self._save_index()
+        finally:
+            with self._lock:
+                self._downloading.discard(key)
+
+    def _revalidate(self, url, key):
+        """
+        校验已缓存的音频是否仍是最新（ETag或修改时间），源文件已变化时删除缓存
+
+        Args:
+            url: 音频地址
+            key: 缓存键
+        """
+        self._wait_if_idle()
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        if not headers:
+            return
+
+        try:
+            response = self._get_session().head(url, headers=headers, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+        except Exception:
+            return
+
+        with self._lock:
+            if key not in self._entries:
+                return
+            if response.status_code == 304 or (
+                    response.status_code == 200 and entry.get('etag')
+                    and response.headers.get('ETag') == entry['etag']):
+                self._entries[key]['validated_at'] = time.time()
+            elif response.status_code == 200 and key not in self._downloading:
+                # 源文件已变化，下次播放时重新下载
+                print(f"音频源已更新，删除缓存: {url}")
+                self._remove(key)
+            self._save_index()
+
+    # ========== 淘汰 ==========
+
+    def _remove(self, key):
+        """删除缓存条目和文件（调用方持有锁）"""
+        self._entries.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        """
+        按最近使用时间淘汰缓存，直到总大小不超过上限（调用方持有锁）
+
+        Args:
+            keep: 不淘汰的缓存键（刚下载完成的文件）
+        """
+        total = sum(entry.get('size', 0) for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        candidates = sorted((entry.get('last_access', 0), key) for key, entry in self._entries.items()
+                            if key != keep and key not in self._downloading)
+        for _, key in candidates:
+            if total <= self.max_bytes:
+                break
+            total -= self._entries[key].get('size', 0)
+            self._remove(key)
+
+        # 单个文件就超过上限时也不保留
+        if keep and total > self.max_bytes and keep in self._entries:
+            self._remove(keep)
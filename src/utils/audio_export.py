@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+音频导出模块
+把播放列表中的音频并发下载到指定文件夹：每个主机限制同时连接数，中断的文件用Range请求续传，
+下载完成后才把临时文件替换为最终文件名
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# 同时下载的音频数
+MAX_DOWNLOADS = 4
+
+# 每个主机同时下载的音频数
+MAX_PER_HOST = 2
+
+# 下载分块大小
+CHUNK_SIZE = 64 * 1024
+
+# 请求超时（秒）
+REQUEST_TIMEOUT = 30
+
+# 进度回调的最小间隔（秒）
+PROGRESS_INTERVAL = 0.5
+
+# 未完成文件和续传信息的后缀
+PART_SUFFIX = '.part'
+PART_INFO_SUFFIX = '.part.json'
+
+# 文件名最大长度（不含序号和扩展名）
+MAX_NAME_LENGTH = 80
+
+# 可识别的音频扩展名，以及格式名对应的扩展名
+_AUDIO_EXTENSIONS = {'.mp3', '.m4a', '.aac', '.ogg', '.opus', '.wav', '.flac', '.wma', '.amr'}
+_FORMAT_EXTENSIONS = {'MP3': '.mp3', 'M4A': '.m4a', 'AAC': '.aac', 'OGG': '.ogg', 'OPUS': '.opus',
+                      'WAV': '.wav', 'FLAC': '.flac'}
+
+# 文件名中不允许的字符（Windows保留字符和控制字符）
+_INVALID_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+_SPACES = re.compile(r'\s+')
+
+# Windows保留的设备名
+_RESERVED_NAMES = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)}
+
+
+def sanitize_filename(title, default='音频'):
+    """
+    把论坛标题转换为可用的文件名
+
+    Args:
+        title: 音频标题
+        default: 标题为空时使用的名称
+
+    Returns:
+        str: 文件名（不含扩展名）
+    """
+    name = _SPACES.sub(' ', _INVALID_CHARS.sub('_', title or '')).strip()
+    name = name[:MAX_NAME_LENGTH].rstrip(' .')
+    if not name:
+        return default
+    if name.split('.')[0].upper() in _RESERVED_NAMES:
+        name = '_' + name
+    return name
+
+
+def audio_extension(track):
+    """根据地址或探测到的格式选择扩展名，无法判断时使用.mp3"""
+    extension = os.path.splitext(urlsplit(track.get('url', '')).path)[1].lower()
+    if extension in _AUDIO_EXTENSIONS:
+        return extension
+    return _FORMAT_EXTENSIONS.get(str(track.get('format', '')).upper(), '.mp3')
+
+
+class AudioExporter:
+    """播放列表音频导出器（同一时间只进行一次导出）"""
+
+    def __init__(self, session, max_workers=MAX_DOWNLOADS, per_host=MAX_PER_HOST):
+        """
+        初始化导出器
+
+        Args:
+            session: HTTP会话（使用论坛会话，复用其连接池和登录状态）
+            max_workers: 同时下载的音频数
+            per_host: 每个主机同时下载的音频数
+        """
+        self.session = session
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        """是否正在导出"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        """取消导出（已下载的部分保留，下次导出时续传）"""
+        self._cancel.set()
+
+    def export(self, tracks, target_dir, on_progress=None, on_done=None):
+        """
+        在后台导出音频
+
+        Args:
+            tracks: 音频字典列表，包含url和title（按播放列表顺序，文件名带序号）
+            target_dir: 目标文件夹
+            on_progress: 进度回调，参数为进度字典 {'done', 'failed', 'total', 'bytes'}（在后台线程中调用）
+            on_done: 结束回调，参数为结果字典 {'saved', 'skipped', 'failed', 'cancelled', 'bytes'}（在后台线程中调用）
+
+        Returns:
+            bool: 是否开始导出，已有导出进行中时返回False
+        """
+        if self.is_running():
+            return False
+        self._cancel.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(list(tracks), target_dir, on_progress, on_done),
+            name="AudioExport", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _slot(self, url):
+        """获取主机的连接数限制"""
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.Semaphore(self.per_host)
+        return slot
+
+    def _run(self, tracks, target_dir, on_progress, on_done):
+        """导出线程：为每个音频分配文件名并并发下载"""
+        os.makedirs(target_dir, exist_ok=True)
+
+        # 文件名带序号保持播放列表顺序，同名时序号也能区分
+        width = max(2, len(str(len(tracks))))
+        jobs = []
+        for index, track in enumerate(tracks, start=1):
+            name = f"{index:0{width}d} {sanitize_filename(track.get('title'))}{audio_extension(track)}"
+            jobs.append((track['url'], os.path.join(target_dir, name)))
+
+        progress = {'done': 0, 'failed': 0, 'total': len(jobs), 'bytes': 0}
+        result = {'saved': 0, 'skipped': 0, 'failed': [], 'cancelled': False, 'bytes': 0}
+        last_report = [0.0]
+
+        def report(force=False):
+            # 调用方持有锁
+            now = time.monotonic()
+            if on_progress and (force or now - last_report[0] >= PROGRESS_INTERVAL):
+                last_report[0] = now
+                on_progress(dict(progress))
+
+        def add_bytes(count):
+            with self._lock:
+                progress['bytes'] += count
+                result['bytes'] += count
+                report()
+
+        def run_job(url, path):
+            try:
+                status = self._download(url, path, add_bytes)
+            except Exception as e:
+                print(f"[WARN] 导出音频失败: {url} ({e})")
+                status = 'failed'
+            with self._lock:
+                if status == 'failed':
+                    progress['failed'] += 1
+                    result['failed'].append(os.path.basename(path))
+                elif status != 'cancelled':
+                    progress['done'] += 1
+                    result[status] += 1
+                report(force=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AudioExportFile") as executor:
+            for url, path in jobs:
+                executor.submit(run_job, url, path)
+
+        result['cancelled'] = self._cancel.is_set()
+        if on_done:
+            on_done(result)
+
+    def _download(self, url, path, add_bytes):
+        """
+        下载一个音频，已有未完成文件时续传
+
+        Args:
+            url: 音频地址
+            path: 最终文件路径
+            add_bytes: 回调函数，参数为新下载的字节数
+
+        Returns:
+            str: 'saved'、'skipped'（文件已存在）或 'cancelled'
+        """
+        if os.path.exists(path):
+            return 'skipped'
+        if self._cancel.is_set():
+            return 'cancelled'
+
+        part_path = path + PART_SUFFIX
+        info_path = path + PART_INFO_SUFFIX
+        with self._slot(url):
+            if self._cancel.is_set():
+                return 'cancelled'
+
+            while True:
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                info = self._read_part_info(info_path) if offset else {}
+                headers = {}
+                if offset and info.get('url') == url:
+                    headers['Range'] = f'bytes={offset}-'
+                    # 源文件已变化时服务器返回完整文件，不会拼接两个版本
+                    validator = info.get('etag') or info.get('last_modified')
+                    if validator:
+                        headers['If-Range'] = validator
+
+                with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code == 416 and headers:
+                        # 上次已下载完所有字节但未改名：总大小一致时直接完成，否则丢弃重新下载
+                        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                        if total.isdigit() and int(total) == offset:
+                            break
+                        self._remove_files(part_path, info_path)
+                        continue
+
+                    if response.status_code == 206 and headers and \
+                            response.headers.get('Content-Range', '').startswith(f'bytes {offset}-'):
+                        mode = 'ab'
+                    elif response.status_code == 200:
+                        mode, offset = 'wb', 0
+                    else:
+                        raise IOError(f"HTTP {response.status_code}")
+
+                    length = response.headers.get('Content-Length')
+                    expected = offset + int(length) if length and length.isdigit() else None
+                    self._write_part_info(info_path, {
+                        'url': url,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                    })
+
+                    size = offset
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            if self._cancel.is_set():
+                                return 'cancelled'
+                            f.write(chunk)
+                            size += len(chunk)
+                            add_bytes(len(chunk))
+
+                if expected is not None and size != expected:
+                    raise IOError(f"下载不完整（{size}/{expected}字节）")
+                break
+
+        os.replace(part_path, path)
+        self._remove_files(info_path)
+        return 'saved'
+
+    @staticmethod
+    def _remove_files(*paths):
+        """删除未完成文件或续传信息（不存在时忽略）"""
+        for remove_path in paths:
+            try:
+                os.remove(remove_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _read_part_info(info_path):
+        """读取未完成文件的续传信息"""
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            return info if isinstance(info, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_part_info(info_path, info):
+        """写入未完成文件的续传信息（先写临时文件再替换）"""
+        temp_path = info_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False)
+            os.replace(temp_path, info_path)
+        except OSError as e:
+            print(f"[WARN] 写入续传信息失败: {e}")
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+音频信息探测模块
+不播放音频，只通过HEAD请求和少量Range请求读取文件头，得到格式、位速和时长；结果按地址缓存
+"""
+
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 同时探测的音频数
+MAX_PROBES = 6
+
+# 每次读取的文件头字节数
+HEADER_BYTES = 64 * 1024
+
+# 请求超时（秒）
+REQUEST_TIMEOUT = 10
+
+# 程序空闲时每次探测前最多等待的时间（秒）
+IDLE_PROBE_INTERVAL = 5
+
+# MP4中最多跳过的顶层box数（查找moov）
+MAX_MP4_BOXES = 16
+
+# MPEG音频位速表（kbps）{(版本, 层): 表}，版本1为MPEG-1，2为MPEG-2/2.5
+_MPEG_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# MPEG采样率表 {版本位: 采样率}
+_MPEG_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+
+# Content-Type 到格式名的对应
+_CONTENT_TYPES = {
+    'audio/mpeg': 'MP3', 'audio/mp3': 'MP3', 'audio/mp4': 'M4A', 'audio/x-m4a': 'M4A', 'audio/aac': 'AAC',
+    'audio/ogg': 'OGG', 'audio/opus': 'OPUS', 'audio/wav': 'WAV', 'audio/x-wav': 'WAV', 'audio/flac': 'FLAC',
+}
+
+
+class AudioProber:
+    """并发音频信息探测器"""
+
+    def __init__(self, max_workers=MAX_PROBES, stream_tuner=None, activity=None):
+        """
+        初始化探测器
+
+        Args:
+            max_workers: 同时探测的音频数
+            stream_tuner: 音频流缓冲调节器（StreamTuner），用于记录各主机的首字节时间和下载速度
+            activity: 程序活动状态监视器（ActivityMonitor），空闲时放慢探测
+        """
+        self.stream_tuner = stream_tuner
+        self.activity = activity
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AudioProbe")
+        self._results = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._session = None
+
+    def _get_session(self):
+        """获取探测用的HTTP会话（第一次使用时创建）"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = 'Mozilla/5.0'
+        return self._session
+
+    def get_cached(self, url):
+        """获取已缓存的探测结果，没有时返回None"""
+        with self._lock:
+            return self._results.get(url)
+
+    def probe_tracks(self, tracks, callback):
+        """
+        在后台并发探测播放列表中的音频（已探测或正在探测的地址跳过）
+
+        Args:
+            tracks: 音频字典列表，包含url
+            callback: 回调函数，参数为 (地址, 探测结果字典)，每个音频探测完成时在后台线程中调用
+        """
+        for track in tracks:
+            url = track.get('url')
+            if not url or not url.lower().startswith(('http://', 'https://')):
+                continue
+            with self._lock:
+                cached = self._results.get(url)
+                if cached is None and url in self._pending:
+                    continue
+                if cached is None:
+                    self._pending.add(url)
+            if cached is not None:
+                callback(url, cached)
+            else:
+                self._executor.submit(self._probe_and_notify, url, callback)
+
+    def _probe_and_notify(self, url, callback):
+        """探测一个音频并调用回调（程序空闲时放慢探测，不让工作线程一直等待）"""
+        if self.activity is not None and self.activity.is_idle():
+            self.activity.wait_active(IDLE_PROBE_INTERVAL)
+        try:
+            info = self.probe(url)
+        except Exception as e:
+            print(f"探测音频信息失败: {url} ({e})")
+            info = {}
+        with self._lock:
+            self._results[url] = info
+            self._pending.discard(url)
+        if info:
+            callback(url, info)
+
+    def probe(self, url):
+        """
+        探测音频信息
+
+        Args:
+            url: 音频地址
+
+        Returns:
+            dict: 可能包含 size（字节）, format, bitrate（kbps）, duration（秒）
+        """
+        session = self._get_session()
+        info = {}
+
+        head = session.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+        size = int(head.headers.get('Content-Length') or 0) if head.status_code == 200 else 0
+        content_type = head.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type in _CONTENT_TYPES:
+            info['format'] = _CONTENT_TYPES[content_type]
+
+        def read(start, length):
+            """读取 [start, start+length) 的字节，服务器不支持Range时返回None"""
+            requested = time.perf_counter()
+            response = session.get(url, headers={'Range': f'bytes={start}-{start + length - 1}'},
+                                   timeout=REQUEST_TIMEOUT, stream=True)
+            with response:
+                if response.status_code != 206:
+                    return None
+                if not size:
+                    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                    info['size'] = int(total) if total.isdigit() else 0
+                first_byte = time.perf_counter()
+                data = response.raw.read(length, decode_content=True)
+            if self.stream_tuner is not None:
+                self.stream_tuner.record_transfer(url, first_byte - requested, len(data or b''),
+                                                  time.perf_counter() - first_byte)
+            return data
+
+        header = read(0, HEADER_BYTES)
+        if size:
+            info['size'] = size
+        if header:
+            try:
+                info.update(parse_audio_header(header, info.get('size', 0), read))
+            except struct.error:
+                # 文件头损坏时仍保留HEAD请求得到的格式和大小
+                pass
+
+        # 没有文件头中的位速时按文件大小和时长估算
+        if info.get('duration') and info.get('size') and not info.get('bitrate'):
+            info['bitrate'] = int(info['size'] * 8 / info['duration'] / 1000)
+        return info
+
+
+def parse_audio_header(header, size, read):
+    """
+    按文件头识别容器格式并读取时长和位速
+
+    Args:
+        header: 文件开头的字节
+        size: 文件总大小（字节），未知时为0
+        read: 读取函数 read(偏移, 长度)，用于读取文件头以外的数据
+
+    Returns:
+        dict: 可能包含 format, bitrate, duration
+    """
+    if header[:4] == b'OggS':
+        return _parse_ogg(header, size, read)
+    if header[:4] == b'fLaC':
+        return _parse_flac(header)
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return _parse_wav(header)
+    if header[4:8] == b'ftyp':
+        return _parse_mp4(header, size, read)
+    return _parse_mp3(header, size, read)
+
+
+def _parse_mp3(header, size, read):
+    """MP3：跳过ID3v2标签，读取第一帧帧头，有Xing/Info/VBRI头时按帧数计算时长"""
+    if header[:3] == b'ID3' and len(header) >= 10:
+        tag_size = ((header[6] & 0x7f) << 21) | ((header[7] & 0x7f) << 14) | ((header[8] & 0x7f) << 7) | (header[9] & 0x7f)
+        offset = 10 + tag_size + (10 if header[5] & 0x10 else 0)
+        # 标签比已读取的文件头大（如内嵌封面）时，读取标签之后的数据
+        header = header[offset:] if offset + 4 <= len(header) else (read(offset, 4096) or b'')
+        size = max(0, size - offset) if size else 0
+
+    # 查找帧同步
+    position = -1
+    for i in range(min(len(header) - 4, 8192)):
+        if header[i] == 0xff and (header[i + 1] & 0xe0) == 0xe0:
+            version_bits = (header[i + 1] >> 3) & 0x03
+            layer_bits = (header[i + 1] >> 1) & 0x03
+            bitrate_index = header[i + 2] >> 4
+            rate_index = (header[i + 2] >> 2) & 0x03
+            if version_bits != 1 and layer_bits != 0 and 0 < bitrate_index < 15 and rate_index < 3:
+                position = i
+                break
+    if position < 0:
+        return {}
+
+    frame = header[position:]
+    version_bits = (frame[1] >> 3) & 0x03
+    layer = 4 - ((frame[1] >> 1) & 0x03)
+    version = 1 if version_bits == 3 else 2
+    bitrate = _MPEG_BITRATES[(version, layer)][frame[2] >> 4]
+    sample_rate = _MPEG_SAMPLE_RATES[version_bits][(frame[2] >> 2) & 0x03]
+    channel_mode = frame[3] >> 6
+    samples_per_frame = 1152 if layer != 1 else 384
+    if version == 2 and layer == 3:
+        samples_per_frame = 576
+    info = {'format': 'MP3' if layer == 3 else f'MP{layer}', 'bitrate': bitrate}
+
+    # Xing/Info（VBR）头位于边信息之后
+    side_info = (32 if channel_mode != 3 else 17) if version == 1 else (17 if channel_mode != 3 else 9)
+    xing = frame[4 + side_info:4 + side_info + 12]
+    frames = 0
+    if len(xing) == 12 and xing[:4] in (b'Xing', b'Info') and struct.unpack('>I', xing[4:8])[0] & 0x01:
+        frames = struct.unpack('>I', xing[8:12])[0]
+    elif frame[36:40] == b'VBRI' and len(frame) >= 54:
+        frames = struct.unpack('>I', frame[50:54])[0]
+
+    if frames:
+        info['duration'] = int(frames * samples_per_frame / sample_rate)
+        if size:
+            info['bitrate'] = int(size * 8 / info['duration'] / 1000) if info['duration'] else bitrate
+    elif size and bitrate:
+        info['duration'] = int((size - position) * 8 / (bitrate * 1000))
+    return info
+
+
+def _parse_mp4(header, size, read):
+    """MP4/M4A：遍历顶层box找到moov，读取mvhd中的时间刻度和时长"""
+    info = {'format': 'M4A'}
+    offset = 0
+    data, data_offset = header, 0
+    for _ in range(MAX_MP4_BOXES):
+        local = offset - data_offset
+        if local < 0 or local + 8 > len(data):
+            data = read(offset, 8) if (not size or offset + 8 <= size) else None
+            if not data or len(data) < 8:
+                break
+            data_offset, local = offset, 0
+        box_size, box_type = struct.unpack('>I4s', data[local:local + 8])
+        if box_size == 1 and local + 16 <= len(data):
+            box_size = struct.unpack('>Q', data[local + 8:local + 16])[0]
+        if box_type == b'moov':
+            moov = data[local:local + box_size]
+            if len(moov) < min(box_size, 4096):
+                moov = read(offset, min(box_size, HEADER_BYTES)) or b''
+            mvhd = moov.find(b'mvhd')
+            if mvhd >= 4 and mvhd + 36 <= len(moov):
+                version = moov[mvhd + 4]
+                if version == 1:
+                    timescale, duration = struct.unpack('>IQ', moov[mvhd + 24:mvhd + 36])
+                else:
+                    timescale, duration = struct.unpack('>II', moov[mvhd + 16:mvhd + 24])
+                if timescale:
+                    info['duration'] = int(duration / timescale)
+            break
+        if box_size < 8:
+            break
+        offset += box_size
+    return info
+
+
+def _parse_ogg(header, size, read):
+    """OGG：从第一页识别Vorbis/Opus，从最后一页的颗粒位置计算时长"""
+    if b'OpusHead' in header[:512]:
+        info = {'format': 'OPUS'}
+        head = header.find(b'OpusHead')
+        if head + 12 > len(header):
+            return info
+        pre_skip = struct.unpack('<H', header[head + 10:head + 12])[0]
+        sample_rate = 48000
+    else:
+        info = {'format': 'OGG'}
+        head = header.find(b'\x01vorbis')
+        if head < 0 or head + 24 > len(header):
+            return info
+        pre_skip = 0
+        sample_rate = struct.unpack('<I', header[head + 12:head + 16])[0]
+        nominal_bitrate = struct.unpack('<i', header[head + 20:head + 24])[0]
+        if nominal_bitrate > 0:
+            info['bitrate'] = nominal_bitrate // 1000
+
+    # 文件大小未知时无法定位最后一页，文件头中较早页的颗粒位置不是时长
+    if not size:
+        return info
+    tail = read(max(0, size - HEADER_BYTES), HEADER_BYTES) if size > len(header) else header
+    last_page = tail.rfind(b'OggS') if tail else -1
+    if last_page >= 0 and last_page + 14 <= len(tail) and sample_rate:
+        granule = struct.unpack('<q', tail[last_page + 6:last_page + 14])[0]
+        if granule > 0:
+            info['duration'] = int((granule - pre_skip) / sample_rate)
+    return info
+
+
+def _parse_flac(header):
+    """FLAC：读取STREAMINFO中的采样率和总采样数"""
+    info = {'format': 'FLAC'}
+    if len(header) >= 26:
+        packed = struct.unpack('>Q', header[18:26])[0]
+        sample_rate = packed >> 44
+        total_samples = packed & 0xfffffffff
+        if sample_rate and total_samples:
+            info['duration'] = int(total_samples / sample_rate)
+    return info
+
+
+def _parse_wav(header):
+    """WAV：读取fmt块的字节率和data块大小"""
+    info = {'format': 'WAV'}
+    offset = 12
+    byte_rate = 0
+    while offset + 8 <= len(header):
+        chunk_id, chunk_size = struct.unpack('<4sI', header[offset:offset + 8])
+        if chunk_id == b'fmt ' and offset + 20 <= len(header):
+            byte_rate = struct.unpack('<I', header[offset + 16:offset + 20])[0]
+            info['bitrate'] = byte_rate * 8 // 1000
+        elif chunk_id == b'data':
+            if byte_rate:
+                info['duration'] = int(chunk_size / byte_rate)
+            break
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return info
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+帖子内容资源提取模块
+用预编译的正则一次扫描楼层HTML，按文档顺序提取链接、音频和图片，并按地址去重；
+楼层浏览框、播放列表构建器和代码生成对话框共用这里的标签格式
+"""
+
+import html
+import re
+
+# 资源类型
+LINK = 'link'
+AUDIO = 'audio'
+IMAGE = 'image'
+
+# 资源类型的显示名称
+TYPE_LABELS = {LINK: '链接', AUDIO: '音频', IMAGE: '图片'}
+
+# 链接、音频、图片标签（一次扫描，按出现顺序匹配）
+_RESOURCE_TAG = re.compile(
+    r'<a\b([^>]*)>([^<]*)</a>'
+    r'|<audio\b([^>]*)>(?:[^<]*</audio>)?'
+    r'|<img\b([^>]*)>',
+    re.IGNORECASE
+)
+
+# 只查找音频时使用的标签
+_AUDIO_TAG = re.compile(r'<audio\b([^>]*)>', re.IGNORECASE)
+
+# 标签属性 name="value" 或 name='value'（不要求属性顺序）
+_HREF_ATTR = re.compile(r'\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_SRC_ATTR = re.compile(r'\bsrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_TITLE_ATTR = re.compile(r'\btitle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_ALT_ATTR = re.compile(r'\balt\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+# 文本清理
+_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_BLOCK_END = re.compile(r'</(?:p|div|h[1-6]|blockquote|li|tr|td|th)>', re.IGNORECASE)
+_BLOCK_START = re.compile(r'<(?:p|div|h[1-6]|blockquote|li|tr|td|th)\b[^>]*>', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_NEWLINES = re.compile(r'\n+')
+
+# 资源标记占位符（清理完成后替换为“名称【类型】”）
+_PLACEHOLDER = '\x00'
+
+
+def build_audio_tag(src, title):
+    """
+    生成论坛音频代码（代码生成对话框使用，与提取时识别的格式一致）
+
+    Args:
+        src: 音频地址
+        title: 音频名称
+
+    Returns:
+        str: <audio> 标签
+    """
+    return f'<audio controls="controls" src="{src}" title="{title}"> </audio>'
+
+
+def decode_entities(text):
+    """解码HTML实体，不换行空格按普通空格处理"""
+    if '&' not in text:
+        return text
+    return html.unescape(text).replace('\xa0', ' ')
+
+
+def _attr(pattern, attrs):
+    """读取标签属性值（解码实体并去掉首尾空白），没有该属性时返回空字符串"""
+    match = pattern.search(attrs)
+    if match is None:
+        return ''
+    value = match.group(1)
+    if value is None:
+        value = match.group(2)
+    return decode_entities(value).strip()
+
+
+def fallback_name(url, resource_type):
+    """
+    为没有标题的资源生成名称（取地址中的文件名）
+
+    Args:
+        url: 资源地址
+        resource_type: 资源类型
+
+    Returns:
+        str: 资源名称
+    """
+    label = TYPE_LABELS.get(resource_type, resource_type)
+    if not url:
+        return f'未命名{label}'
+    filename = url.split('?')[0].split('#')[0].rstrip('/').rsplit('/', 1)[-1]
+    if not filename:
+        return url
+    if resource_type != LINK and '.' in filename:
+        return filename.split('.')[0] or f'未命名{label}'
+    return filename
+
+
+def _make_resource(resource_type, url, title):
+    """创建资源字典"""
+    name = title or fallback_name(url, resource_type)
+    return {
+        'name': name,
+        'type': resource_type,
+        'url': url,
+        'title': title,
+        'display_name': f"{name}【{TYPE_LABELS[resource_type]}】"
+    }
+
+
+def _match_resource(match):
+    """
+    把资源标签匹配结果转换为资源字典
+
+    Returns:
+        tuple: (资源字典, 替换文本)，标签缺少地址时资源为None
+    """
+    link_attrs, link_text, audio_attrs, image_attrs = match.groups()
+    if link_attrs is not None:
+        url = _attr(_HREF_ATTR, link_attrs)
+        if not url:
+            return None, link_text
+        return _make_resource(LINK, url, decode_entities(link_text.strip())), None
+    if audio_attrs is not None:
+        url = _attr(_SRC_ATTR, audio_attrs)
+        return (_make_resource(AUDIO, url, _attr(_TITLE_ATTR, audio_attrs)) if url else None), ''
+    url = _attr(_SRC_ATTR, image_attrs)
+    return (_make_resource(IMAGE, url, _attr(_ALT_ATTR, image_attrs)) if url else None), ''
+
+
+def extract_resources(html_content, seen=None):
+    """
+    按文档顺序提取链接、音频和图片（同一类型的相同地址只保留第一个）
+
+    Args:
+        html_content: 楼层HTML内容
+        seen: 已提取过的 (类型, 地址) 集合，提取时会加入新资源；为None时只在本次提取中去重
+
+    Returns:
+        list: 资源字典列表 [{'name', 'type', 'url', 'title', 'display_name'}]
+    """
+    if seen is None:
+        seen = set()
+    resources = []
+    if not html_content or '<' not in html_content:
+        return resources
+    for match in _RESOURCE_TAG.finditer(html_content):
+        resource, _ = _match_resource(match)
+        if resource is None:
+            continue
+        key = (resource['type'], resource['url'])
+        if key not in seen:
+            seen.add(key)
+            resources.append(resource)
+    return resources
+
+
+def extract_audio(html_content, seen_urls=None):
+    """
+    按文档顺序提取音频（只扫描 <audio> 标签）
+
+    Args:
+        html_content: 楼层HTML内容
+        seen_urls: 已提取过的音频地址集合，提取时会加入新地址；为None时只在本次提取中去重
+
+    Returns:
+        list: 音频资源字典列表，没有标题时title为空字符串
+    """
+    if seen_urls is None:
+        seen_urls = set()
+    resources = []
+    if not html_content or '<audio' not in html_content.lower():
+        return resources
+    for match in _AUDIO_TAG.finditer(html_content):
+        attrs = match.group(1)
+        url = _attr(_SRC_ATTR, attrs)
+        if not url or url in seen_urls:
+            continue
+        seen_urls.add(url)
+        resources.append(_make_resource(AUDIO, url, _attr(_TITLE_ATTR, attrs)))
+    return resources
+
+
+def parse_content(html_content):
+    """
+    把楼层HTML转换为纯文本，资源替换为“名称【类型】”标记
+
+    Args:
+        html_content: 楼层HTML内容
+
+    Returns:
+        tuple: (清理后的文本, 去重后的资源列表, {标记在文本中的位置: 资源})
+    """
+    if not html_content:
+        return '', [], {}
+
+    text = _BR.sub('\n', html_content)
+    text = _BLOCK_END.sub('\n', text)
+    text = _BLOCK_START.sub('', text)
+
+    resources = []
+    by_key = {}
+    occurrences = []  # 按出现顺序的资源，包含重复出现的资源
+
+    def replace(match):
+        resource, replacement = _match_resource(match)
+        if resource is None:
+            return replacement
+        key = (resource['type'], resource['url'])
+        if key in by_key:
+            # 同一资源再次出现时沿用第一次的名称，列表中只保留一项
+            resource = by_key[key]
+        else:
+            by_key[key] = resource
+            resources.append(resource)
+        occurrences.append(resource)
+        # 先用占位符代替标记，避免名称中的尖括号和实体被后续清理改动
+        return _PLACEHOLDER
+
+    text = _RESOURCE_TAG.sub(replace, text.replace(_PLACEHOLDER, ''))
+    text = _TAG.sub('', text)
+    text = decode_entities(text)
+    text = _NEWLINES.sub('\n', text).strip()
+
+    # 把占位符替换为标记，同时记录每个标记在最终文本中的位置
+    resource_map = {}
+    if not occurrences:
+        return text, resources, resource_map
+    pieces = text.split(_PLACEHOLDER)
+    parts = []
+    length = 0
+    for resource, part in zip(occurrences, pieces):
+        parts.append(part)
+        length += len(part)
+        resource_map[length] = resource
+        parts.append(resource['display_name'])
+        length += len(resource['display_name'])
+    parts.append(pieces[-1])
+    return ''.join(parts), resources, resource_map
@@ -5,10 +5,12 @@
 """
 
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
+import threading
+
+# 进程内已派生的加密器 {密码: Fernet}，同一密码只执行一次PBKDF2
+_cipher_cache = {}
+_cipher_cache_lock = threading.Lock()
 
 class CryptoManager:
     """加密管理器"""
@@ -25,10 +27,40 @@ class CryptoManager:
             password = "forum_assistant_2025_secret_key"
 
         self.password = password.encode()
-        self._generate_key()
+        # 密钥在第一次加密或解密时才派生，避免启动时加载cryptography并执行PBKDF2
+        self._cipher = None
+
+    @property
+    def cipher(self):
+        """获取Fernet加密器（首次访问时生成密钥，同一进程内只生成一次）"""
+        if self._cipher is None:
+            with _cipher_cache_lock:
+                cipher = _cipher_cache.get(self.password)
+                if cipher is None:
+                    self._generate_key()
+                    _cipher_cache[self.password] = self._cipher
+                else:
+                    self._cipher = cipher
+        return self._cipher
+
+    def prewarm(self):
+        """在后台线程中提前生成密钥，使之后的加密解密不必在界面线程中等待PBKDF2"""
+        if self._cipher is None:
+            threading.Thread(target=self._prewarm, name="CryptoPrewarm", daemon=True).start()
+
+    def _prewarm(self):
+        """后台生成密钥（失败时等到真正使用时再报告）"""
+        try:
+            self.cipher
+        except Exception:
+            pass
 
     def _generate_key(self):
         """生成加密密钥"""
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
         # 使用PBKDF2派生密钥
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
@@ -37,7 +69,7 @@ class CryptoManager:
             iterations=100000,
         )
         key = base64.urlsafe_b64encode(kdf.derive(self.password))
-        self.cipher = Fernet(key)
+        self._cipher = Fernet(key)
 
     def encrypt(self, data):
         """
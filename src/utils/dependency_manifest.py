@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+依赖清单模块
+在下载或打包时记录各组件的版本、文件数量和目录指纹，启动时只比对指纹，指纹变化时才重新扫描
+"""
+
+import hashlib
+import json
+import os
+import time
+
+# 清单文件名
+MANIFEST_FILE = 'manifest.json'
+
+# 清单格式版本，格式变化时旧清单自动失效
+MANIFEST_VERSION = 1
+
+# VLC核心库文件
+VLC_CORE_FILES = ('libvlc.dll', 'libvlccore.dll')
+
+# 认为VLC插件完整所需的最少插件数
+VLC_MIN_PLUGINS = 10
+
+# 打包环境中的组件及其必需文件 {组件名: (子目录, 必需文件列表)}
+PACKAGED_COMPONENTS = {
+    'python_runtime': ('python', ['python311.dll', 'python311.zip']),
+    'python_libs': ('libraries', ['wx', 'requests', 'vlc', 'src']),
+    'vlc': ('vlc', ['vlc.exe', 'libvlc.dll', 'libvlccore.dll']),
+    'config': ('config', [])
+}
+
+
+def compute_fingerprint(files=(), dirs=(), trees=()):
+    """
+    计算目录指纹，只读取少量元数据，不遍历文件
+
+    增删文件会改变所在目录的修改时间，因此比对目录的修改时间即可发现组件变化
+
+    Args:
+        files: 需要记录修改时间和大小的文件路径
+        dirs: 需要记录修改时间的目录路径
+        trees: 需要记录自身及其直接子目录修改时间的目录路径
+
+    Returns:
+        str: 指纹字符串
+    """
+    digest = hashlib.sha1()
+
+    def add(path, with_size=False):
+        try:
+            stat = os.stat(path)
+            value = f"{stat.st_mtime_ns}:{stat.st_size}" if with_size else str(stat.st_mtime_ns)
+        except OSError:
+            value = "missing"
+        digest.update(f"{path}={value};".encode('utf-8', 'surrogateescape'))
+
+    for path in files:
+        add(path, with_size=True)
+    for path in dirs:
+        add(path)
+    for path in trees:
+        add(path)
+        try:
+            children = sorted(entry.path for entry in os.scandir(path) if entry.is_dir())
+        except OSError:
+            children = []
+        for child in children:
+            add(child)
+
+    return digest.hexdigest()
+
+
+def load_manifest(path):
+    """
+    读取清单文件
+
+    Args:
+        path: 清单文件路径
+
+    Returns:
+        dict: 清单内容，文件不存在、损坏或格式版本不符时返回None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('manifest_version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(path, manifest):
+    """
+    写入清单文件（先写临时文件再替换，目录只读时静默失败）
+
+    Args:
+        path: 清单文件路径
+        manifest: 清单内容
+
+    Returns:
+        bool: 是否写入成功
+    """
+    manifest = dict(manifest, manifest_version=MANIFEST_VERSION,
+                    generated_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+# ========== VLC组件（开发环境的 vlc 目录） ==========
+
+def vlc_fingerprint(vlc_dir):
+    """计算VLC组件目录的指纹（核心库文件和插件目录树）"""
+    return compute_fingerprint(
+        files=[os.path.join(vlc_dir, name) for name in VLC_CORE_FILES],
+        trees=[os.path.join(vlc_dir, 'plugins')]
+    )
+
+
+def scan_vlc(vlc_dir):
+    """
+    完整扫描VLC组件目录
+
+    Args:
+        vlc_dir: VLC组件目录
+
+    Returns:
+        dict: {'core_files': {文件名: 大小}, 'plugin_count': 插件数, 'available': 是否可用}
+    """
+    core_files = {}
+    for name in VLC_CORE_FILES:
+        path = os.path.join(vlc_dir, name)
+        if os.path.isfile(path):
+            core_files[name] = os.path.getsize(path)
+
+    plugin_count = 0
+    for _, _, filenames in os.walk(os.path.join(vlc_dir, 'plugins')):
+        plugin_count += sum(1 for name in filenames if name.lower().endswith('.dll'))
+
+    return {
+        'core_files': core_files,
+        'plugin_count': plugin_count,
+        'available': len(core_files) == len(VLC_CORE_FILES) and plugin_count > VLC_MIN_PLUGINS
+    }
+
+
+def write_vlc_manifest(vlc_dir, version=None):
+    """
+    扫描VLC组件目录并写入清单（下载组件后或指纹变化时调用）
+
+    Args:
+        vlc_dir: VLC组件目录
+        version: VLC版本号，为None时沿用旧清单中的版本
+
+    Returns:
+        dict: 清单内容
+    """
+    manifest_path = os.path.join(vlc_dir, MANIFEST_FILE)
+    if version is None:
+        old_manifest = load_manifest(manifest_path) or {}
+        version = old_manifest.get('vlc', {}).get('version')
+
+    manifest = {
+        'fingerprint': vlc_fingerprint(vlc_dir),
+        'vlc': dict(scan_vlc(vlc_dir), version=version)
+    }
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+def check_vlc(vlc_dir):
+    """
+    检查VLC组件是否可用，指纹与清单一致时直接使用清单结果
+
+    Args:
+        vlc_dir: VLC组件目录
+
+    Returns:
+        bool: VLC组件是否可用
+    """
+    if not os.path.isdir(vlc_dir):
+        return False
+    manifest = load_manifest(os.path.join(vlc_dir, MANIFEST_FILE))
+    if manifest is None or manifest.get('fingerprint') != vlc_fingerprint(vlc_dir):
+        manifest = write_vlc_manifest(vlc_dir)
+    return bool(manifest.get('vlc', {}).get('available'))
+
+
+# ========== 打包环境（dependencies 目录） ==========
+
+def dependencies_fingerprint(dep_dir):
+    """计算打包依赖目录的指纹（各组件目录和VLC插件目录树）"""
+    return compute_fingerprint(
+        dirs=[os.path.join(dep_dir, subdir) for subdir, _ in PACKAGED_COMPONENTS.values()],
+        trees=[os.path.join(dep_dir, 'vlc', 'plugins')]
+    )
+
+
+def scan_dependencies(dep_dir):
+    """
+    完整扫描打包依赖目录
+
+    Args:
+        dep_dir: dependencies目录
+
+    Returns:
+        dict: {'status': {组件名: 是否完整}, 'file_counts': {组件名: 文件数}}
+    """
+    status = {}
+    file_counts = {}
+    for name, (subdir, required_files) in PACKAGED_COMPONENTS.items():
+        comp_dir = os.path.join(dep_dir, subdir)
+        if not os.path.isdir(comp_dir):
+            status[name] = False
+            file_counts[name] = 0
+            continue
+        status[name] = all(os.path.exists(os.path.join(comp_dir, f)) for f in required_files)
+        file_counts[name] = sum(len(filenames) for _, _, filenames in os.walk(comp_dir))
+
+    # VLC还需要插件完整
+    if status.get('vlc'):
+        status['vlc'] = scan_vlc(os.path.join(dep_dir, 'vlc'))['available']
+
+    return {'status': status, 'file_counts': file_counts}
+
+
+def write_dependencies_manifest(dep_dir, versions=None):
+    """
+    扫描打包依赖目录并写入清单（打包时或指纹变化时调用）
+
+    Args:
+        dep_dir: dependencies目录
+        versions: 组件版本 {组件名: 版本号}，为None时沿用旧清单中的版本
+
+    Returns:
+        dict: 清单内容
+    """
+    manifest_path = os.path.join(dep_dir, MANIFEST_FILE)
+    if versions is None:
+        old_manifest = load_manifest(manifest_path) or {}
+        versions = old_manifest.get('versions', {})
+
+    manifest = dict(scan_dependencies(dep_dir), fingerprint=dependencies_fingerprint(dep_dir), versions=versions)
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+def check_dependencies(dep_dir):
+    """
+    检查打包依赖的完整性，指纹与清单一致时直接使用清单结果
+
+    Args:
+        dep_dir: dependencies目录
+
+    Returns:
+        dict: {组件名: 是否完整}
+    """
+    manifest = load_manifest(os.path.join(dep_dir, MANIFEST_FILE))
+    if manifest is None or manifest.get('fingerprint') != dependencies_fingerprint(dep_dir):
+        manifest = write_dependencies_manifest(dep_dir)
+    return dict(manifest.get('status', {}))
@@ -5,9 +5,21 @@ HTML解析工具模块
 """
 
 import re
-from bs4 import BeautifulSoup
 import html
 
+def _make_soup(html_content):
+    """
+    创建BeautifulSoup对象（首次使用时才导入bs4）
+
+    Args:
+        html_content: HTML内容
+
+    Returns:
+        BeautifulSoup对象
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html_content, 'html.parser')
+
 class HTMLParser:
     """HTML解析器"""
 
@@ -28,7 +40,7 @@ class HTMLParser:
             return ""
 
         # 创建BeautifulSoup对象
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = _make_soup(html_content)
 
         # 移除不需要的标签
         for tag in soup(['script', 'style', 'link', 'meta']):
@@ -74,7 +86,7 @@ class HTMLParser:
         if not html_content:
             return []
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = _make_soup(html_content)
         messages = []
 
         # 解析消息列表项
@@ -107,7 +119,7 @@ class HTMLParser:
         if not html_content:
             return []
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = _make_soup(html_content)
         messages = []
 
         # 解析对话内容
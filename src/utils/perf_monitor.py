@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+性能监测模块
+记录每个接口的耗时、数据量和错误次数，以及每次导航各阶段的耗时
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+# 导航阶段（按发生顺序）
+NAVIGATION_STAGES = ('request', 'decode', 'parse', 'render', 'focus')
+
+# 导航阶段的中文名称
+STAGE_NAMES = {
+    'request': '网络请求',
+    'decode': 'JSON解码',
+    'parse': '解析清理',
+    'render': '列表渲染',
+    'focus': '焦点恢复'
+}
+
+# 耗时直方图的分桶上界（毫秒）
+HISTOGRAM_BOUNDS_MS = (50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def _percentile(sorted_values, percent):
+    """
+    计算已排序样本的百分位数（最近秩法）
+
+    Args:
+        sorted_values: 已排序的样本列表
+        percent: 百分位（0-100）
+
+    Returns:
+        float: 百分位数，没有样本时返回0
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100.0 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class EndpointStats:
+    """单个接口的统计数据"""
+
+    def __init__(self, max_samples):
+        """
+        初始化接口统计
+
+        Args:
+            max_samples: 环形缓冲区保留的最大耗时样本数
+        """
+        self.latencies = deque(maxlen=max_samples)  # 耗时样本（毫秒）
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)  # 最后一个桶为超出上界的请求
+
+    def add_sample(self, elapsed_ms):
+        """
+        记录一个耗时样本
+
+        Args:
+            elapsed_ms: 耗时（毫秒）
+        """
+        self.latencies.append(elapsed_ms)
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+    def to_dict(self):
+        """转换为可导出的字典"""
+        samples = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_received': self.bytes_received,
+            'p50_ms': round(_percentile(samples, 50), 1),
+            'p95_ms': round(_percentile(samples, 95), 1),
+            'max_ms': round(samples[-1], 1) if samples else 0.0,
+            'samples': len(samples),
+            'histogram': {
+                **{f'<={bound}ms': count for bound, count in zip(HISTOGRAM_BOUNDS_MS, self.histogram)},
+                f'>{HISTOGRAM_BOUNDS_MS[-1]}ms': self.histogram[-1]
+            }
+        }
+
+
+class PerfMonitor:
+    """性能监测器"""
+
+    def __init__(self, max_samples=200, max_navigations=50):
+        """
+        初始化性能监测器
+
+        Args:
+            max_samples: 每个接口保留的耗时样本数
+            max_navigations: 保留的最近导航记录数
+        """
+        self.max_samples = max_samples
+        self.endpoints = {}  # {endpoint: EndpointStats}
+        self.navigations = deque(maxlen=max_navigations)
+        self.current_navigation = None
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, elapsed, size=0, error=False):
+        """
+        记录一次接口请求
+
+        Args:
+            endpoint: 接口名称（如 forum-index.htm）
+            elapsed: 耗时（秒）
+            size: 接收的字节数
+            error: 是否出错
+        """
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = EndpointStats(self.max_samples)
+                self.endpoints[endpoint] = stats
+            stats.requests += 1
+            stats.bytes_received += size
+            stats.add_sample(elapsed * 1000.0)
+            if error:
+                stats.errors += 1
+
+            navigation = self._own_navigation()
+            if navigation is not None:
+                navigation['requests'] += 1
+                navigation['bytes'] += size
+                navigation['endpoints'].append(endpoint)
+
+        self.add_stage('request', elapsed)
+
+    def begin_navigation(self, label):
+        """
+        开始记录一次导航，上一次未结束的导航会被自动结束
+
+        Args:
+            label: 导航名称（如 最新发表、帖子详情）
+        """
+        self.end_navigation()
+        with self._lock:
+            self.current_navigation = {
+                'label': label,
+                'thread': threading.get_ident(),  # 开始导航的线程，只统计该线程中的请求和阶段
+                'started': time.time(),
+                'start_counter': time.perf_counter(),
+                'stages': dict.fromkeys(NAVIGATION_STAGES, 0.0),
+                'requests': 0,
+                'bytes': 0,
+                'endpoints': []
+            }
+
+    def has_fresh_navigation(self):
+        """
+        检查是否存在尚未发出任何请求的导航记录
+
+        Returns:
+            bool: 当前导航存在且还没有请求时返回True
+        """
+        navigation = self.current_navigation
+        return navigation is not None and navigation['requests'] == 0
+
+    def end_navigation(self):
+        """结束当前导航并存入最近导航记录"""
+        with self._lock:
+            navigation = self.current_navigation
+            if navigation is None:
+                return
+            self.current_navigation = None
+            navigation['total'] = time.perf_counter() - navigation.pop('start_counter')
+            navigation.pop('thread', None)
+            self.navigations.append(navigation)
+
+    def add_stage(self, stage, elapsed):
+        """
+        为当前导航累加某个阶段的耗时
+
+        Args:
+            stage: 阶段名称，见 NAVIGATION_STAGES
+            elapsed: 耗时（秒）
+        """
+        with self._lock:
+            navigation = self._own_navigation()
+            if navigation is not None:
+                navigation['stages'][stage] = navigation['stages'].get(stage, 0.0) + elapsed
+
+    def _own_navigation(self):
+        """
+        获取由当前线程开始的导航（调用方持有锁）
+
+        后台线程（播放列表构建、预登录等）的请求不属于界面上正在进行的导航
+
+        Returns:
+            dict: 导航记录，当前线程没有进行中的导航时返回None
+        """
+        navigation = self.current_navigation
+        if navigation is None or navigation['thread'] != threading.get_ident():
+            return None
+        return navigation
+
+    def stage(self, stage, exclude=()):
+        """
+        返回计时上下文，用法: with monitor.stage('render'): ...
+
+        Args:
+            stage: 阶段名称
+            exclude: 需要从本阶段扣除的嵌套阶段（如渲染过程中的解析耗时）
+
+        Returns:
+            _StageTimer: 计时上下文
+        """
+        return _StageTimer(self, stage, exclude)
+
+    def _stage_total(self, stages):
+        """获取当前线程的导航中若干阶段的累计耗时"""
+        if not stages:
+            return 0.0
+        with self._lock:
+            navigation = self._own_navigation()
+            if navigation is None:
+                return 0.0
+            return sum(navigation['stages'].get(stage, 0.0) for stage in stages)
+
+    def get_endpoint_summary(self):
+        """
+        获取各接口的统计摘要
+
+        Returns:
+            dict: {endpoint: 统计字典}
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.endpoints.items()}
+
+    def get_recent_navigations(self):
+        """
+        获取最近的导航记录（最新的在前）
+
+        Returns:
+            list: 导航记录列表，耗时单位为毫秒
+        """
+        with self._lock:
+            navigations = list(self.navigations)
+
+        result = []
+        for navigation in reversed(navigations):
+            result.append({
+                'label': navigation['label'],
+                'started': time.strftime('%H:%M:%S', time.localtime(navigation['started'])),
+                'total_ms': round(navigation['total'] * 1000.0, 1),
+                'stages_ms': {k: round(v * 1000.0, 1) for k, v in navigation['stages'].items()},
+                'requests': navigation['requests'],
+                'bytes': navigation['bytes'],
+                'endpoints': list(navigation['endpoints'])
+            })
+        return result
+
+    def export(self):
+        """
+        导出全部统计数据
+
+        Returns:
+            dict: 可直接序列化为JSON的统计数据
+        """
+        return {
+            'exported_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'endpoints': self.get_endpoint_summary(),
+            'navigations': self.get_recent_navigations()
+        }
+
+    def reset(self):
+        """清空所有统计数据"""
+        with self._lock:
+            self.endpoints.clear()
+            self.navigations.clear()
+            self.current_navigation = None
+
+
+class _StageTimer:
+    """阶段计时上下文"""
+
+    __slots__ = ('monitor', 'stage', 'exclude', 'start', 'excluded_start')
+
+    def __init__(self, monitor, stage, exclude=()):
+        self.monitor = monitor
+        self.stage = stage
+        self.exclude = exclude
+        self.start = 0.0
+        self.excluded_start = 0.0
+
+    def __enter__(self):
+        self.excluded_start = self.monitor._stage_total(self.exclude)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        nested = self.monitor._stage_total(self.exclude) - self.excluded_start
+        self.monitor.add_stage(self.stage, max(0.0, elapsed - nested))
+        return False
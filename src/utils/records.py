@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+列表记录模块
+帖子、回复和列表行使用 __slots__ 记录类保存，由接口数据创建一次后在列表数据和返回状态之间按引用共享；
+记录类提供与字典相同的 get / [] / in 访问方式，原有按键读取列表数据的代码无需修改
+"""
+
+
+class Record:
+    """列表记录基类"""
+
+    __slots__ = ('list_number',)
+
+    # 行类型，对应原列表数据中的 'type'
+    type = None
+
+    # 除槽位外可按键访问的属性 {键名: 属性名}
+    _aliases = {}
+
+    # 可写入的槽位名和可读取的键名（由子类定义时计算）
+    _slot_names = frozenset(('list_number',))
+    _keys = frozenset(('type', 'list_number'))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        slot_names = set()
+        for klass in cls.__mro__:
+            slot_names.update(klass.__dict__.get('__slots__', ()))
+        cls._slot_names = frozenset(slot_names)
+        cls._keys = frozenset(slot_names | set(cls._aliases) | {'type'})
+
+    def _attr(self, key):
+        """把键名转换为属性名，未知键返回None"""
+        if key not in self._keys:
+            return None
+        return self._aliases.get(key, key)
+
+    def get(self, key, default=None):
+        """
+        按键读取字段，与 dict.get 相同
+
+        Args:
+            key: 字段名
+            default: 字段不存在或未设置时返回的默认值
+
+        Returns:
+            字段值
+        """
+        attr = self._attr(key)
+        if attr is None:
+            return default
+        return getattr(self, attr, default)
+
+    def __getitem__(self, key):
+        attr = self._attr(key)
+        if attr is None:
+            raise KeyError(key)
+        try:
+            return getattr(self, attr)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self._slot_names:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        attr = self._attr(key)
+        return attr is not None and hasattr(self, attr)
+
+    def pop(self, key, default=None):
+        """
+        删除并返回字段值，与 dict.pop 相同（只能删除槽位字段）
+
+        Args:
+            key: 字段名
+            default: 字段未设置时返回的默认值
+
+        Returns:
+            字段原值
+        """
+        if key not in self._slot_names or not hasattr(self, key):
+            return default
+        value = getattr(self, key)
+        delattr(self, key)
+        return value
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in sorted(self._slot_names)
+                           if hasattr(self, name))
+        return f"{self.__class__.__name__}({fields})"
+
+
+class Thread(Record):
+    """主题帖（帖子列表中的一行）"""
+
+    __slots__ = ('tid', 'fid', 'subject', 'username', 'views', 'forumname', 'dateline_fmt',
+                 'posts', 'lastpost_fmt', 'lastusername')
+    type = 'thread'
+
+    def __init__(self, tid=0, fid=None, subject='', username='', views=0, forumname='', dateline_fmt='',
+                 posts=0, lastpost_fmt='', lastusername=''):
+        self.tid = tid
+        self.fid = fid
+        self.subject = subject
+        self.username = username
+        self.views = views
+        self.forumname = forumname
+        self.dateline_fmt = dateline_fmt
+        self.posts = posts
+        self.lastpost_fmt = lastpost_fmt
+        self.lastusername = lastusername
+
+    @classmethod
+    def from_api(cls, thread, clean_subject=None):
+        """
+        由接口返回的主题数据创建记录
+
+        Args:
+            thread: 接口返回的主题字典
+            clean_subject: 清理标题HTML标签的函数，为None时保留原标题
+
+        Returns:
+            Thread: 主题记录
+        """
+        subject = thread.get('subject', '')
+        if clean_subject is not None:
+            subject = clean_subject(subject)
+        return cls(
+            tid=thread.get('tid', 0),
+            fid=thread.get('fid'),
+            subject=subject,
+            username=thread.get('username', ''),
+            views=thread.get('views', 0),
+            forumname=thread.get('forumname', ''),
+            dateline_fmt=thread.get('dateline_fmt', ''),
+            posts=thread.get('posts', 0),
+            lastpost_fmt=thread.get('lastpost_fmt', ''),
+            lastusername=thread.get('lastusername', '')
+        )
+
+
+class Post(Record):
+    """回复（帖子详情中的一个楼层）"""
+
+    __slots__ = ('pid', 'tid', 'fid', 'uid', 'username', 'subject', 'message', 'dateline_fmt',
+                 'floor', 'index', 'extra')
+    type = 'post'
+
+    # 原列表数据中 'post_data' / 'data' 保存的是回复本身，'floor_index' 是楼层索引
+    _aliases = {'post_data': '_self', 'data': '_self', 'floor_index': 'index'}
+
+    # 由槽位保存的接口字段，其余字段保存在 extra 中
+    _API_FIELDS = ('pid', 'tid', 'fid', 'uid', 'username', 'subject', 'message', 'dateline_fmt', 'floor')
+
+    def __init__(self, pid=None, tid=None, fid=None, uid=None, username='', subject='', message='',
+                 dateline_fmt='', floor=1, index=0, extra=None):
+        self.pid = pid
+        self.tid = tid
+        self.fid = fid
+        self.uid = uid
+        self.username = username
+        self.subject = subject
+        self.message = message
+        self.dateline_fmt = dateline_fmt
+        self.floor = floor
+        self.index = index
+        self.extra = extra
+
+    @property
+    def _self(self):
+        return self
+
+    @classmethod
+    def from_api(cls, post, index=0, floor=None):
+        """
+        由接口返回的回复数据创建记录
+
+        Args:
+            post: 接口返回的回复字典
+            index: 在当前页中的索引（从0开始）
+            floor: 实际楼层号，为None时使用接口数据中的楼层号
+
+        Returns:
+            Post: 回复记录
+        """
+        extra = {key: value for key, value in post.items() if key not in cls._API_FIELDS}
+        return cls(
+            pid=post.get('pid'),
+            tid=post.get('tid'),
+            fid=post.get('fid'),
+            uid=post.get('uid'),
+            username=post.get('username', ''),
+            subject=post.get('subject', ''),
+            message=post.get('message', ''),
+            dateline_fmt=post.get('dateline_fmt', ''),
+            floor=post.get('floor', 1) if floor is None else floor,
+            index=index,
+            extra=extra or None
+        )
+
+    def get(self, key, default=None):
+        """按键读取字段，接口数据中的其他字段（如 authorid、typeid1）从 extra 中读取"""
+        if key in self._keys:
+            return super().get(key, default)
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        if key not in self._keys and self.extra and key in self.extra:
+            return self.extra[key]
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or bool(self.extra and key in self.extra)
+
+
+class PaginationRow(Record):
+    """分页控制行（上一页、下一页、跳转、回复帖子）"""
+
+    __slots__ = ('action', 'page', 'current_page', 'total_page')
+    type = 'pagination'
+
+    def __init__(self, action, page=None, current_page=None, total_page=None):
+        self.action = action
+        if page is not None:
+            self.page = page
+        if current_page is not None:
+            self.current_page = current_page
+        if total_page is not None:
+            self.total_page = total_page
+
+
+class MessageRow(Record):
+    """消息列表行（与一位用户的会话）"""
+
+    __slots__ = ('touid', 'message_data')
+    type = 'message'
+
+    def __init__(self, touid, message_data):
+        self.touid = touid
+        self.message_data = message_data
+
+
+class ConversationRow(Record):
+    """消息对话行（会话中的一条消息）"""
+
+    __slots__ = ('message_data',)
+    type = 'conversation'
+
+    def __init__(self, message_data):
+        self.message_data = message_data
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+软件设置模块
+启动时从配置文件读取一次设置并转换为对应类型，之后通过属性访问；修改设置时通知订阅者
+"""
+
+import threading
+
+# 设置项定义 {设置名: (类型, 默认值)}
+SETTING_FIELDS = {
+    'show_list_numbers': (bool, False),
+    'stall_threshold_ms': (int, 200),
+    'audio_cache_enabled': (bool, False),
+    'audio_cache_mb': (int, 512)
+}
+
+
+def _parse_value(value_type, text, default):
+    """
+    把配置文件中的字符串转换为设置项的类型
+
+    Args:
+        value_type: 设置项类型
+        text: 配置文件中的字符串，为None时使用默认值
+        default: 默认值
+
+    Returns:
+        转换后的值，无法转换时返回默认值
+    """
+    if text is None:
+        return default
+    if value_type is bool:
+        return text.strip().lower() == 'true'
+    try:
+        return value_type(text)
+    except (TypeError, ValueError):
+        return default
+
+
+class Settings:
+    """软件设置快照"""
+
+    def __init__(self, config_manager):
+        """
+        初始化设置快照，从配置管理器读取所有设置项
+
+        Args:
+            config_manager: 配置管理器实例，修改设置时写回其中
+        """
+        self._config_manager = config_manager
+        self._observers = []
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """从配置管理器重新读取所有设置项"""
+        for name, (value_type, default) in SETTING_FIELDS.items():
+            text = self._config_manager.get_setting(name)
+            setattr(self, name, _parse_value(value_type, text, default))
+
+    def update(self, **changes):
+        """
+        修改设置，写回配置文件并通知订阅者（只通知真正变化的设置项）
+
+        Args:
+            **changes: 设置名=新值
+
+        Returns:
+            dict: 真正变化的设置项 {设置名: 新值}
+        """
+        changed = {}
+        for name, value in changes.items():
+            if name not in SETTING_FIELDS:
+                raise KeyError(f"未知的设置项: {name}")
+            value = SETTING_FIELDS[name][0](value)
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self._config_manager.set_setting(name, value)
+                changed[name] = value
+
+        if changed:
+            with self._lock:
+                observers = list(self._observers)
+            for callback in observers:
+                callback(changed)
+        return changed
+
+    def subscribe(self, callback):
+        """
+        订阅设置变化
+
+        Args:
+            callback: 回调函数，参数为变化的设置项字典 {设置名: 新值}
+        """
+        with self._lock:
+            if callback not in self._observers:
+                self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        取消订阅设置变化
+
+        Args:
+            callback: 订阅时传入的回调函数
+        """
+        with self._lock:
+            if callback in self._observers:
+                self._observers.remove(callback)
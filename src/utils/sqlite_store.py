@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite配置存储模块
+以SQLite数据库（WAL模式）保存论坛账户、软件设置和按账户保存的状态，每次修改只更新对应的行
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+# 数据库结构版本
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS forums (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    forum_id INTEGER NOT NULL REFERENCES forums(id) ON DELETE CASCADE,
+    username TEXT NOT NULL,
+    nickname TEXT NOT NULL DEFAULT '',
+    encrypted_password TEXT NOT NULL DEFAULT '',
+    UNIQUE (forum_id, username)
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS account_state (
+    account_id INTEGER NOT NULL REFERENCES accounts(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (account_id, key)
+);
+"""
+
+
+class SQLiteStore:
+    """SQLite配置存储"""
+
+    def __init__(self, db_file):
+        """
+        打开（必要时创建）配置数据库
+
+        Args:
+            db_file: 数据库文件路径
+        """
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+                )
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        """执行查询并返回所有行"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql, params=()):
+        """在事务中执行一条修改语句，返回受影响的行数"""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    # ========== 元数据 ==========
+
+    def get_meta(self, key):
+        """获取元数据，不存在时返回None"""
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]['value'] if rows else None
+
+    def set_meta(self, key, value):
+        """设置元数据"""
+        self._execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # ========== 论坛账户 ==========
+
+    def list_accounts(self):
+        """
+        获取所有账户（按论坛和添加顺序排列）
+
+        Returns:
+            list: 账户字典列表，包含name, url, username, encrypted_password, nickname
+        """
+        rows = self._query(
+            "SELECT f.name, f.url, a.username, a.encrypted_password, a.nickname "
+            "FROM accounts a JOIN forums f ON f.id = a.forum_id ORDER BY f.id, a.id"
+        )
+        return [dict(row) for row in rows]
+
+    def get_forum_usernames(self, forum_name):
+        """获取论坛下所有账户的用户名"""
+        rows = self._query(
+            "SELECT a.username FROM accounts a JOIN forums f ON f.id = a.forum_id "
+            "WHERE f.name = ? ORDER BY a.id", (forum_name,)
+        )
+        return [row['username'] for row in rows]
+
+    def account_exists(self, forum_name, username):
+        """检查账户是否存在"""
+        return self._account_id(forum_name, username) is not None
+
+    def _account_id(self, forum_name, username):
+        """获取账户ID，不存在时返回None"""
+        rows = self._query(
+            "SELECT a.id FROM accounts a JOIN forums f ON f.id = a.forum_id "
+            "WHERE f.name = ? AND a.username = ?", (forum_name, username)
+        )
+        return rows[0]['id'] if rows else None
+
+    def add_account(self, forum_name, url, username, nickname, encrypted_password=''):
+        """
+        添加账户（论坛不存在时一并创建）
+
+        Returns:
+            bool: 是否添加成功，账户已存在时返回False
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO forums (name, url) VALUES (?, ?)", (forum_name, url))
+            forum_id = self._conn.execute("SELECT id FROM forums WHERE name = ?", (forum_name,)).fetchone()['id']
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO accounts (forum_id, username, nickname, encrypted_password) "
+                "VALUES (?, ?, ?, ?)", (forum_id, username, nickname, encrypted_password)
+            )
+            return cursor.rowcount > 0
+
+    def update_account(self, forum_name, old_username, username, nickname, encrypted_password=None):
+        """
+        更新账户信息
+
+        Args:
+            encrypted_password: 新的加密密码，为None时保留原密码
+
+        Returns:
+            bool: 是否更新成功，账户不存在或新用户名已被占用时返回False
+        """
+        account_id = self._account_id(forum_name, old_username)
+        if account_id is None:
+            return False
+        try:
+            if encrypted_password is None:
+                self._execute("UPDATE accounts SET username = ?, nickname = ? WHERE id = ?",
+                              (username, nickname, account_id))
+            else:
+                self._execute("UPDATE accounts SET username = ?, nickname = ?, encrypted_password = ? WHERE id = ?",
+                              (username, nickname, encrypted_password, account_id))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def delete_account(self, forum_name, username):
+        """
+        删除账户，论坛下没有账户时一并删除论坛
+
+        Returns:
+            bool: 是否删除成功
+        """
+        account_id = self._account_id(forum_name, username)
+        if account_id is None:
+            return False
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
+            self._conn.execute(
+                "DELETE FROM forums WHERE name = ? AND NOT EXISTS "
+                "(SELECT 1 FROM accounts a WHERE a.forum_id = forums.id)", (forum_name,)
+            )
+        return True
+
+    def get_forum(self, forum_name):
+        """获取论坛信息，不存在时返回None"""
+        rows = self._query("SELECT url FROM forums WHERE name = ?", (forum_name,))
+        return {'url': rows[0]['url']} if rows else None
+
+    def delete_forum(self, forum_name):
+        """删除论坛及其所有账户"""
+        return self._execute("DELETE FROM forums WHERE name = ?", (forum_name,)) > 0
+
+    # ========== 软件设置 ==========
+
+    def get_setting(self, key, default_value=None):
+        """获取设置项，不存在时返回默认值"""
+        rows = self._query("SELECT value FROM settings WHERE key = ?", (key,))
+        return rows[0]['value'] if rows else default_value
+
+    def set_setting(self, key, value):
+        """设置设置项"""
+        self._execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # ========== 账户状态 ==========
+
+    def get_account_state(self, forum_name, username, key, default_value=None):
+        """
+        获取按账户保存的状态（如阅读位置、关注的帖子）
+
+        Returns:
+            反序列化后的状态值，不存在时返回默认值
+        """
+        rows = self._query(
+            "SELECT s.value FROM account_state s JOIN accounts a ON a.id = s.account_id "
+            "JOIN forums f ON f.id = a.forum_id WHERE f.name = ? AND a.username = ? AND s.key = ?",
+            (forum_name, username, key)
+        )
+        return json.loads(rows[0]['value']) if rows else default_value
+
+    def set_account_state(self, forum_name, username, key, value):
+        """
+        保存按账户的状态，值需可序列化为JSON
+
+        Returns:
+            bool: 是否保存成功，账户不存在时返回False
+        """
+        account_id = self._account_id(forum_name, username)
+        if account_id is None:
+            return False
+        self._execute(
+            "INSERT OR REPLACE INTO account_state (account_id, key, value, updated_at) VALUES (?, ?, ?, ?)",
+            (account_id, key, json.dumps(value, ensure_ascii=False), time.time())
+        )
+        return True
+
+    # ========== 迁移 ==========
+
+    def migrate(self, accounts, settings, source):
+        """
+        一次性导入旧配置文件中的账户和设置（在同一事务中完成）
+
+        Args:
+            accounts: 账户字典列表，包含name, url, username, encrypted_password, nickname
+            settings: 设置项字典
+            source: 迁移来源（记录在元数据中）
+        """
+        with self._lock, self._conn:
+            for account in accounts:
+                self._conn.execute("INSERT OR IGNORE INTO forums (name, url) VALUES (?, ?)",
+                                   (account['name'], account.get('url', '')))
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO accounts (forum_id, username, nickname, encrypted_password) "
+                    "SELECT id, ?, ?, ? FROM forums WHERE name = ?",
+                    (account['username'], account.get('nickname', ''),
+                     account.get('encrypted_password', ''), account['name'])
+                )
+            for key, value in settings.items():
+                self._conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, str(value)))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (source,))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_at', ?)",
+                               (time.strftime('%Y-%m-%d %H:%M:%S'),))
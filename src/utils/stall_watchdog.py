@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+界面卡顿监视模块
+后台线程定期向界面线程发送心跳，界面线程长时间未响应时记录其调用栈
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+# 项目根目录，用于从调用栈中找出属于本程序的调用位置
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StallWatchdog:
+    """界面卡顿监视器"""
+
+    def __init__(self, post_to_ui, threshold=0.2, interval=0.05, log_file=None, max_stack_depth=30):
+        """
+        初始化卡顿监视器，必须在界面线程中创建
+
+        Args:
+            post_to_ui: 把回调投递到界面线程执行的函数（如 wx.CallAfter）
+            threshold: 判定为卡顿的阈值（秒）
+            interval: 心跳检查间隔（秒）
+            log_file: 卡顿日志文件路径，为None时不写日志
+            max_stack_depth: 记录的最大调用栈深度
+        """
+        self.post_to_ui = post_to_ui
+        self.threshold = threshold
+        self.interval = interval
+        self.log_file = log_file
+        self.max_stack_depth = max_stack_depth
+        self.ui_thread_id = threading.get_ident()
+
+        self.sites = {}  # {调用位置: 统计字典}
+        self.total_stalls = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # 心跳状态
+        self._ping_seq = 0
+        self._ping_sent = 0.0
+        self._ping_pending = False
+        self._captured_stack = None
+        self._pending_stalls = []  # 界面线程报告、等待监视线程记录的卡顿 [(调用栈, 时长)]
+
+    def start(self):
+        """启动监视线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        # 每次启动使用新的停止事件，刚停止的旧线程醒来后仍会退出，不会与新线程同时运行
+        self._stop_event = threading.Event()
+        self._ping_pending = False
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止监视线程"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _run(self, stop_event):
+        """
+        监视线程主循环
+
+        Args:
+            stop_event: 本次运行的停止事件
+        """
+        while not stop_event.wait(self.interval):
+            self._flush_stalls()
+            now = time.perf_counter()
+            if not self._ping_pending:
+                # 发送新的心跳
+                self._ping_seq += 1
+                self._ping_sent = now
+                self._ping_pending = True
+                self._captured_stack = None
+                try:
+                    self.post_to_ui(self._pong, self._ping_seq)
+                except Exception:
+                    # 界面已销毁
+                    return
+            elif self._captured_stack is None and now - self._ping_sent >= self.threshold:
+                # 界面线程超过阈值仍未响应，抓取其当前调用栈
+                self._captured_stack = self._capture_ui_stack()
+        self._flush_stalls()
+
+    def _pong(self, seq):
+        """心跳响应（在界面线程中执行）"""
+        if seq != self._ping_seq:
+            return
+        elapsed = time.perf_counter() - self._ping_sent
+        stack = self._captured_stack
+        self._ping_pending = False
+        if stack is not None and elapsed >= self.threshold:
+            # 统计和写日志由监视线程完成，界面线程不做文件读写
+            self._pending_stalls.append((stack, elapsed))
+
+    def _flush_stalls(self):
+        """记录界面线程报告的卡顿（在监视线程中执行）"""
+        while self._pending_stalls:
+            stack, elapsed = self._pending_stalls.pop(0)
+            self._record_stall(stack, elapsed)
+
+    def _capture_ui_stack(self):
+        """
+        抓取界面线程的调用栈
+
+        Returns:
+            list: traceback.FrameSummary 列表，抓取失败时返回空列表
+        """
+        frame = sys._current_frames().get(self.ui_thread_id)
+        if frame is None:
+            return []
+        return traceback.extract_stack(frame, limit=self.max_stack_depth)
+
+    def _get_call_site(self, stack):
+        """
+        从调用栈中找出最内层的本程序调用位置
+
+        Args:
+            stack: traceback.FrameSummary 列表
+
+        Returns:
+            str: 调用位置描述（文件:行号 函数名）
+        """
+        for frame in reversed(stack):
+            filename = os.path.abspath(frame.filename)
+            if filename.startswith(PROJECT_ROOT):
+                relative = os.path.relpath(filename, PROJECT_ROOT)
+                return f"{relative}:{frame.lineno} {frame.name}"
+        if stack:
+            frame = stack[-1]
+            return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+        return "未知位置"
+
+    def _record_stall(self, stack, elapsed):
+        """
+        记录一次卡顿
+
+        Args:
+            stack: 卡顿时界面线程的调用栈
+            elapsed: 卡顿时长（秒）
+        """
+        site = self._get_call_site(stack)
+        stack_text = ''.join(traceback.format_list(stack))
+        elapsed_ms = elapsed * 1000.0
+
+        with self._lock:
+            self.total_stalls += 1
+            stats = self.sites.get(site)
+            if stats is None:
+                stats = {'site': site, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'stack': stack_text}
+                self.sites[site] = stats
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            if elapsed_ms >= stats['max_ms']:
+                # 保留最长一次卡顿的调用栈
+                stats['max_ms'] = elapsed_ms
+                stats['stack'] = stack_text
+
+        self._write_log(site, elapsed_ms, stack_text)
+
+    def _write_log(self, site, elapsed_ms, stack_text):
+        """追加写入卡顿日志"""
+        if not self.log_file:
+            return
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 卡顿 {elapsed_ms:.0f}毫秒 位置: {site}\n")
+                f.write(stack_text)
+                f.write("\n")
+        except Exception:
+            pass
+
+    def get_summary(self):
+        """
+        获取按调用位置汇总的卡顿统计（总时长从高到低）
+
+        Returns:
+            list: 统计字典列表
+        """
+        with self._lock:
+            summary = [dict(stats) for stats in self.sites.values()]
+        summary.sort(key=lambda stats: -stats['total_ms'])
+        return summary
+
+    def reset(self):
+        """清空卡顿统计"""
+        with self._lock:
+            self.sites.clear()
+            self.total_stalls = 0
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析模块
+使用 --profile-startup 启动时记录启动过程各阶段的时间线，并可同时生成cProfile数据
+"""
+
+import threading
+import time
+
+class StartupProfiler:
+    """启动耗时分析器（未启用时所有调用都是空操作）"""
+
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.report_file = None
+        self.profile_file = None
+        self.phases = []  # [(名称, 开始偏移, 耗时, 层级, 线程名)]
+        self._depth = threading.local()
+        self._profiler = None
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def enable(self, report_file, profile_file=None, start=None):
+        """
+        启用启动耗时分析
+
+        Args:
+            report_file: 时间线报告的输出路径
+            profile_file: cProfile数据的输出路径，为None时不进行cProfile分析
+            start: 进程启动时刻（time.perf_counter()），为None时以当前时刻为起点
+        """
+        self.enabled = True
+        self.report_file = report_file
+        self.profile_file = profile_file
+        if start is not None:
+            self.start = start
+
+        if profile_file:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def phase(self, name):
+        """
+        返回阶段计时上下文，用法: with startup_profiler.phase('创建界面'): ...
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            _Phase: 计时上下文
+        """
+        return _Phase(self, name)
+
+    def _record(self, name, started, elapsed, depth):
+        """记录一个已完成的阶段"""
+        with self._lock:
+            if self._finished:
+                return
+            self.phases.append((name, started - self.start, elapsed, depth, threading.current_thread().name))
+
+    def finish(self):
+        """结束分析并写出报告（只在第一次调用时生效）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        total = time.perf_counter() - self.start
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                self._profiler.dump_stats(self.profile_file)
+            except Exception as e:
+                print(f"[WARN] 写入cProfile数据失败: {e}")
+
+        report = self.format_report(total)
+        print(report)
+        try:
+            with open(self.report_file, 'w', encoding='utf-8') as f:
+                f.write(report)
+            print(f"启动时间线已写入: {self.report_file}")
+        except Exception as e:
+            print(f"[WARN] 写入启动时间线失败: {e}")
+
+    def format_report(self, total):
+        """
+        生成时间线报告
+
+        Args:
+            total: 从启动到结束分析的总耗时（秒）
+
+        Returns:
+            str: 报告文本
+        """
+        lines = [
+            f"启动时间线（{time.strftime('%Y-%m-%d %H:%M:%S')}）",
+            f"{'开始(ms)':>10} {'耗时(ms)':>10}  阶段",
+        ]
+        for name, offset, elapsed, depth, thread_name in sorted(self.phases, key=lambda p: (p[1], p[3])):
+            suffix = f"  [{thread_name}]" if thread_name != 'MainThread' else ""
+            lines.append(f"{offset * 1000:10.1f} {elapsed * 1000:10.1f}  {'  ' * depth}{name}{suffix}")
+        lines.append(f"{'':>10} {total * 1000:10.1f}  总计")
+        if self.profile_file:
+            lines.append(f"cProfile数据: {self.profile_file}")
+        return "\n".join(lines) + "\n"
+
+
+class _Phase:
+    """阶段计时上下文"""
+
+    __slots__ = ('profiler', 'name', 'started', 'depth')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+        self.depth = 0
+
+    def __enter__(self):
+        profiler = self.profiler
+        if profiler.enabled:
+            self.depth = getattr(profiler._depth, 'value', 0)
+            profiler._depth.value = self.depth + 1
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        profiler = self.profiler
+        if profiler.enabled and self.started:
+            profiler._record(self.name, self.started, time.perf_counter() - self.started, self.depth)
+            profiler._depth.value = self.depth
+        return False
+
+
+# 全局启动耗时分析器
+startup_profiler = StartupProfiler()
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+音频流缓冲调节模块
+按主机记录首字节时间、下载速度、起播耗时和播放中的卡顿次数，据此为每个媒体选择VLC的网络缓冲时长
+"""
+
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# 没有测量数据时使用的网络缓冲时长（毫秒），与VLC启动参数一致
+DEFAULT_CACHING_MS = 3000
+
+# 网络缓冲时长范围（毫秒）
+MIN_CACHING_MS = 300
+MAX_CACHING_MS = 10000
+
+# 未知位速时按此位速（kbps）估算所需缓冲
+DEFAULT_BITRATE_KBPS = 128
+
+# 计算下载速度所需的最少字节数（太小的传输主要反映连接耗时）
+MIN_SAMPLE_BYTES = 16 * 1024
+
+# 指数滑动平均的权重
+EWMA_WEIGHT = 0.3
+
+# 每个主机保留的播放记录数
+MAX_PLAYBACKS = 20
+
+
+def host_of(url):
+    """获取地址中的主机名，本地文件返回None"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme not in ('http', 'https'):
+        return None
+    return parts.hostname
+
+
+class _HostStats:
+    """单个主机的测量数据"""
+
+    __slots__ = ('ttfb_ms', 'throughput_kbps', 'transfers', 'boost', 'playbacks')
+
+    def __init__(self):
+        self.ttfb_ms = None
+        self.throughput_kbps = None
+        self.transfers = 0
+        self.boost = 1.0  # 出现卡顿后放大缓冲的倍数
+        self.playbacks = deque(maxlen=MAX_PLAYBACKS)  # [(起播耗时ms, 卡顿次数, 缓冲ms)]
+
+
+def _ewma(old, new):
+    """指数滑动平均"""
+    return new if old is None else old + EWMA_WEIGHT * (new - old)
+
+
+class StreamTuner:
+    """按主机调节网络缓冲时长"""
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, host):
+        """获取主机的测量数据（调用方持有锁）"""
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = _HostStats()
+        return stats
+
+    def record_transfer(self, url, ttfb, size=0, elapsed=0.0):
+        """
+        记录一次HTTP传输（探测、缓存下载等）
+
+        Args:
+            url: 请求地址
+            ttfb: 首字节时间（秒）
+            size: 收到的字节数
+            elapsed: 从收到首字节到传输结束的耗时（秒）
+        """
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            stats = self._stats(host)
+            stats.transfers += 1
+            stats.ttfb_ms = _ewma(stats.ttfb_ms, ttfb * 1000)
+            if size >= MIN_SAMPLE_BYTES and elapsed > 0:
+                stats.throughput_kbps = _ewma(stats.throughput_kbps, size * 8 / elapsed / 1000)
+
+    def record_playback(self, url, start_latency_ms, rebuffers, caching_ms):
+        """
+        记录一次播放结果，并据此调整该主机的缓冲倍数
+
+        Args:
+            url: 音频地址
+            start_latency_ms: 从请求播放到开始出声的耗时（毫秒），未开始播放时为None
+            rebuffers: 开始播放后的卡顿次数
+            caching_ms: 本次使用的网络缓冲时长（毫秒）
+        """
+        host = host_of(url)
+        if not host:
+            return
+        with self._lock:
+            stats = self._stats(host)
+            stats.playbacks.append((start_latency_ms, rebuffers, caching_ms))
+            if rebuffers:
+                # 有卡顿时加大缓冲
+                stats.boost = min(4.0, stats.boost * (1.5 if rebuffers == 1 else 2.0))
+            elif start_latency_ms is not None:
+                # 播放顺畅时逐步缩回，降低起播延迟
+                stats.boost = max(1.0, stats.boost * 0.9)
+
+    def network_caching_ms(self, url, bitrate_kbps=None):
+        """
+        为媒体选择网络缓冲时长
+
+        下载速度相对音频位速越富余，需要的缓冲越少；首字节时间越长，缓冲要覆盖的网络抖动越大
+
+        Args:
+            url: 音频地址
+            bitrate_kbps: 音频位速，未知时按默认位速估算
+
+        Returns:
+            int: 网络缓冲时长（毫秒）
+        """
+        host = host_of(url)
+        if not host:
+            return DEFAULT_CACHING_MS
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None or stats.ttfb_ms is None:
+                return DEFAULT_CACHING_MS
+            ttfb_ms = stats.ttfb_ms
+            throughput = stats.throughput_kbps
+            boost = stats.boost
+
+        if throughput is None:
+            caching = DEFAULT_CACHING_MS
+        else:
+            headroom = throughput / (bitrate_kbps or DEFAULT_BITRATE_KBPS)
+            if headroom >= 4:
+                caching = 500
+            elif headroom >= 2:
+                caching = 1000
+            elif headroom >= 1.2:
+                caching = 2500
+            else:
+                caching = 6000
+        caching = (caching + 2 * ttfb_ms) * boost
+        return int(min(MAX_CACHING_MS, max(MIN_CACHING_MS, caching)))
+
+    def get_summary(self):
+        """
+        获取各主机的统计
+
+        Returns:
+            list: 按主机名排列的统计字典列表
+        """
+        with self._lock:
+            items = sorted(self._hosts.items())
+            summary = []
+            for host, stats in items:
+                latencies = [p[0] for p in stats.playbacks if p[0] is not None]
+                summary.append({
+                    'host': host,
+                    'ttfb_ms': round(stats.ttfb_ms) if stats.ttfb_ms is not None else None,
+                    'throughput_kbps': round(stats.throughput_kbps) if stats.throughput_kbps is not None else None,
+                    'transfers': stats.transfers,
+                    'boost': round(stats.boost, 2),
+                    'playbacks': len(stats.playbacks),
+                    'avg_start_ms': round(sum(latencies) / len(latencies)) if latencies else None,
+                    'rebuffers': sum(p[1] for p in stats.playbacks),
+                    'last_caching_ms': stats.playbacks[-1][2] if stats.playbacks else None,
+                })
+        return summary
+
+
+class PlaybackSession:
+    """一次播放的起播耗时和卡顿统计"""
+
+    __slots__ = ('url', 'caching_ms', 'requested', 'start_latency_ms', 'rebuffers', 'buffering')
+
+    def __init__(self, url, caching_ms):
+        self.url = url
+        self.caching_ms = caching_ms
+        self.requested = time.perf_counter()
+        self.start_latency_ms = None
+        self.rebuffers = 0
+        self.buffering = False
+
+    def on_time_changed(self, new_time_ms):
+        """播放位置变化：第一次前进时记录起播耗时"""
+        if self.start_latency_ms is None and new_time_ms > 0:
+            self.start_latency_ms = round((time.perf_counter() - self.requested) * 1000)
+
+    def on_buffering(self, percent):
+        """缓冲进度变化：开始播放后缓冲低于100%记为一次卡顿"""
+        if self.start_latency_ms is None:
+            return
+        if percent < 100:
+            if not self.buffering:
+                self.buffering = True
+                self.rebuffers += 1
+        else:
+            self.buffering = False
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 测试按 src.utils.xxx 导入模块；界面和播放器模块按程序运行时的方式从 src 目录导入
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'src'))
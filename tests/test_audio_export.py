@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils.audio_export import PART_INFO_SUFFIX, PART_SUFFIX, AudioExporter, audio_extension, sanitize_filename
+
+
+class SanitizeFilenameTest(unittest.TestCase):
+    def test_invalid_characters(self):
+        self.assertEqual(sanitize_filename('a/b:c*?  "d" <e>|. '), 'a_b_c__ _d_ _e__')
+        self.assertEqual(sanitize_filename('制表\t换行\n歌曲'), '制表_换行_歌曲')
+        self.assertEqual(sanitize_filename('bell\x07'), 'bell_')
+
+    def test_empty_title(self):
+        self.assertEqual(sanitize_filename(''), '音频')
+        self.assertEqual(sanitize_filename(None), '音频')
+        self.assertEqual(sanitize_filename(' . ', default='未命名'), '未命名')
+
+    def test_reserved_names(self):
+        self.assertEqual(sanitize_filename('CON.txt'), '_CON.txt')
+        self.assertEqual(sanitize_filename('lpt1'), '_lpt1')
+        self.assertEqual(sanitize_filename('CONSOLE'), 'CONSOLE')
+
+    def test_length_limit(self):
+        name = sanitize_filename('长' * 79 + ' .后面的文字')
+        self.assertEqual(name, '长' * 79)
+
+
+class AudioExtensionTest(unittest.TestCase):
+    def test_extension_from_url(self):
+        self.assertEqual(audio_extension({'url': 'http://a/x/song.M4A?download=1'}), '.m4a')
+
+    def test_extension_from_format(self):
+        self.assertEqual(audio_extension({'url': 'http://a/play.php?id=1', 'format': 'ogg'}), '.ogg')
+
+    def test_default_extension(self):
+        self.assertEqual(audio_extension({'url': 'http://a/play.php?id=1'}), '.mp3')
+
+
+class _Response:
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+class _Session:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+class DownloadTest(unittest.TestCase):
+    URL = 'http://a/song.mp3'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, '01 歌曲.mp3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def download(self, *responses):
+        exporter = AudioExporter(_Session(*responses))
+        return exporter, exporter._download(self.URL, self.path, lambda count: None)
+
+    def test_truncated_download_is_resumed(self):
+        with self.assertRaises(IOError):
+            self.download(_Response(200, {'Content-Length': '10', 'ETag': '"v1"'}, b'01234'))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getsize(self.path + PART_SUFFIX), 5)
+
+        exporter, status = self.download(
+            _Response(206, {'Content-Length': '5', 'Content-Range': 'bytes 5-9/10'}, b'56789'))
+        self.assertEqual(status, 'saved')
+        self.assertEqual(exporter.session.requests, [{'Range': 'bytes=5-', 'If-Range': '"v1"'}])
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+        self.assertFalse(os.path.exists(self.path + PART_INFO_SUFFIX))
+
+    def test_changed_source_restarts(self):
+        with self.assertRaises(IOError):
+            self.download(_Response(200, {'Content-Length': '10', 'Last-Modified': 'Mon'}, b'old'))
+        exporter, status = self.download(_Response(200, {'Content-Length': '3'}, b'new'))
+        self.assertEqual(exporter.session.requests[0]['If-Range'], 'Mon')
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'new')
+
+    def test_complete_part_finished_after_416(self):
+        with open(self.path + PART_SUFFIX, 'wb') as f:
+            f.write(b'0123456789')
+        AudioExporter._write_part_info(self.path + PART_INFO_SUFFIX, {'url': self.URL, 'etag': '"v1"'})
+
+        exporter, status = self.download(_Response(416, {'Content-Range': 'bytes */10'}, b''))
+        self.assertEqual(status, 'saved')
+        self.assertEqual(exporter.session.requests, [{'Range': 'bytes=10-', 'If-Range': '"v1"'}])
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+        self.assertFalse(os.path.exists(self.path + PART_SUFFIX))
+        self.assertFalse(os.path.exists(self.path + PART_INFO_SUFFIX))
+
+    def test_mismatched_part_restarts_after_416(self):
+        with open(self.path + PART_SUFFIX, 'wb') as f:
+            f.write(b'0123456789xx')
+        AudioExporter._write_part_info(self.path + PART_INFO_SUFFIX, {'url': self.URL, 'etag': '"v1"'})
+
+        exporter, status = self.download(_Response(416, {'Content-Range': 'bytes */10'}, b''),
+                                         _Response(200, {'Content-Length': '10', 'ETag': '"v1"'}, b'0123456789'))
+        self.assertEqual(status, 'saved')
+        self.assertEqual(exporter.session.requests[1], {})
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+
+    def test_existing_file_is_skipped(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x')
+        exporter, status = self.download()
+        self.assertEqual(status, 'skipped')
+        self.assertEqual(exporter.session.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from audio_player import AudioPlayer
+
+
+class _Media:
+    def __init__(self):
+        self.options = []
+
+    def add_option(self, option):
+        self.options.append(option)
+
+
+class _Instance:
+    def media_new(self, source):
+        return _Media()
+
+
+class _Player:
+    def set_media(self, media):
+        pass
+
+    def play(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class PlayMediaTest(unittest.TestCase):
+    URL = 'http://audio.example.com/a.mp3'
+
+    def setUp(self):
+        self.player = AudioPlayer()
+        self.player.instance = _Instance()
+        self.player.player = _Player()
+        # 不在测试中创建探测器和解析媒体
+        self.player._probe_tracks = lambda tracks: None
+        self.player._parse_media_async = lambda media, index: None
+        self.player.set_playlist([{'url': self.URL, 'title': '歌曲'}])
+
+    def test_probed_info_survives_playback(self):
+        self.player._on_track_probed(self.URL, {'format': 'MP3', 'bitrate': 192, 'duration': 200})
+        self.assertTrue(self.player._play_media(self.URL))
+        track = self.player.playlist[0]
+        self.assertEqual(track['title'], '歌曲')
+        self.assertEqual(track['format'], 'MP3')
+        self.assertEqual(track['bitrate'], '192kbps')
+        self.assertEqual(track['duration'], 200)
+
+    def test_unprobed_track_gets_placeholders(self):
+        self.assertTrue(self.player._play_media(self.URL))
+        track = self.player.playlist[0]
+        self.assertEqual(track['title'], '歌曲')
+        self.assertEqual(track['format'], '音频流')
+        self.assertEqual(track['bitrate'], '--')
+
+    def test_probe_after_playback_replaces_placeholders(self):
+        self.player._play_media(self.URL)
+        self.player._on_track_probed(self.URL, {'format': 'OGG', 'bitrate': 96})
+        self.assertEqual(self.player.playlist[0]['format'], 'OGG')
+        self.assertEqual(self.player.playlist[0]['bitrate'], '96kbps')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import struct
+import unittest
+
+from src.utils.audio_probe import parse_audio_header
+
+# MPEG-1 Layer III, 128kbps, 44100Hz, 立体声
+MP3_FRAME_HEADER = bytes([0xff, 0xfb, 0x90, 0x00])
+
+
+def no_read(offset, length):
+    raise AssertionError("不应读取文件头以外的数据")
+
+
+def mp3_with_xing(frames):
+    # 立体声MPEG-1的边信息为32字节，Xing头紧随其后
+    return MP3_FRAME_HEADER + b'\0' * 32 + b'Xing' + struct.pack('>II', 0x01, frames) + b'\0' * 100
+
+
+def ogg_vorbis(granule, sample_rate=44100, bitrate=128000):
+    first_page = b'OggS' + b'\0' * 24 + b'\x01vorbis' + b'\0' * 5 + struct.pack('<I', sample_rate) + \
+        b'\0' * 4 + struct.pack('<i', bitrate) + b'\0' * 10
+    last_page = b'OggS\0\x04' + struct.pack('<q', granule) + b'\0' * 20
+    return first_page + last_page
+
+
+class Mp3Test(unittest.TestCase):
+    def test_constant_bitrate_duration_from_size(self):
+        header = MP3_FRAME_HEADER + b'\0' * 1000
+        info = parse_audio_header(header, 160000, no_read)
+        self.assertEqual(info, {'format': 'MP3', 'bitrate': 128, 'duration': 10})
+
+    def test_xing_frame_count(self):
+        # 1000帧 × 1152采样 / 44100Hz ≈ 26秒
+        info = parse_audio_header(mp3_with_xing(1000), 0, no_read)
+        self.assertEqual(info['duration'], 26)
+
+    def test_truncated_xing_header(self):
+        header = MP3_FRAME_HEADER + b'\0' * 32 + b'Xing\0\0'
+        self.assertEqual(parse_audio_header(header, 0, no_read), {'format': 'MP3', 'bitrate': 128})
+
+    def test_truncated_vbri_header(self):
+        header = MP3_FRAME_HEADER + b'\0' * 32 + b'VBRI' + b'\0' * 4
+        self.assertEqual(parse_audio_header(header, 0, no_read), {'format': 'MP3', 'bitrate': 128})
+
+    def test_skips_id3_tag(self):
+        tag = b'ID3\x03\x00\x00' + bytes([0, 0, 0, 20]) + b'\0' * 20
+        info = parse_audio_header(tag + MP3_FRAME_HEADER + b'\0' * 1000, 160000 + len(tag), no_read)
+        self.assertEqual(info['duration'], 10)
+
+    def test_large_id3_tag_reads_past_header(self):
+        tag = b'ID3\x03\x00\x00' + bytes([0, 0, 0x01, 0])  # 128字节标签
+        reads = []
+
+        def read(offset, length):
+            reads.append(offset)
+            return MP3_FRAME_HEADER + b'\0' * 100
+
+        info = parse_audio_header(tag + b'\0' * 10, 0, read)
+        self.assertEqual(reads, [138])
+        self.assertEqual(info['bitrate'], 128)
+
+    def test_no_frame_sync(self):
+        self.assertEqual(parse_audio_header(b'\0' * 100, 0, no_read), {})
+
+
+class OggTest(unittest.TestCase):
+    def test_duration_from_last_page(self):
+        header = ogg_vorbis(441000)
+        info = parse_audio_header(header, len(header), no_read)
+        self.assertEqual(info, {'format': 'OGG', 'bitrate': 128, 'duration': 10})
+
+    def test_reads_tail_of_larger_file(self):
+        tail = b'\0' * 50 + b'OggS\0\x04' + struct.pack('<q', 4410000) + b'\0' * 20
+        info = parse_audio_header(ogg_vorbis(1000), 10 ** 6, lambda offset, length: tail)
+        self.assertEqual(info['duration'], 100)
+
+    def test_unknown_size_has_no_duration(self):
+        info = parse_audio_header(ogg_vorbis(441000), 0, no_read)
+        self.assertEqual(info, {'format': 'OGG', 'bitrate': 128})
+
+    def test_opus_pre_skip(self):
+        head = b'OpusHead\x01\x02' + struct.pack('<H', 48000)
+        header = b'OggS' + b'\0' * 24 + head + b'\0' * 20 + b'OggS\0\x04' + struct.pack('<q', 48000 * 6) + b'\0' * 20
+        info = parse_audio_header(header, len(header), no_read)
+        self.assertEqual(info, {'format': 'OPUS', 'duration': 5})
+
+    def test_truncated_identification_header(self):
+        self.assertEqual(parse_audio_header(b'OggS' + b'\0' * 24 + b'OpusHead', 0, no_read), {'format': 'OPUS'})
+        self.assertEqual(parse_audio_header(b'OggS' + b'\0' * 24 + b'\x01vorbis\0', 0, no_read), {'format': 'OGG'})
+
+
+class OtherFormatTest(unittest.TestCase):
+    def test_flac(self):
+        packed = (44100 << 44) | (44100 * 30)
+        header = b'fLaC' + b'\0' * 14 + struct.pack('>Q', packed)
+        self.assertEqual(parse_audio_header(header, 0, no_read), {'format': 'FLAC', 'duration': 30})
+
+    def test_wav(self):
+        fmt = b'fmt ' + struct.pack('<I', 16) + struct.pack('<HHIIHH', 1, 2, 44100, 176400, 4, 16)
+        data = b'data' + struct.pack('<I', 176400 * 12)
+        header = b'RIFF' + struct.pack('<I', 0) + b'WAVE' + fmt + data
+        self.assertEqual(parse_audio_header(header, 0, no_read), {'format': 'WAV', 'bitrate': 1411, 'duration': 12})
+
+    def test_mp4_mvhd(self):
+        mvhd = struct.pack('>I4sB3xII', 108, b'mvhd', 0, 0, 0) + struct.pack('>II', 1000, 90000) + b'\0' * 80
+        moov = struct.pack('>I4s', 8 + len(mvhd), b'moov') + mvhd
+        header = struct.pack('>I4s', 16, b'ftyp') + b'M4A \0\0\0\0' + moov
+        self.assertEqual(parse_audio_header(header, len(header), no_read), {'format': 'M4A', 'duration': 90})
+
+    def test_mp4_truncated_mvhd(self):
+        header = struct.pack('>I4s', 16, b'ftyp') + b'M4A \0\0\0\0' + struct.pack('>I4s', 20, b'moov') + b'\0\0\0\0mvhd'
+        self.assertEqual(parse_audio_header(header, len(header), lambda offset, length: b''), {'format': 'M4A'})
+
+
+if __name__ == '__main__':
+    unittest.main()
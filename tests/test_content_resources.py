@@ -0,0 +1,77 @@
+import unittest
+
+from src.utils.content_resources import (AUDIO, IMAGE, LINK, build_audio_tag, extract_audio, extract_resources,
+                                         fallback_name, parse_content)
+
+
+class ParseContentTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(parse_content(''), ('', [], {}))
+        self.assertEqual(parse_content(None), ('', [], {}))
+
+    def test_plain_text_and_entities(self):
+        text, resources, resource_map = parse_content('<p>Hi &amp; <b>bye</b></p><div>a&nbsp;b</div>')
+        self.assertEqual(text, 'Hi & bye\na b')
+        self.assertEqual(resources, [])
+        self.assertEqual(resource_map, {})
+
+    def test_resources_in_document_order(self):
+        html = ('<p>Hi &amp; <b>bye</b></p><a href="http://x/a?b=1&amp;c=2">Go &lt;here&gt;</a><br/>'
+                + build_audio_tag('http://a/s.mp3', 'Song &amp; 1')
+                + '<img src="http://i/p.jpg"><audio title="T" src="http://a/s.mp3"></audio><a name="n">anchor</a>')
+        text, resources, resource_map = parse_content(html)
+
+        self.assertEqual(text, 'Hi & bye\nGo <here>【链接】\nSong & 1【音频】p【图片】Song & 1【音频】anchor')
+        self.assertEqual([(r['type'], r['url']) for r in resources],
+                         [(LINK, 'http://x/a?b=1&c=2'), (AUDIO, 'http://a/s.mp3'), (IMAGE, 'http://i/p.jpg')])
+        # 重复出现的音频沿用第一次的名称，列表中只有一项
+        self.assertEqual(sorted(resource_map), [9, 23, 35, 40])
+        self.assertIs(resource_map[23], resources[1])
+        self.assertIs(resource_map[40], resources[1])
+
+    def test_map_positions_point_at_markers(self):
+        html = '<p>开头</p><a href="http://x/1">一</a>中间<img alt="图" src="http://i/1.png" />结尾'
+        text, resources, resource_map = parse_content(html)
+        for position, resource in resource_map.items():
+            self.assertTrue(text.startswith(resource['display_name'], position))
+
+    def test_markup_in_names_is_not_stripped(self):
+        text, resources, _ = parse_content('<audio src="http://a/1.mp3" title="&lt;b&gt;名字&lt;/b&gt;"></audio>')
+        self.assertEqual(text, '<b>名字</b>【音频】')
+        self.assertEqual(resources[0]['name'], '<b>名字</b>')
+
+    def test_placeholder_in_source_is_removed(self):
+        text, _, resource_map = parse_content('a\x00b<img src="http://i/x.jpg">')
+        self.assertEqual(text, 'abx【图片】')
+        self.assertEqual(list(resource_map), [2])
+
+
+class ExtractTest(unittest.TestCase):
+    def test_extract_resources_shares_seen_set(self):
+        seen = set()
+        first = extract_resources('<img src="http://i/1.jpg" alt="一"><a href="http://i/1.jpg">链接</a>', seen)
+        second = extract_resources('<img src=\'http://i/1.jpg\'><img src="http://i/2.jpg">', seen)
+        self.assertEqual([(r['type'], r['name']) for r in first], [(IMAGE, '一'), (LINK, '链接')])
+        self.assertEqual([r['url'] for r in second], ['http://i/2.jpg'])
+
+    def test_extract_audio_attribute_order_and_case(self):
+        html = ('<AUDIO TITLE="甲" SRC="http://a/1.mp3"></AUDIO>'
+                '<audio controls src="http://a/2.mp3"></audio>'
+                '<audio src="http://a/1.mp3" title="重复"></audio><audio title="无地址"></audio>')
+        tracks = extract_audio(html)
+        self.assertEqual([(t['url'], t['title'], t['name']) for t in tracks],
+                         [('http://a/1.mp3', '甲', '甲'), ('http://a/2.mp3', '', '2')])
+
+    def test_build_audio_tag_round_trip(self):
+        tracks = extract_audio(build_audio_tag('http://a/x.mp3', '歌曲'))
+        self.assertEqual([(t['url'], t['title']) for t in tracks], [('http://a/x.mp3', '歌曲')])
+
+    def test_fallback_name(self):
+        self.assertEqual(fallback_name('http://a/dir/song.mp3?x=1', AUDIO), 'song')
+        self.assertEqual(fallback_name('http://a/dir/page.html#top', LINK), 'page.html')
+        self.assertEqual(fallback_name('', IMAGE), '未命名图片')
+        self.assertEqual(fallback_name('http://a/.mp3', AUDIO), '未命名音频')
+
+
+if __name__ == '__main__':
+    unittest.main()
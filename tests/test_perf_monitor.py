@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from src.utils.perf_monitor import PerfMonitor
+
+
+def run_in_thread(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    thread.join()
+
+
+class NavigationTest(unittest.TestCase):
+    def setUp(self):
+        self.monitor = PerfMonitor()
+
+    def finish(self):
+        self.monitor.end_navigation()
+        return self.monitor.get_recent_navigations()[0]
+
+    def test_requests_on_navigation_thread(self):
+        self.monitor.begin_navigation('最新发表')
+        self.monitor.record_request('forum-index.htm', 0.2, size=100)
+        with self.monitor.stage('render'):
+            pass
+        navigation = self.finish()
+        self.assertEqual(navigation['requests'], 1)
+        self.assertEqual(navigation['bytes'], 100)
+        self.assertEqual(navigation['endpoints'], ['forum-index.htm'])
+        self.assertEqual(navigation['stages_ms']['request'], 200.0)
+        self.assertNotIn('thread', navigation)
+
+    def test_background_requests_are_not_counted(self):
+        self.monitor.begin_navigation('帖子详情')
+        run_in_thread(self.monitor.record_request, 'thread-index.htm', 1.5, 5000)
+        run_in_thread(self.monitor.add_stage, 'parse', 0.3)
+        navigation = self.finish()
+        self.assertEqual(navigation['requests'], 0)
+        self.assertEqual(navigation['stages_ms']['request'], 0.0)
+        self.assertEqual(navigation['stages_ms']['parse'], 0.0)
+        # 接口统计仍然记录后台请求
+        self.assertEqual(self.monitor.get_endpoint_summary()['thread-index.htm']['requests'], 1)
+
+    def test_concurrent_stages_on_navigation_thread(self):
+        self.monitor.begin_navigation('列表')
+        threads = [threading.Thread(target=lambda: [self.monitor.add_stage('parse', 0.001) for _ in range(500)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(1000):
+            self.monitor.add_stage('render', 0.001)
+        for thread in threads:
+            thread.join()
+        navigation = self.finish()
+        self.assertAlmostEqual(navigation['stages_ms']['render'], 1000.0, places=3)
+        self.assertEqual(navigation['stages_ms']['parse'], 0.0)
+
+    def test_stage_excludes_nested_stage(self):
+        self.monitor.begin_navigation('列表')
+        with self.monitor.stage('render', exclude=('parse',)):
+            self.monitor.add_stage('parse', 10.0)
+        navigation = self.finish()
+        self.assertEqual(navigation['stages_ms']['parse'], 10000.0)
+        self.assertEqual(navigation['stages_ms']['render'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import unittest
+
+from playlist_builder import PlaylistBuilder, extract_audio_tracks
+
+
+def audio(url, title=''):
+    return f'<audio src="{url}" title="{title}"></audio>'
+
+
+class _ForumClient:
+    """按页返回回复（忽略uid，检验构建器自己也会按用户筛选）"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get_thread_detail(self, forum_name, tid, page=1, uid=None):
+        self.calls.append((page, uid))
+        posts = self.pages.get(page, [])
+        return {'postlist': posts}
+
+
+class PlaylistBuilderTest(unittest.TestCase):
+    PAGES = {
+        2: [{'uid': 1, 'message': audio('http://a/1.mp3', '一')},
+            {'uid': 2, 'message': audio('http://a/2.mp3', '二')}],
+        3: [{'uid': '2', 'message': audio('http://a/3.mp3') + audio('http://a/2.mp3')},
+            {'uid': 1, 'message': audio('http://a/0.mp3')}],
+    }
+
+    def build(self, **kwargs):
+        client = _ForumClient(self.PAGES)
+        builder = PlaylistBuilder(client)
+        found = []
+        done = threading.Event()
+        builder.build('论坛', 10, 1, 3, {'http://a/0.mp3'}, found.extend,
+                      on_done=lambda cancelled: done.set(), **kwargs)
+        self.assertTrue(done.wait(5))
+        return client, [track['url'] for track in found]
+
+    def test_reads_following_pages_in_order(self):
+        client, urls = self.build()
+        self.assertEqual(sorted(client.calls), [(2, None), (3, None)])
+        self.assertEqual(urls, ['http://a/1.mp3', 'http://a/2.mp3', 'http://a/3.mp3'])
+
+    def test_filter_uid_only_reads_that_user(self):
+        client, urls = self.build(uid='2')
+        self.assertEqual(sorted(client.calls), [(2, '2'), (3, '2')])
+        self.assertEqual(urls, ['http://a/2.mp3', 'http://a/3.mp3'])
+
+    def test_no_following_pages(self):
+        client = _ForumClient(self.PAGES)
+        done = []
+        PlaylistBuilder(client).build('论坛', 10, 3, 3, set(), None, on_done=done.append)
+        self.assertEqual(done, [False])
+        self.assertEqual(client.calls, [])
+
+
+class ExtractAudioTracksTest(unittest.TestCase):
+    def test_floor_order_and_defaults(self):
+        tracks = extract_audio_tracks([{'message': audio('http://a/1.mp3', '一')},
+                                       {'message': audio('http://a/1.mp3') + audio('http://a/2.mp3')}])
+        self.assertEqual([(t['url'], t['title']) for t in tracks], [('http://a/1.mp3', '一'), ('http://a/2.mp3', '')])
+        self.assertEqual(tracks[0]['bitrate'], '待检测')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from src.utils.records import Post, Thread
+
+API_POST = {'pid': 7, 'tid': 3, 'fid': 1, 'uid': 42, 'username': 'alice', 'subject': '标题',
+            'message': '<p>内容</p>', 'dateline_fmt': '昨天', 'floor': 5, 'authorid': 42, 'typeid1': 0}
+
+
+class PostAliasTest(unittest.TestCase):
+    def setUp(self):
+        self.post = Post.from_api(API_POST, index=2)
+
+    def test_post_data_and_data_are_the_post(self):
+        self.assertIs(self.post['post_data'], self.post)
+        self.assertIs(self.post.get('data'), self.post)
+        self.assertEqual(self.post['post_data']['message'], '<p>内容</p>')
+
+    def test_floor_index_reads_index(self):
+        self.assertEqual(self.post['floor_index'], 2)
+        self.assertEqual(self.post.get('floor_index'), 2)
+        self.assertIn('floor_index', self.post)
+
+    def test_aliases_are_read_only(self):
+        with self.assertRaises(KeyError):
+            self.post['floor_index'] = 9
+        self.post['index'] = 9
+        self.assertEqual(self.post['floor_index'], 9)
+
+    def test_type_key(self):
+        self.assertEqual(self.post['type'], 'post')
+        self.assertEqual(self.post.get('type'), 'post')
+
+
+class PostExtraTest(unittest.TestCase):
+    def test_other_api_fields_kept_in_extra(self):
+        post = Post.from_api(API_POST)
+        self.assertEqual(post.extra, {'authorid': 42, 'typeid1': 0})
+        self.assertEqual(post['authorid'], 42)
+        self.assertEqual(post.get('typeid1', 'x'), 0)
+        self.assertIn('authorid', post)
+
+    def test_missing_keys(self):
+        post = Post.from_api({'pid': 1, 'message': ''})
+        self.assertIsNone(post.extra)
+        self.assertEqual(post.get('authorid', 'none'), 'none')
+        self.assertNotIn('authorid', post)
+        with self.assertRaises(KeyError):
+            post['authorid']
+
+    def test_floor_override(self):
+        self.assertEqual(Post.from_api(API_POST, floor=12)['floor'], 12)
+        self.assertEqual(Post.from_api(API_POST)['floor'], 5)
+
+
+class ThreadTest(unittest.TestCase):
+    def test_dict_style_access(self):
+        thread = Thread.from_api({'tid': 3, 'subject': '<b>标题</b>'},
+                                 clean_subject=lambda subject: subject[3:-4])
+        self.assertEqual(thread['subject'], '标题')
+        self.assertEqual(thread.get('views'), 0)
+        self.assertEqual(thread.get('unknown', 'd'), 'd')
+        self.assertIsNone(thread.pop('list_number'))
+        thread['list_number'] = 4
+        self.assertEqual(thread.pop('list_number'), 4)
+        self.assertNotIn('list_number', thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils.sqlite_store import SQLiteStore
+
+ACCOUNTS = [
+    {'name': '论坛A', 'url': 'http://a.example.com', 'username': 'alice', 'encrypted_password': 'enc1', 'nickname': '爱丽丝'},
+    {'name': '论坛A', 'url': 'http://a.example.com', 'username': 'bob', 'encrypted_password': 'enc2', 'nickname': ''},
+    {'name': '论坛B', 'url': 'http://b.example.com', 'username': 'alice', 'encrypted_password': 'enc3', 'nickname': 'A'},
+]
+
+
+class MigrateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SQLiteStore(os.path.join(self.directory, 'config.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_imports_accounts_in_order(self):
+        self.store.migrate(ACCOUNTS, {}, 'config.ini')
+        self.assertEqual(self.store.list_accounts(), ACCOUNTS)
+        self.assertEqual(self.store.get_forum_usernames('论坛A'), ['alice', 'bob'])
+
+    def test_imports_settings_as_text(self):
+        self.store.migrate([], {'volume': 80, 'theme': 'dark'}, 'config.ini')
+        self.assertEqual(self.store.get_setting('volume'), '80')
+        self.assertEqual(self.store.get_setting('theme'), 'dark')
+
+    def test_records_source(self):
+        self.store.migrate(ACCOUNTS, {}, 'config.ini')
+        self.assertEqual(self.store.get_meta('migrated_from'), 'config.ini')
+        self.assertIsNotNone(self.store.get_meta('migrated_at'))
+
+    def test_repeated_migration_keeps_existing_accounts(self):
+        self.store.migrate(ACCOUNTS, {'volume': 50}, 'config.ini')
+        changed = [dict(ACCOUNTS[0], encrypted_password='other')]
+        self.store.migrate(changed, {'volume': 60}, 'config.ini')
+        self.assertEqual(self.store.list_accounts(), ACCOUNTS)
+        self.assertEqual(self.store.get_setting('volume'), '60')
+
+    def test_failed_migration_is_rolled_back(self):
+        broken = ACCOUNTS[:1] + [{'url': 'http://c.example.com', 'username': 'x'}]
+        with self.assertRaises(KeyError):
+            self.store.migrate(broken, {'volume': 50}, 'config.ini')
+        self.assertEqual(self.store.list_accounts(), [])
+        self.assertIsNone(self.store.get_setting('volume'))
+        self.assertIsNone(self.store.get_meta('migrated_from'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+
+from src.utils.stall_watchdog import StallWatchdog
+
+
+def watchdog_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'StallWatchdog' and thread.is_alive()]
+
+
+class RestartTest(unittest.TestCase):
+    def test_restart_leaves_one_thread(self):
+        senders = set()
+
+        in_loop = threading.Event()
+
+        def post_to_ui(callback, seq):
+            senders.add(threading.get_ident())
+            in_loop.set()
+            # 模拟监视线程正在循环体中（没有等待停止事件）时被重新启动
+            time.sleep(0.05)
+            callback(seq)
+
+        watchdog = StallWatchdog(post_to_ui, interval=0.01)
+        watchdog.start()
+        in_loop.wait()
+        watchdog.stop()
+        watchdog.start()
+        time.sleep(0.2)
+        senders.clear()
+        time.sleep(0.2)
+        watchdog.stop()
+
+        self.assertEqual(len(senders), 1)
+        time.sleep(0.1)
+        self.assertEqual(watchdog_threads(), [])
+
+    def test_stall_recorded_once(self):
+        pending = []
+        watchdog = StallWatchdog(lambda callback, seq: pending.append((callback, seq)), threshold=0.05,
+                                 interval=0.01)
+        watchdog.start()
+        time.sleep(0.1)  # 界面线程“卡住”，心跳未被处理
+        callback, seq = pending[0]
+        callback(seq)
+        time.sleep(0.05)
+        watchdog.stop()
+        self.assertEqual(watchdog.total_stalls, 1)
+        self.assertEqual(len(watchdog.get_summary()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
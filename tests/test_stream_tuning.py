@@ -0,0 +1,98 @@
+import unittest
+
+from src.utils.stream_tuning import (DEFAULT_CACHING_MS, MAX_CACHING_MS, MIN_CACHING_MS, StreamTuner,
+                                     host_of)
+
+URL = 'http://audio.example.com/a.mp3'
+
+
+class HostOfTest(unittest.TestCase):
+    def test_hosts(self):
+        self.assertEqual(host_of(URL), 'audio.example.com')
+        self.assertEqual(host_of('https://Audio.Example.com:8080/x'), 'audio.example.com')
+        self.assertIsNone(host_of('C:\\music\\a.mp3'))
+        self.assertIsNone(host_of('file:///music/a.mp3'))
+
+
+class NetworkCachingTest(unittest.TestCase):
+    def setUp(self):
+        self.tuner = StreamTuner()
+
+    def test_default_without_measurements(self):
+        self.assertEqual(self.tuner.network_caching_ms(URL), DEFAULT_CACHING_MS)
+        self.assertEqual(self.tuner.network_caching_ms('/music/a.mp3'), DEFAULT_CACHING_MS)
+
+    def test_small_transfers_only_measure_latency(self):
+        self.tuner.record_transfer(URL, 0.1, 1024, 0.01)
+        # 没有下载速度时使用默认缓冲，再加上首字节时间的两倍
+        self.assertEqual(self.tuner.network_caching_ms(URL), DEFAULT_CACHING_MS + 200)
+
+    def test_fast_host(self):
+        # 64KB用0.1秒，约5243kbps，远高于128kbps
+        self.tuner.record_transfer(URL, 0.05, 64 * 1024, 0.1)
+        self.assertEqual(self.tuner.network_caching_ms(URL, 128), 600)
+
+    def test_slow_host(self):
+        # 200000字节用2秒，800kbps，相对320kbps的余量为2.5倍
+        self.tuner.record_transfer(URL, 0.3, 200000, 2.0)
+        self.assertEqual(self.tuner.network_caching_ms(URL, 320), 1600)
+
+    def test_throughput_below_bitrate(self):
+        self.tuner.record_transfer(URL, 2.0, 20000, 1.0)
+        self.assertEqual(self.tuner.network_caching_ms(URL, 320), MAX_CACHING_MS)
+
+    def test_no_latency_fast_host(self):
+        self.tuner.record_transfer(URL, 0.0, 10 ** 7, 0.1)
+        caching = self.tuner.network_caching_ms(URL, 64)
+        self.assertEqual(caching, 500)
+        self.assertGreaterEqual(caching, MIN_CACHING_MS)
+
+    def test_hosts_are_independent(self):
+        self.tuner.record_transfer(URL, 0.05, 64 * 1024, 0.1)
+        self.assertEqual(self.tuner.network_caching_ms('http://other.example.com/a.mp3'), DEFAULT_CACHING_MS)
+
+
+class PlaybackBoostTest(unittest.TestCase):
+    def setUp(self):
+        self.tuner = StreamTuner()
+        self.tuner.record_transfer(URL, 0.05, 64 * 1024, 0.1)
+
+    def test_rebuffer_increases_caching(self):
+        self.tuner.record_playback(URL, 400, 1, 600)
+        self.assertEqual(self.tuner.network_caching_ms(URL, 128), 900)
+        self.tuner.record_playback(URL, 400, 3, 900)
+        self.assertEqual(self.tuner.network_caching_ms(URL, 128), 1800)
+
+    def test_boost_is_capped(self):
+        for _ in range(5):
+            self.tuner.record_playback(URL, 400, 2, 600)
+        self.assertEqual(self.tuner.get_summary()[0]['boost'], 4.0)
+
+    def test_smooth_playback_decays_boost(self):
+        self.tuner.record_playback(URL, 400, 2, 600)
+        self.tuner.record_playback(URL, 400, 0, 1200)
+        self.assertEqual(self.tuner.get_summary()[0]['boost'], 1.8)
+        for _ in range(20):
+            self.tuner.record_playback(URL, 400, 0, 600)
+        self.assertEqual(self.tuner.get_summary()[0]['boost'], 1.0)
+
+    def test_playback_that_never_started_keeps_boost(self):
+        self.tuner.record_playback(URL, 400, 1, 600)
+        self.tuner.record_playback(URL, None, 0, 900)
+        self.assertEqual(self.tuner.get_summary()[0]['boost'], 1.5)
+
+    def test_summary(self):
+        self.tuner.record_playback(URL, 300, 1, 600)
+        self.tuner.record_playback(URL, 500, 0, 900)
+        summary = self.tuner.get_summary()
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]['host'], 'audio.example.com')
+        self.assertEqual(summary[0]['transfers'], 1)
+        self.assertEqual(summary[0]['playbacks'], 2)
+        self.assertEqual(summary[0]['avg_start_ms'], 400)
+        self.assertEqual(summary[0]['rebuffers'], 1)
+        self.assertEqual(summary[0]['last_caching_ms'], 900)
+
+
+if __name__ == '__main__':
+    unittest.main()